@@ -0,0 +1,51 @@
+"""
+Compare the NumPy and pure-Python academic standing engines.
+
+Usage:
+    python -m benchmarks.academic_standing [--grades 5000000] [--students 100000]
+
+Grades are synthetic and built in memory; column building is timed
+separately from the grouped reductions.
+"""
+
+import argparse
+import random
+import time
+from src.analytics.columns import HAVE_NUMPY, grade_columns_from_rows
+from src.analytics.standing import academic_standing
+
+def synthetic_grades(count, students, seed=1):
+    rng = random.Random(seed)
+    ratings = ['1.00', '1.25', '1.50', '1.75', '2.00', '2.25', '2.50', '2.75', '3.00', '5.00']
+    student_ids = [f"2024{n:06d}" for n in range(students)]
+    for n in range(count):
+        rating = rng.choice(ratings)
+        yield (student_ids[n % students], str(n // students % 4 + 1), str(n % 2 + 1),
+               rng.choice((2, 3, 3, 5)), rating, rating == '5.00')
+
+def run(label, use_numpy, rows, by_term):
+    started = time.perf_counter()
+    columns = grade_columns_from_rows(rows, use_numpy)
+    loaded = time.perf_counter()
+    results = academic_standing(columns, by_term=by_term)
+    finished = time.perf_counter()
+    print(f"{label:<8} columns {loaded - started:6.2f}s  standing {finished - loaded:6.2f}s  "
+          f"({len(results)} groups)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--grades', type=int, default=1000000)
+    parser.add_argument('--students', type=int, default=50000)
+    parser.add_argument('--by-term', action='store_true', help="Group by student and term")
+    args = parser.parse_args(argv)
+
+    rows = list(synthetic_grades(args.grades, args.students))
+    print(f"{args.grades} grades, {args.students} students")
+    run('python', False, rows, args.by_term)
+    if HAVE_NUMPY:
+        run('numpy', True, rows, args.by_term)
+    else:
+        print("numpy    not installed")
+
+if __name__ == "__main__":
+    main()
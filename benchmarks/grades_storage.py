@@ -0,0 +1,118 @@
+"""
+Measure the grades table before and after the typed storage migration.
+
+Usage:
+    python -m benchmarks.grades_storage [--students 20000] [--subjects 40]
+
+Builds a database at schema version 5 (TEXT ratings, terms and statuses),
+reports its size and aggregation timings, applies migration 6 and reports
+them again. Sizes come from the dbstat virtual table after a VACUUM.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from src.database.migrations import MIGRATIONS, migrate
+
+RATINGS = ('1.00', '1.25', '1.50', '1.75', '2.00', '2.25', '2.50', '2.75', '3.00', '5.00')
+
+# (label, legacy SQL, typed SQL)
+QUERIES = (
+    ("rating distribution",
+     """SELECT subject, year_level, semester,
+               CAST(ROUND(CAST(rating AS REAL) * 100) AS INTEGER) AS h, COUNT(*),
+               SUM(status = 'Passed')
+        FROM grades WHERE CAST(rating AS REAL) > 0
+        GROUP BY subject, year_level, semester, h""",
+     """SELECT subject, year_level, semester, rating_hundredths, COUNT(*),
+               SUM(status_code = 0)
+        FROM grades WHERE rating_hundredths IS NOT NULL
+        GROUP BY subject, year_level, semester, rating_hundredths"""),
+    ("weighted GWA per student",
+     """SELECT student_id,
+               SUM(CAST(ROUND(CAST(rating AS REAL) * 100) AS INTEGER) * units) / 100.0 / SUM(units)
+        FROM grades GROUP BY student_id""",
+     """SELECT student_id, SUM(rating_hundredths * units) / 100.0 / SUM(units)
+        FROM grades GROUP BY student_id"""),
+)
+
+def build_legacy(path, students, subjects, seed=1):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    migrate(conn, MIGRATIONS[:4])
+    student_ids = [f"2024{n:05d}" for n in range(students)]
+    conn.executemany("INSERT INTO students (student_id, name, password) VALUES (?, ?, 'pw')",
+                     ((student_id, f"STUDENT {student_id}") for student_id in student_ids))
+
+    def grades():
+        for student_id in student_ids:
+            for n in range(subjects):
+                rating = rng.choice(RATINGS)
+                yield (student_id, f"Subject {n:02d}", rng.choice((2, 3, 3, 5)), rating,
+                       float(rating), 'Failed' if rating == '5.00' else 'Passed',
+                       str(n // 10 % 4 + 1), str(n // 5 % 2 + 1))
+    conn.executemany("""
+        INSERT INTO grades (student_id, subject, units, rating, final_grade, status,
+                            year_level, semester)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, grades())
+    conn.commit()
+    migrate(conn, MIGRATIONS[:5])
+    return conn
+
+def sizes(conn):
+    """Bytes used by the grades table, each of its indexes, and the whole file."""
+    conn.execute("VACUUM")
+    objects = dict(conn.execute("""
+        SELECT name, SUM(pgsize) FROM dbstat
+        WHERE name = 'grades' OR name IN (
+            SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'grades')
+        GROUP BY name
+    """))
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    objects['(file)'] = conn.execute("PRAGMA page_count").fetchone()[0] * page_size
+    return objects
+
+def timings(conn, typed, repeat=3):
+    results = {}
+    for label, legacy_sql, typed_sql in QUERIES:
+        sql = typed_sql if typed else legacy_sql
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            conn.execute(sql).fetchall()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        results[label] = best
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--students', type=int, default=20000)
+    parser.add_argument('--subjects', type=int, default=40)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = build_legacy(os.path.join(directory, 'grades.db'), args.students, args.subjects)
+        print(f"{args.students * args.subjects} grades, {args.students} students")
+        before, before_times = sizes(conn), timings(conn, typed=False)
+        started = time.perf_counter()
+        migrate(conn)
+        print(f"migration 6 took {time.perf_counter() - started:.2f}s")
+        after, after_times = sizes(conn), timings(conn, typed=True)
+        conn.close()
+
+    print(f"\n{'object':<28}{'before':>12}{'after':>12}{'change':>9}")
+    for name in sorted(before, key=lambda name: (name == '(file)', name)):
+        old, new = before[name], after.get(name, 0)
+        print(f"{name:<28}{old / 1024:>10.0f}KB{new / 1024:>10.0f}KB{(new - old) / old:>+9.0%}")
+    print(f"\n{'query':<28}{'before':>12}{'after':>12}{'change':>9}")
+    for label in before_times:
+        old, new = before_times[label], after_times[label]
+        print(f"{label:<28}{old * 1000:>10.0f}ms{new * 1000:>10.0f}ms{(new - old) / old:>+9.0%}")
+
+if __name__ == "__main__":
+    main()
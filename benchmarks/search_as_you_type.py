@@ -0,0 +1,48 @@
+"""
+Time per-keystroke searches against the in-memory student search index.
+
+Usage:
+    python -m benchmarks.search_as_you_type [--students 50000]
+
+Each keystroke should stay well under one 16 ms frame.
+"""
+
+import argparse
+import random
+import time
+from src.utils.search_index import IncrementalSearch, StudentSearchIndex
+
+FIRST_NAMES = ['ANGELO', 'JOHN', 'MARIA', 'JOSE', 'ANNA', 'MARK', 'PAUL', 'GRACE', 'JUAN', 'SOFIA']
+LAST_NAMES = ['MANALO', 'DOE', 'SANTOS', 'REYES', 'CRUZ', 'BAUTISTA', 'GARCIA', 'MENDOZA']
+
+def make_students(count, seed=1):
+    rng = random.Random(seed)
+    students = []
+    for n in range(count):
+        student_id = f"2024{n:05d}"
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        students.append((student_id, name, f"09{rng.randrange(10**9):09d}",
+                         f"{student_id}@eecp.edu.ph", '1', '1', 'EECP',
+                         rng.choice(['BSIT', 'BSCS', 'BSBA']), '2024-2025', 'Enrolled'))
+    return students
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--students', type=int, default=50000)
+    parser.add_argument('--query', default='angelo manalo')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    index = StudentSearchIndex(make_students(args.students))
+    print(f"Indexed {len(index)} students in {time.perf_counter() - started:.2f}s")
+
+    search = IncrementalSearch(index)
+    for length in range(1, len(args.query) + 1):
+        query = args.query[:length]
+        started = time.perf_counter()
+        matches = search.search(query)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{query!r:<18} {len(matches):>7} matches {elapsed:>7.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Load the grade service with concurrent reads and grade updates.
+
+Usage:
+    python -m benchmarks.service_load [--clients 16] [--requests 200]
+
+Starts a service on a temporary database and has every client thread
+alternate fetch_student_grades and update_grade calls, once committing
+every grade on its own (max_batch=1) and once group-committing them, then
+prints throughput and the service's latency percentiles.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.database.connection_pool import configure_pool
+from src.database.init_database import init_db
+from src.service.client import ServiceClient
+from src.service.server import MAX_BATCH, GradeService
+
+def run(label, max_batch, clients, requests):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    service = GradeService(max_batch=max_batch)
+    asyncio.run_coroutine_threadsafe(service.start('127.0.0.1', 0), loop).result()
+    client = ServiceClient(f"http://127.0.0.1:{service.port}")
+
+    def work(worker):
+        student_id = f"2024{worker:05d}"
+        for n in range(requests):
+            if n % 2:
+                client.update_grade(student_id, f"Subject {n % 40}", 3, 1.5, 1.5, 'Passed', 1, 1)
+            else:
+                client.fetch_student_grades(student_id)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(work, range(clients)))
+    elapsed = time.perf_counter() - started
+    stats = client.stats()
+    client.close()
+    asyncio.run_coroutine_threadsafe(service.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+    total = clients * requests
+    print(f"{label:<12} {total / elapsed:8.0f} req/s  "
+          f"batches {stats['grade_batching']['batches']:5d} "
+          f"(largest {stats['grade_batching']['largest']})")
+    for name in ('fetch_student_grades', 'update_grade'):
+        op = stats['operations'][name]
+        print(f"    {name:<22} p50 {op['p50_ms']:7.2f}ms  p95 {op['p95_ms']:7.2f}ms  "
+              f"p99 {op['p99_ms']:7.2f}ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'service.db')
+        init_db(db_path)
+        pool = configure_pool(db_path)
+        run('unbatched', 1, args.clients, args.requests)
+        run('batched', MAX_BATCH, args.clients, args.requests)
+        pool.close()
+
+if __name__ == "__main__":
+    main()
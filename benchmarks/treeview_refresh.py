@@ -0,0 +1,79 @@
+"""
+Count Treeview calls per refresh for the old delete-all/insert-all pattern
+versus TreeviewReconciler.
+
+Usage:
+    python -m benchmarks.treeview_refresh [--rows 10000]
+
+Runs headless against a call-counting stand-in for ttk.Treeview.
+"""
+
+import argparse
+import time
+from src.ui.ui_components import TreeviewReconciler
+
+class CountingTreeview:
+    """Records the number of calls made, without any widget behind it."""
+
+    def __init__(self):
+        self.children = {}
+        self.calls = 0
+
+    def get_children(self):
+        self.calls += 1
+        return tuple(self.children)
+
+    def insert(self, parent, index, iid, values):
+        self.calls += 1
+        self.children[iid] = values
+
+    def delete(self, *iids):
+        self.calls += 1
+        for iid in iids:
+            del self.children[iid]
+
+    def move(self, iid, parent, index):
+        self.calls += 1
+
+    def item(self, iid, values):
+        self.calls += 1
+
+def delete_all_refresh(tree, rows):
+    """The previous refresh: delete every item one by one, then reinsert."""
+    for item in tree.get_children():
+        tree.delete(item)
+    for row in rows:
+        tree.insert('', 'end', iid=row[0], values=row)
+
+def reconciled_refresh(reconciler, rows):
+    reconciler.apply((row[0], row) for row in rows)
+
+def measure(label, refresh, tree, rows):
+    tree.calls = 0
+    started = time.perf_counter()
+    refresh(rows)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<22} {tree.calls:>8} calls {elapsed * 1000:>9.1f} ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    rows = [(f"2024{n:06d}", f"STUDENT {n}", 'BSIT', '1', 'Enrolled') for n in range(args.rows)]
+    changed = list(rows)
+    middle = len(changed) // 2
+    changed[middle] = changed[middle][:-1] + ('LOA',)
+
+    print(f"Refreshing {args.rows} rows with 1 changed row")
+    naive = CountingTreeview()
+    delete_all_refresh(naive, rows)
+    measure("delete-all/insert-all", lambda r: delete_all_refresh(naive, r), naive, changed)
+
+    tree = CountingTreeview()
+    reconciler = TreeviewReconciler(tree)
+    reconciled_refresh(reconciler, rows)
+    measure("reconciled", lambda r: reconciled_refresh(reconciler, r), tree, changed)
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,9 @@
 Grade Evaluation System package.
 """
 
+from . import analytics
 from . import database
+from . import repositories
+from . import service
 from . import ui
 from . import utils
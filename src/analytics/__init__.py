@@ -0,0 +1,6 @@
+"""
+Batch analytics for the Grade Evaluation System.
+"""
+
+from . import columns
+from . import standing
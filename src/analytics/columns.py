@@ -0,0 +1,109 @@
+"""
+Column-wise loading of grades for batch analytics.
+
+Grades are read once into parallel columns (NumPy arrays when NumPy is
+installed, compact array.array buffers otherwise) with students and terms
+replaced by small integer codes, so reductions never touch per-row objects.
+"""
+
+import sqlite3
+from array import array
+from operator import itemgetter
+from ..database.database_operations import get_db_connection
+from ..database.migrations import STATUS_FAILED
+from ..utils.logger import logger
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAVE_NUMPY = np is not None
+
+class GradeColumns:
+    """Grades as parallel columns.
+
+    student_ids and terms are the lookup tables for the student and term
+    codes; terms holds (year_level, semester) pairs.
+    """
+
+    def __init__(self, student_ids, terms, student, term, units, rating, failed):
+        self.student_ids = student_ids
+        self.terms = terms
+        self.student = student
+        self.term = term
+        self.units = units
+        self.rating = rating
+        self.failed = failed
+
+    def __len__(self):
+        return len(self.student)
+
+    @property
+    def is_numpy(self):
+        return HAVE_NUMPY and isinstance(self.units, np.ndarray)
+
+def _codes(values):
+    """Replace values by dense integer codes; returns (lookup table, codes)."""
+    table = list(dict.fromkeys(values))
+    index = {value: code for code, value in enumerate(table)}
+    return table, array('l', map(index.__getitem__, values))
+
+def _is_graded(row):
+    try:
+        float(row[4])
+        return True
+    except (TypeError, ValueError):
+        return False
+
+def grade_columns_from_rows(rows, use_numpy=None):
+    """Build GradeColumns from (student_id, year_level, semester, units, rating, failed) rows.
+
+    Rows without a numeric rating are skipped; they do not count towards GWA.
+    """
+    use_numpy = HAVE_NUMPY if use_numpy is None else use_numpy and HAVE_NUMPY
+    rows = rows if isinstance(rows, list) else list(rows)
+    # Convert whole columns with map(), which keeps the per-row work in C;
+    # fall back to filtering only when a value is bad.
+    try:
+        rating = array('d', map(float, map(itemgetter(4), rows)))
+        units = array('d', map(float, map(itemgetter(3), rows)))
+    except (TypeError, ValueError):
+        rows = [row[:3] + (row[3] or 0,) + row[4:] for row in rows if _is_graded(row)]
+        return grade_columns_from_rows(rows, use_numpy)
+
+    student_ids, student = _codes(list(map(itemgetter(0), rows)))
+    terms, term = _codes(list(map(itemgetter(1, 2), rows)))
+    terms = [(str(year_level), str(semester)) for year_level, semester in terms]
+    failed = array('b', map(bool, map(itemgetter(5), rows)))
+
+    columns = [student, term, units, rating, failed]
+    if use_numpy:
+        dtypes = (np.int64, np.int64, np.float64, np.float64, np.bool_)
+        columns = [np.frombuffer(column, dtype=column.typecode).astype(dtype, copy=False)
+                   if len(column) else np.zeros(0, dtype=dtype)
+                   for column, dtype in zip(columns, dtypes)]
+    return GradeColumns(student_ids, terms, *columns)
+
+def load_grade_columns(school_year=None, use_numpy=None):
+    """Load all grades, or those of students in one school year, column-wise."""
+    conditions = "WHERE s.school_year = ?" if school_year else ""
+    params = (school_year,) if school_year else ()
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT g.student_id, g.year_level, g.semester, g.units,
+                   g.rating_hundredths / 100.0, g.status_code = {STATUS_FAILED}
+            FROM grades g
+            JOIN students s ON s.student_id = g.student_id
+            {conditions}
+        """, params)
+        return grade_columns_from_rows(cursor.fetchall(), use_numpy)
+    except sqlite3.Error as e:
+        logger.error("Database error while loading grade columns: %s", e)
+        return grade_columns_from_rows([], use_numpy)
+    finally:
+        if conn is not None:
+            conn.close()
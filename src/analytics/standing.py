@@ -0,0 +1,134 @@
+"""
+Batch GWA and academic standing for the Grade Evaluation System.
+
+Weighted averages are grouped reductions over GradeColumns: with NumPy a
+handful of bincount calls over the whole column set, otherwise a single
+pass accumulating per-group totals in dictionaries.
+"""
+
+from .columns import HAVE_NUMPY, np
+
+# Ratings run from 1.00 (best) to 5.00 (failed); lower GWA is better.
+DEANS_LIST_MAX_GWA = 1.75
+DEANS_LIST_MIN_UNITS = 15
+DEANS_LIST_MAX_RATING = 2.50   # no single grade worse than this
+PROBATION_MIN_GWA = 3.00       # GWA worse than this puts a student on probation
+PROBATION_FAILED_SHARE = 0.25  # as does failing this share of the units taken
+
+GWA_DECIMALS = 4
+
+STANDING_DEANS_LIST = "Dean's List"
+STANDING_GOOD = "Good Standing"
+STANDING_PROBATION = "Probation"
+
+def _group_keys(columns, by_term):
+    """Group code per grade row, and the (student, term) codes of each group."""
+    if not by_term:
+        return columns.student, None
+    if columns.is_numpy:
+        combined = columns.student * max(len(columns.terms), 1) + columns.term
+        codes, key = np.unique(combined, return_inverse=True)
+        groups = list(zip(*divmod(codes, max(len(columns.terms), 1))))
+        return key, groups
+    group_codes = {}
+    key = [group_codes.setdefault(pair, len(group_codes))
+           for pair in zip(columns.student, columns.term)]
+    return key, list(group_codes)
+
+def group_totals(columns, by_term=False):
+    """Sum units, weighted ratings, failed units and low grades per group.
+
+    Groups are students, or (student, term) pairs when by_term is set.
+    Returns (groups, units, weighted, failed_units, low_grades) where groups
+    holds student codes or (student, term) code pairs.
+    """
+    key, groups = _group_keys(columns, by_term)
+    if groups is None:
+        groups = range(len(columns.student_ids))
+    size = len(groups)
+
+    if columns.is_numpy:
+        units = np.bincount(key, weights=columns.units, minlength=size)
+        weighted = np.bincount(key, weights=columns.units * columns.rating, minlength=size)
+        failed_units = np.bincount(key, weights=columns.units * columns.failed, minlength=size)
+        low_grades = np.bincount(key, weights=columns.rating > DEANS_LIST_MAX_RATING,
+                                 minlength=size)
+        return groups, units, weighted, failed_units, low_grades
+
+    units = [0.0] * size
+    weighted = [0.0] * size
+    failed_units = [0.0] * size
+    low_grades = [0] * size
+    for group, row_units, rating, failed in zip(key, columns.units, columns.rating, columns.failed):
+        units[group] += row_units
+        weighted[group] += row_units * rating
+        if failed:
+            failed_units[group] += row_units
+        if rating > DEANS_LIST_MAX_RATING:
+            low_grades[group] += 1
+    return groups, units, weighted, failed_units, low_grades
+
+def standing_flags(units, weighted, failed_units, low_grades):
+    """Compute (gwa, deans_list, probation) for every group.
+
+    Takes the outputs of group_totals; NumPy inputs give NumPy outputs.
+    A group without units has no GWA and neither flag.
+    """
+    if HAVE_NUMPY and isinstance(units, np.ndarray):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gwa = np.round(np.where(units > 0, weighted / units, np.nan), GWA_DECIMALS)
+            failed_share = np.where(units > 0, failed_units / units, 0.0)
+        deans_list = ((gwa <= DEANS_LIST_MAX_GWA) & (units >= DEANS_LIST_MIN_UNITS)
+                      & (failed_units == 0) & (low_grades == 0))
+        probation = (gwa > PROBATION_MIN_GWA) | (failed_share >= PROBATION_FAILED_SHARE)
+        return gwa, deans_list, probation & (units > 0)
+
+    gwa, deans_list, probation = [], [], []
+    for group_units, group_weighted, group_failed, group_low in zip(
+            units, weighted, failed_units, low_grades):
+        if group_units <= 0:
+            gwa.append(None)
+            deans_list.append(False)
+            probation.append(False)
+            continue
+        average = round(group_weighted / group_units, GWA_DECIMALS)
+        gwa.append(average)
+        deans_list.append(average <= DEANS_LIST_MAX_GWA and group_units >= DEANS_LIST_MIN_UNITS
+                          and group_failed == 0 and group_low == 0)
+        probation.append(average > PROBATION_MIN_GWA
+                         or group_failed / group_units >= PROBATION_FAILED_SHARE)
+    return gwa, deans_list, probation
+
+def academic_standing(columns, by_term=False):
+    """GWA, units, Dean's List and probation flags per student (or per term).
+
+    Returns one dict per group with student_id, year_level and semester
+    (per term only), gwa, units, failed_units, deans_list, probation and
+    standing.
+    """
+    groups, units, weighted, failed_units, low_grades = group_totals(columns, by_term)
+    gwa, deans_list, probation = standing_flags(units, weighted, failed_units, low_grades)
+    if columns.is_numpy:
+        gwa = [None if value != value else value for value in gwa.tolist()]
+        units, failed_units = units.tolist(), failed_units.tolist()
+        deans_list, probation = deans_list.tolist(), probation.tolist()
+
+    results = []
+    for index, group in enumerate(groups):
+        if by_term:
+            student, term = group
+            row = {'student_id': columns.student_ids[student]}
+            row['year_level'], row['semester'] = columns.terms[term]
+        else:
+            row = {'student_id': columns.student_ids[group]}
+        if deans_list[index]:
+            standing = STANDING_DEANS_LIST
+        elif probation[index]:
+            standing = STANDING_PROBATION
+        else:
+            standing = STANDING_GOOD
+        row.update(gwa=gwa[index], units=units[index], failed_units=failed_units[index],
+                   deans_list=deans_list[index], probation=probation[index],
+                   standing=standing)
+        results.append(row)
+    return results
@@ -4,3 +4,8 @@ Database operations for the Grade Evaluation System.
 
 from . import database_operations
 from . import init_database
+from . import migrations
+from . import connection_pool
+from . import change_tracking
+from . import rankings
+from . import grade_statistics
@@ -0,0 +1,172 @@
+"""
+Change detection for the Grade Evaluation System database.
+
+Every write to a tracked table bumps its row in change_counters (maintained
+by triggers, see migrations). PRAGMA data_version tells us cheaply whether
+any other connection has committed since we last looked, so an idle refresh
+costs one PRAGMA and no table reads.
+"""
+
+import functools
+import sqlite3
+import threading
+from collections import OrderedDict
+from ..utils.logger import logger
+from .connection_pool import connect, get_pool
+
+TRACKED_TABLES = ('students', 'grades', 'registrars')
+
+class ChangeTracker:
+    """Report per-table change counters, re-reading them only after a commit.
+
+    Uses its own connection that never writes, so every commit made through
+    the connection pool (or another process) changes its data_version.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._counters = {}
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = connect(self.db_path, timeout=5.0, check_same_thread=False)
+        return self._conn
+
+    def versions(self, *tables):
+        """Return the change counters of the given tables, or None on error."""
+        with self._lock:
+            try:
+                conn = self._connection()
+                data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+                if data_version != self._data_version:
+                    self._counters = dict(conn.execute(
+                        "SELECT table_name, version FROM change_counters"))
+                    self._data_version = data_version
+            except sqlite3.Error as e:
+                logger.error("Failed to read change counters: %s", e)
+                self._data_version = None
+                return None
+            return tuple(self._counters.get(table, 0) for table in tables)
+
+    def close(self):
+        """Close the tracker's connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._data_version = None
+
+class RefreshGate:
+    """Skip reloading a view whose tables and parameters have not changed.
+
+    load() runs on a worker thread and returns None when the view is already
+    up to date; deliver() wraps the display callback and records what was
+    shown, so a failed or superseded load never marks the view as current.
+    """
+
+    def __init__(self, tables, tracker=None):
+        self.tables = tuple(tables)
+        self._tracker = tracker
+        self._loaded = None
+
+    @property
+    def tracker(self):
+        return self._tracker or get_change_tracker()
+
+    def check(self, params=()):
+        """Return a token to load with, or None if the view is up to date."""
+        versions = self.tracker.versions(*self.tables)
+        token = (versions, params)
+        if versions is not None and token == self._loaded:
+            return None
+        return token
+
+    def load(self, params, loader, *args, **kwargs):
+        """Run loader(*args, **kwargs) unless the view is up to date.
+
+        Returns (token, result), or None when nothing changed.
+        """
+        token = self.check(params)
+        if token is None:
+            return None
+        return token, loader(*args, **kwargs)
+
+    def deliver(self, show):
+        """Wrap a display callback for the results of load().
+
+        A None result (the loaders' failure value) is shown but not recorded,
+        so the next refresh tries again.
+        """
+        def on_loaded(result):
+            if result is None:
+                return
+            token, data = result
+            show(data)
+            if data is not None:
+                self._loaded = token
+        return on_loaded
+
+    def invalidate(self):
+        """Force the next load to hit the database."""
+        self._loaded = None
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+def get_change_tracker():
+    """Return the change tracker for the database the pool is connected to."""
+    global _tracker
+    db_path = get_pool().db_path
+    with _tracker_lock:
+        if _tracker is None or _tracker.db_path != db_path:
+            if _tracker is not None:
+                _tracker.close()
+            _tracker = ChangeTracker(db_path)
+        return _tracker
+
+def cached_until_changed(*tables, maxsize=128):
+    """Cache a query function's results until one of the tables changes.
+
+    A repeat call with the same arguments costs one PRAGMA data_version
+    check and a dictionary lookup. The whole cache is dropped as soon as a
+    counter moves, and results are never cached while the counters cannot
+    be read.
+    """
+    def decorator(func):
+        cache = OrderedDict()
+        lock = threading.Lock()
+        state = {'version': None}
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracker = get_change_tracker()
+            versions = tracker.versions(*tables)
+            version = (tracker.db_path, versions) if versions is not None else None
+            key = (args, tuple(sorted(kwargs.items())))
+            with lock:
+                if version is None or version != state['version']:
+                    cache.clear()
+                    state['version'] = version
+                elif key in cache:
+                    cache.move_to_end(key)
+                    return cache[key]
+
+            result = func(*args, **kwargs)
+            with lock:
+                if version is not None and state['version'] == version:
+                    cache[key] = result
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+            return result
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+                state['version'] = None
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
@@ -0,0 +1,230 @@
+"""
+Connection pooling for the Grade Evaluation System database.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from ..utils.logger import logger
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'eecp_gesys.db')
+
+# PRAGMA profiles applied to every new connection. journal_mode must come
+# first so the remaining settings apply to the chosen journal.
+PRAGMA_PROFILES = {
+    # WAL lets student dashboard reads proceed while a registrar commits, and
+    # synchronous=NORMAL only fsyncs at checkpoints instead of every commit.
+    'performance': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,      # ~16 MB page cache
+        'mmap_size': 268435456,    # 256 MB memory-mapped I/O
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    # Rollback journal with full fsync, for databases on network shares where
+    # WAL's shared-memory index is not supported.
+    'safe': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000,
+    },
+}
+
+DEFAULT_PROFILE = os.environ.get('GESYS_DB_PROFILE', 'performance')
+
+def connect(db_path, **options):
+    """sqlite3.connect() that also accepts file: URIs (see repositories.memory)."""
+    return sqlite3.connect(db_path, uri=db_path.startswith('file:'), **options)
+
+def get_profile_pragmas(profile=None):
+    """Return the PRAGMA settings for a named profile."""
+    profile = profile or DEFAULT_PROFILE
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(f"Unknown database profile: {profile}")
+    return dict(PRAGMA_PROFILES[profile])
+
+def apply_pragmas(conn, pragmas):
+    """Apply PRAGMA settings to a connection."""
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name}={value}")
+
+class PooledConnection:
+    """Wrapper around a sqlite3 connection that returns itself to the pool on close()."""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    @property
+    def raw(self):
+        """The underlying sqlite3 connection."""
+        return self._conn
+
+    def close(self):
+        """Return the connection to the pool instead of closing it."""
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+
+class ConnectionPool:
+    """A bounded pool of long-lived SQLite connections.
+
+    Connections are opened lazily up to max_size, configured once with the
+    given PRAGMAs and handed out LIFO so the warmest connection is reused.
+    Idle connections are health-checked before reuse when they have been idle
+    longer than health_check_interval seconds.
+
+    The PRAGMAs come from the named profile (see PRAGMA_PROFILES), with any
+    explicitly passed pragmas taking precedence.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, max_size=5, timeout=10.0,
+                 health_check_interval=30.0, profile=None, pragmas=None):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.profile = profile or DEFAULT_PROFILE
+        self.pragmas = get_profile_pragmas(self.profile)
+        self.pragmas.update(pragmas or {})
+
+        self._idle = []
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+        self._stats = {'opened': 0, 'reused': 0, 'discarded': 0, 'waits': 0}
+
+    def _open(self):
+        """Open and configure a new connection."""
+        conn = connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        apply_pragmas(conn, self.pragmas)
+        logger.debug("Opened new database connection to %s", self.db_path)
+        return conn
+
+    def _is_healthy(self, conn):
+        """Check that an idle connection is still usable."""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self):
+        """Check out a connection, opening a new one if the pool has room."""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection pool is closed")
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._in_use < self.max_size:
+                    conn, idle_since = None, None
+                    self._in_use += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise sqlite3.OperationalError("Timed out waiting for a database connection")
+                self._stats['waits'] += 1
+                self._cond.wait(remaining)
+
+        try:
+            if conn is not None and time.monotonic() - idle_since > self.health_check_interval:
+                if not self._is_healthy(conn):
+                    self._discard(conn)
+                    conn = None
+            if conn is None:
+                conn = self._open()
+                with self._cond:
+                    self._stats['opened'] += 1
+            else:
+                with self._cond:
+                    self._stats['reused'] += 1
+        except BaseException:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, conn)
+
+    def release(self, conn):
+        """Return a connection to the pool, rolling back any open transaction."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            conn = None
+        with self._cond:
+            self._in_use -= 1
+            if conn is not None:
+                if self._closed or len(self._idle) >= self.max_size:
+                    conn.close()
+                else:
+                    self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, conn):
+        """Close a connection that should not be reused."""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._cond:
+            self._stats['discarded'] += 1
+        logger.warning("Discarded unhealthy database connection")
+
+    def stats(self):
+        """Return counters for connections opened vs. reused."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats['in_use'] = self._in_use
+            stats['idle'] = len(self._idle)
+        return stats
+
+    def close(self):
+        """Close all idle connections and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for conn, _ in idle:
+            conn.close()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def configure_pool(db_path=None, **options):
+    """Replace the application connection pool with a newly configured one."""
+    global _pool
+    with _pool_lock:
+        old_pool = _pool
+        _pool = ConnectionPool(db_path or DEFAULT_DB_PATH, **options)
+    if old_pool is not None:
+        old_pool.close()
+    logger.info("Configured connection pool for %s (max_size=%s, profile=%s)",
+                _pool.db_path, _pool.max_size, _pool.profile)
+    return _pool
+
+def get_pool():
+    """Return the application connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
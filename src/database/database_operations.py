@@ -3,127 +3,447 @@ Database operations for the Grade Evaluation System.
 """
 
 import sqlite3
-import logging
-import os
 from ..utils.logger import logger
+from ..utils.passwords import (
+    dummy_verify, hash_password, hash_passwords, needs_rehash, verify_password
+)
+from ..utils.search_index import tokenize
+from .change_tracking import get_change_tracker
+from .connection_pool import get_pool
+from .lookup_cache import MISSING, LookupCache
+from .migrations import (
+    GRADE_STATUSES, STATUS_FAILED, STATUS_PASSED, SUMMARY_TABLES,
+    status_name_sql, summary_backfill_sql
+)
+
+# Results of update_grade()
+GRADE_INSERTED = 'inserted'
+GRADE_UPDATED = 'updated'
+
+# Results of check_student_login() and check_registrar_login()
+LOGIN_OK = 'ok'
+LOGIN_WRONG_PASSWORD = 'wrong_password'
+LOGIN_UNKNOWN_ACCOUNT = 'unknown_account'
 
 def get_db_connection():
-    """Get a connection to the SQLite database."""
-    db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'eecp_gesys.db')
-    return sqlite3.connect(db_path)
+    """Get a pooled connection to the SQLite database.
+
+    Calling close() on the returned connection hands it back to the pool.
+    """
+    return get_pool().acquire()
+
+def get_connection_stats():
+    """Return connection pool counters (opened, reused, discarded, in use, idle)."""
+    return get_pool().stats()
+
+# Read-through caches of get_student_info and fetch_student_grades. Every
+# function here that writes students or grades invalidates the students it
+# touched; entries are also tied to their table's change counter, so writes
+# from other processes are never hidden from RefreshGate.
+student_info_cache = LookupCache('student_info')
+student_grades_cache = LookupCache('student_grades')
+
+def _table_version(table):
+    """A table's change counter, or None (do not cache) if it cannot be read."""
+    versions = get_change_tracker().versions(table)
+    return versions[0] if versions else None
+
+def _cache_key(student_id):
+    # Keyed by database too, so switching databases never serves old rows
+    return get_pool().db_path, str(student_id)
+
+def invalidate_student_caches(*student_ids, info=True, grades=True):
+    """Drop the cached profile and/or grades of the given students."""
+    keys = [_cache_key(student_id) for student_id in student_ids]
+    if info:
+        student_info_cache.invalidate(*keys)
+    if grades:
+        student_grades_cache.invalidate(*keys)
+
+def get_cache_stats():
+    """Return hit, miss and eviction counters of the student lookup caches."""
+    return {cache.name: cache.stats() for cache in (student_info_cache, student_grades_cache)}
+
+# Display GWA of a student row from the trigger-maintained summary, '' if none
+STUDENT_GWA_SQL = """COALESCE((SELECT printf('%.2f', ss.gwa) FROM student_summary ss
+                  WHERE ss.student_id = {table}.student_id AND ss.gwa IS NOT NULL), '')"""
 
 def fetch_student_data():
-    """Fetch all student data from the database."""
+    """Fetch all student data from the database, with each student's GWA last."""
     logger.debug("Fetching all student data")
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT student_id, name, mobile_number, email_address,
                    year_level, semester, college, program,
-                   school_year, enrollment_status
+                   school_year, enrollment_status,
+                   {STUDENT_GWA_SQL.format(table='students')}
             FROM students
         """)
         students = cursor.fetchall()
-        logger.info(f"Successfully fetched {len(students)} students")
+        logger.debug("Successfully fetched %s students", len(students))
+        return students
+    except sqlite3.Error as e:
+        logger.error("Database error while fetching students: %s", e)
+        return []
+    finally:
+        if conn is not None:
+            conn.close()
+
+STUDENT_PAGE_SIZE = 200
+
+def _student_filters(program=None, year_level=None, enrollment_status=None):
+    """Build WHERE conditions and parameters for the optional student filters."""
+    conditions = []
+    params = []
+    for column, value in (('program', program), ('year_level', year_level),
+                          ('enrollment_status', enrollment_status)):
+        if value:
+            conditions.append(f"{column} = ?")
+            params.append(value)
+    return conditions, params
+
+def fetch_student_page(after_id=None, page_size=STUDENT_PAGE_SIZE, program=None,
+                       year_level=None, enrollment_status=None, offset=0):
+    """Fetch one page of students ordered by student ID.
+
+    Pages are keyset-paginated: pass the student_id of the last row of the
+    previous page as after_id to get the next one. A page shorter than
+    page_size is the last page. offset skips rows instead, for jumping to a
+    position whose previous page is not known.
+    """
+    logger.debug("Fetching student page after %s (size %s)", after_id, page_size)
+    conditions, params = _student_filters(program, year_level, enrollment_status)
+    if after_id is not None:
+        conditions.insert(0, "student_id > ?")
+        params.insert(0, str(after_id))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT student_id, name, mobile_number, email_address,
+                   year_level, semester, college, program,
+                   school_year, enrollment_status,
+                   {STUDENT_GWA_SQL.format(table='students')}
+            FROM students
+            {where}
+            ORDER BY student_id
+            LIMIT ? OFFSET ?
+        """, params + [page_size, offset])
+        students = cursor.fetchall()
+        logger.debug("Fetched %s students after %s", len(students), after_id)
         return students
     except sqlite3.Error as e:
-        logger.error(f"Database error while fetching students: {e}")
+        logger.error("Database error while fetching student page: %s", e)
         return []
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+
+def count_students(program=None, year_level=None, enrollment_status=None):
+    """Count the students matching the optional filters."""
+    conditions, params = _student_filters(program, year_level, enrollment_status)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM students {where}", params)
+        return cursor.fetchone()[0]
+    except sqlite3.Error as e:
+        logger.error("Database error while counting students: %s", e)
+        return 0
+    finally:
+        if conn is not None:
+            conn.close()
+
+# Ratings are stored in hundredths and shown the way RATING_SCALE lists them
+GRADE_RATING_SQL = "printf('%.2f', rating_hundredths / 100.0)"
 
 def fetch_student_grades(student_id):
     """Fetch grades for a specific student."""
-    logger.debug(f"Fetching grades for student: {student_id}")
+    key = _cache_key(student_id)
+    version = _table_version('grades')
+    if version is not None:
+        grades = student_grades_cache.get(key, version)
+        if grades is not MISSING:
+            return list(grades)
+    token = student_grades_cache.token()
+    logger.debug("Fetching grades for student: %s", student_id)
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT subject, units, rating, final_grade, status,
-                   year_level, semester
+        cursor.execute(f"""
+            SELECT subject, units, {GRADE_RATING_SQL}, final_hundredths / 100.0,
+                   {status_name_sql('status_code')}, year_level, semester
             FROM grades 
             WHERE student_id = ?
             ORDER BY year_level, semester, subject
         """, (student_id,))
         grades = cursor.fetchall()
-        logger.info(f"Successfully fetched {len(grades)} grades for student: {student_id}")
+        logger.debug("Successfully fetched %s grades for student: %s", len(grades), student_id)
+        if version is not None:
+            student_grades_cache.put(key, tuple(grades), token, version)
         return grades
     except sqlite3.Error as e:
-        logger.error(f"Database error while fetching grades: {e}")
+        logger.error("Database error while fetching grades: %s", e)
         return []
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+
+# Ratings offered when entering a grade, best to worst
+RATING_SCALE = ('1.00', '1.25', '1.50', '1.75', '2.00', '2.25', '2.50', '2.75', '3.00', '5.00')
+
+def validate_grade_values(units, rating, year_level, semester):
+    """Validate and convert the numeric fields of a grade.
+
+    Returns the converted (units, rating, year_level, semester) tuple and
+    raises ValueError describing the first invalid field.
+    """
+    units = int(units)
+    rating = float(rating)
+    year_level = int(year_level)
+    semester = int(semester)
+    
+    if units <= 0 or units > 6:
+        raise ValueError("Invalid units value")
+    if rating < 1.0 or rating > 5.0:
+        raise ValueError("Invalid rating value")
+    if year_level < 1 or year_level > 5:
+        raise ValueError("Invalid year level")
+    if semester < 1 or semester > 3:
+        raise ValueError("Invalid semester")
+    return units, rating, year_level, semester
+
+def _hundredths(value):
+    return int(round(float(value) * 100))
+
+def grade_storage_values(rating, final_grade, status):
+    """Convert a validated rating, final grade and status to stored form.
+
+    final_grade defaults to the rating and status is derived from it when
+    empty. Returns (rating_hundredths, final_hundredths, status_code) and
+    raises ValueError for an unknown status.
+    """
+    final_grade = rating if final_grade in (None, '') else final_grade
+    if not status:
+        status_code = STATUS_PASSED if rating < 3.0 else STATUS_FAILED
+    elif status in GRADE_STATUSES:
+        status_code = GRADE_STATUSES.index(status)
+    else:
+        raise ValueError("Invalid status")
+    return _hundredths(rating), _hundredths(final_grade), status_code
+
+UPSERT_GRADE_SQL = """
+    INSERT INTO grades (student_id, subject, units, rating_hundredths,
+                      final_hundredths, status_code, year_level, semester)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (student_id, year_level, semester, subject) DO UPDATE
+    SET units = excluded.units, rating_hundredths = excluded.rating_hundredths,
+        final_hundredths = excluded.final_hundredths, status_code = excluded.status_code
+"""
+
+# sqlite_sequence is only written back once the statement ends, so the
+# subquery sees the highest id handed out before it: an inserted row has a
+# larger id than that, an updated one cannot (grades.id is AUTOINCREMENT).
+UPSERT_GRADE_RETURNING_SQL = UPSERT_GRADE_SQL + """
+    RETURNING id > COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'grades'), 0)
+"""
+
+def _upsert_grade(cursor, params):
+    """Upsert one grade and report GRADE_INSERTED or GRADE_UPDATED."""
+    inserted, = cursor.execute(UPSERT_GRADE_RETURNING_SQL, params).fetchone()
+    return GRADE_INSERTED if inserted else GRADE_UPDATED
 
 def update_grade(student_id, subject, units, rating, final_grade, status, year_level, semester):
-    """Update or insert a grade for a student."""
-    logger.debug(f"Updating grade for student {student_id}, subject {subject}")
+    """Update or insert a grade for a student.
+
+    Returns GRADE_INSERTED or GRADE_UPDATED on success and False on failure.
+    """
+    logger.debug("Updating grade for student %s, subject %s", student_id, subject)
     
     # Validate input data
     try:
-        units = int(units)
-        rating = float(rating)
-        year_level = int(year_level)
-        semester = int(semester)
-        
-        if units <= 0 or units > 6:
-            logger.error("Invalid units value")
-            return False
-        if rating < 1.0 or rating > 5.0:
-            logger.error("Invalid rating value")
-            return False
-        if year_level < 1 or year_level > 5:
-            logger.error("Invalid year level")
-            return False
-        if semester < 1 or semester > 3:
-            logger.error("Invalid semester")
-            return False
+        units, rating, year_level, semester = validate_grade_values(
+            units, rating, year_level, semester)
+        rating, final_grade, status = grade_storage_values(rating, final_grade, status)
     except ValueError as e:
-        logger.error(f"Data validation error: {e}")
+        logger.error("Data validation error: %s", e)
         return False
     
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
+        result = _upsert_grade(cursor, (student_id, subject, units, rating, final_grade,
+                                        status, year_level, semester))
+        conn.commit()
+        invalidate_student_caches(student_id, info=False)
         
-        # Check if grade exists
-        cursor.execute("""
-            SELECT id FROM grades 
-            WHERE student_id = ? AND subject = ? AND year_level = ? AND semester = ?
-        """, (student_id, subject, year_level, semester))
-        
-        exists = cursor.fetchone()
-        
-        if exists:
-            # Update existing grade
-            cursor.execute("""
-                UPDATE grades 
-                SET units = ?, rating = ?, final_grade = ?, status = ?
-                WHERE student_id = ? AND subject = ? AND year_level = ? AND semester = ?
-            """, (units, rating, final_grade, status, 
-                  student_id, subject, year_level, semester))
-            logger.info(f"Updated grade for student {student_id}, subject {subject}")
+        if result == GRADE_INSERTED:
+            logger.info("Inserted new grade for student %s, subject %s", student_id, subject)
         else:
-            # Insert new grade
-            cursor.execute("""
-                INSERT INTO grades (student_id, subject, units, rating, 
-                                  final_grade, status, year_level, semester)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (student_id, subject, units, rating, final_grade, 
-                  status, year_level, semester))
-            logger.info(f"Inserted new grade for student {student_id}, subject {subject}")
-        
-        conn.commit()
-        return True
+            logger.info("Updated grade for student %s, subject %s", student_id, subject)
+        return result
     except sqlite3.Error as e:
-        logger.error(f"Database error while updating grade: {e}")
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
+        logger.error("Database error while updating grade: %s", e)
         return False
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+
+GRADE_FIELDS = ('student_id', 'subject', 'units', 'rating',
+                'final_grade', 'status', 'year_level', 'semester')
+
+def grade_params(grade):
+    """Build upsert parameters from a grade mapping or update_grade-ordered sequence."""
+    if not isinstance(grade, dict):
+        grade = dict(zip(GRADE_FIELDS, grade))
+    student_id = str(grade.get('student_id') or '').strip()
+    subject = str(grade.get('subject') or '').strip()
+    if not student_id or not subject:
+        raise ValueError("Student ID and subject are required")
+    units, rating, year_level, semester = validate_grade_values(
+        grade.get('units'), grade.get('rating'),
+        grade.get('year_level'), grade.get('semester'))
+    rating, final_grade, status = grade_storage_values(
+        rating, grade.get('final_grade'), grade.get('status'))
+    return (student_id, subject, units, rating, final_grade,
+            status, year_level, semester)
+
+def update_grades(grades):
+    """Update or insert several grades in a single transaction.
+
+    Takes the same grades as bulk_upsert_grades but reports each one, like
+    update_grade: returns a list with GRADE_INSERTED, GRADE_UPDATED or False
+    per grade. A database error fails (and rolls back) the whole batch.
+    """
+    logger.debug("Updating %s grades", len(grades))
+    results = [False] * len(grades)
+    rows = []
+    for index, grade in enumerate(grades):
+        try:
+            rows.append((index, grade_params(grade)))
+        except (ValueError, TypeError) as e:
+            logger.error("Data validation error: %s", e)
+    if not rows:
+        return results
+
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        for index, params in rows:
+            try:
+                results[index] = _upsert_grade(cursor, params)
+            except sqlite3.IntegrityError as e:
+                logger.error("Rejected grade for student %s, subject %s: %s",
+                             params[0], params[1], e)
+        conn.commit()
+        invalidate_student_caches(*{params[0] for _, params in rows}, info=False)
+        logger.info("Updated %s of %s grades", len(grades) - results.count(False), len(grades))
+        return results
+    except sqlite3.Error as e:
+        if conn is not None and conn.in_transaction:
+            conn.rollback()
+        logger.error("Database error while updating grades: %s", e)
+        return [False] * len(grades)
+    finally:
+        if conn is not None:
+            conn.close()
+
+def _execute_batch(sql, indexed_params, failures):
+    """Run one statement for many rows inside a single transaction.
+
+    indexed_params yields (row_index, params) pairs. Rows the database
+    rejects with an integrity error are appended to failures and skipped;
+    any other database error rolls back the whole batch.
+
+    Returns the number of rows written.
+    """
+    progress = {'index': None, 'yielded': 0}
+    
+    def params():
+        for index, row in indexed_params:
+            progress['index'] = index
+            progress['yielded'] += 1
+            yield row
+    
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        rows = params()
+        rejected = 0
+        while True:
+            try:
+                # A failing row only rolls back its own statement, so resume
+                # the same generator after recording it.
+                cursor.executemany(sql, rows)
+                break
+            except sqlite3.IntegrityError as e:
+                failures.append((progress['index'], str(e)))
+                rejected += 1
+        conn.commit()
+        return progress['yielded'] - rejected
+    except sqlite3.Error as e:
+        if conn is not None:
+            conn.rollback()
+        failures.append((None, str(e)))
+        raise
+    finally:
+        if conn is not None:
+            conn.close()
+
+def bulk_upsert_grades(grades):
+    """Insert or update many grades in a single transaction.
+
+    Each grade is a mapping with GRADE_FIELDS keys or a sequence in
+    update_grade() argument order; final_grade defaults to the rating and
+    status is derived from it when omitted. Invalid rows are skipped and
+    reported instead of aborting the batch.
+
+    Returns (posted, failures) where failures is a list of
+    (row_index, reason) tuples. If the transaction itself fails nothing is
+    posted and the failure is reported with a row_index of None.
+    """
+    logger.debug("Bulk posting grades")
+    failures = []
+    student_ids = set()
+    
+    def valid_rows():
+        for index, grade in enumerate(grades):
+            try:
+                params = grade_params(grade)
+            except (ValueError, TypeError) as e:
+                failures.append((index, str(e)))
+                continue
+            student_ids.add(params[0])
+            yield index, params
+    
+    try:
+        posted = _execute_batch(UPSERT_GRADE_SQL, valid_rows(), failures)
+    except sqlite3.Error as e:
+        logger.error("Database error while posting grades: %s", e)
+        return 0, failures
+    invalidate_student_caches(*student_ids, info=False)
+    
+    failures.sort(key=lambda failure: failure[0])
+    logger.info("Posted %s grades (%s rejected)", posted, len(failures))
+    return posted, failures
 
 def delete_grade(student_id, subject, year_level, semester):
     """Delete a grade for a student."""
-    logger.debug(f"Deleting grade for student {student_id}, subject {subject}")
+    logger.debug("Deleting grade for student %s, subject %s", student_id, subject)
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -132,85 +452,130 @@ def delete_grade(student_id, subject, year_level, semester):
             WHERE student_id = ? AND subject = ? AND year_level = ? AND semester = ?
         """, (student_id, subject, year_level, semester))
         conn.commit()
-        logger.info(f"Deleted grade for student {student_id}, subject {subject}")
+        invalidate_student_caches(student_id, info=False)
+        logger.info("Deleted grade for student %s, subject %s", student_id, subject)
         return True
     except sqlite3.Error as e:
-        logger.error(f"Database error while deleting grade: {e}")
+        logger.error("Database error while deleting grade: %s", e)
         return False
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+
+SEARCH_RESULT_LIMIT = 500
+
+def build_search_query(query):
+    """Turn free text into an FTS5 query where every word must match as a prefix."""
+    words = tokenize(query)
+    return ' '.join(f'"{word}"*' for word in words)
+
+def search_students(query, limit=SEARCH_RESULT_LIMIT):
+    """Search for students by ID, name, email, mobile, college, program or status.
 
-def search_students(query):
-    """Search for students based on a query."""
-    logger.debug(f"Searching for students with query: {query}")
+    Every word in the query must match the start of a word in one of those
+    fields. Returns rows shaped like fetch_student_data(), at most limit.
+    """
+    logger.debug("Searching for students with query: %s", query)
+    match = build_search_query(query)
+    if not match:
+        return []
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
-        search_pattern = f"%{query}%"
-        cursor.execute("""
-            SELECT student_id, name, course, mobile_number, email_address 
-            FROM students
-            WHERE student_id LIKE ? OR name LIKE ? 
-            OR course LIKE ? OR mobile_number LIKE ? OR email_address LIKE ?
-        """, (search_pattern, search_pattern, search_pattern, search_pattern, search_pattern))
+        cursor.execute(f"""
+            SELECT s.student_id, s.name, s.mobile_number, s.email_address,
+                   s.year_level, s.semester, s.college, s.program,
+                   s.school_year, s.enrollment_status,
+                   {STUDENT_GWA_SQL.format(table='s')}
+            FROM students_fts
+            JOIN students s ON s.rowid = students_fts.rowid
+            WHERE students_fts MATCH ?
+            LIMIT ?
+        """, (match, limit))
         results = cursor.fetchall()
-        logger.info(f"Found {len(results)} students matching query: {query}")
+        logger.debug("Found %s students matching query: %s", len(results), query)
         return results
     except sqlite3.Error as e:
-        logger.error(f"Database error while searching: {e}")
+        logger.error("Database error while searching: %s", e)
         return []
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
 
-def fetch_user_credentials(student_number, password):
-    """Verify student login credentials."""
-    logger.debug(f"Attempting to fetch credentials for student: {student_number}")
+def _check_login(table, key_column, account_id, password, role):
+    """Check a password against an account's stored hash.
+
+    Returns LOGIN_OK, LOGIN_WRONG_PASSWORD or LOGIN_UNKNOWN_ACCOUNT, and
+    LOGIN_WRONG_PASSWORD when the database cannot be read. The connection
+    is returned before hashing, which takes ~100 ms. A plaintext or
+    outdated hash is replaced after a successful login, unless the password
+    changed in the meantime.
+    """
+    logger.debug("Attempting to fetch credentials for %s: %s", role, account_id)
+    conn = None
     try:
         conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT 1 FROM students 
-            WHERE student_id = ? AND password = ?
-        """, (student_number, password))
-        result = cursor.fetchone() is not None
-        if result:
-            logger.info(f"Successfully authenticated student: {student_number}")
-        else:
-            logger.warning(f"Failed login attempt for student: {student_number}")
-        return result
+        row = conn.execute(f"SELECT password FROM {table} WHERE {key_column} = ?",
+                           (account_id,)).fetchone()
     except sqlite3.Error as e:
-        logger.error(f"Database error while fetching credentials: {e}")
-        return False
+        logger.error("Database error while fetching credentials: %s", e)
+        return LOGIN_WRONG_PASSWORD
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+
+    if row is None:
+        dummy_verify(password)
+        logger.warning("Failed login attempt for unknown %s: %s", role, account_id)
+        return LOGIN_UNKNOWN_ACCOUNT
+    if not verify_password(password, row[0]):
+        logger.warning("Failed login attempt for %s: %s", role, account_id)
+        return LOGIN_WRONG_PASSWORD
+    logger.info("Successfully authenticated %s: %s", role, account_id)
+
+    if needs_rehash(row[0]):
+        conn = None
+        try:
+            conn = get_db_connection()
+            conn.execute(f"UPDATE {table} SET password = ? WHERE {key_column} = ? AND password = ?",
+                         (hash_password(password), account_id, row[0]))
+            conn.commit()
+            logger.info("Upgraded password hash for %s: %s", role, account_id)
+        except sqlite3.Error as e:
+            # The login itself succeeded; the upgrade is retried next time
+            logger.error("Database error while upgrading password hash: %s", e)
+        finally:
+            if conn is not None:
+                conn.close()
+    return LOGIN_OK
+
+def check_student_login(student_number, password):
+    """Check student login credentials; LOGIN_OK, LOGIN_WRONG_PASSWORD or LOGIN_UNKNOWN_ACCOUNT."""
+    return _check_login('students', 'student_id', student_number, password, 'student')
+
+def check_registrar_login(registrar_number, password):
+    """Check registrar login credentials; LOGIN_OK, LOGIN_WRONG_PASSWORD or LOGIN_UNKNOWN_ACCOUNT."""
+    return _check_login('registrars', 'registrar_id', registrar_number, password, 'registrar')
+
+def fetch_user_credentials(student_number, password):
+    """Verify student login credentials."""
+    return check_student_login(student_number, password) == LOGIN_OK
 
 def fetch_user_credentials2(registrar_number, password):
     """Verify registrar login credentials."""
-    logger.debug(f"Attempting to fetch credentials for registrar: {registrar_number}")
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT 1 FROM registrars 
-            WHERE registrar_id = ? AND password = ?
-        """, (registrar_number, password))
-        result = cursor.fetchone() is not None
-        if result:
-            logger.info(f"Successfully authenticated registrar: {registrar_number}")
-        else:
-            logger.warning(f"Failed login attempt for registrar: {registrar_number}")
-        return result
-    except sqlite3.Error as e:
-        logger.error(f"Database error while fetching credentials: {e}")
-        return False
-    finally:
-        conn.close()
+    return check_registrar_login(registrar_number, password) == LOGIN_OK
+
+def _stored_password(password):
+    """The hash to store for a new password (None stays None and is rejected)."""
+    return None if password is None else hash_password(password)
 
 def insert_user_data_st(student_number, name, mobile_number, email_address, password, 
                        year_level='1', semester='1', college='', program='', 
                        school_year='', enrollment_status='Enrolled'):
     """Insert a new student."""
-    logger.debug(f"Inserting new student: {student_number}")
+    logger.debug("Inserting new student: %s", student_number)
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -219,22 +584,62 @@ def insert_user_data_st(student_number, name, mobile_number, email_address, pass
             (student_id, name, mobile_number, email_address, password,
              year_level, semester, college, program, school_year, enrollment_status)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (student_number, name, mobile_number, email_address, password,
+        """, (student_number, name, mobile_number, email_address, _stored_password(password),
               year_level, semester, college, program, school_year, enrollment_status))
         conn.commit()
-        logger.info(f"Successfully inserted student: {student_number}")
+        # A lookup made before the student existed cached None
+        invalidate_student_caches(student_number, grades=False)
+        logger.info("Successfully inserted student: %s", student_number)
         return True
     except sqlite3.Error as e:
-        logger.error(f"Database error while inserting student: {e}")
+        logger.error("Database error while inserting student: %s", e)
         return False
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+
+STUDENT_FIELDS = ('student_id', 'name', 'mobile_number', 'email_address', 'password',
+                  'year_level', 'semester', 'college', 'program', 'school_year',
+                  'enrollment_status')
+
+def bulk_insert_students(students):
+    """Insert many students in a single transaction.
+
+    Each student is a sequence in STUDENT_FIELDS order. Rows the database
+    rejects (e.g. a duplicate student number) are skipped and reported.
+
+    Returns (inserted, failures) where failures is a list of
+    (row_index, reason) tuples.
+    """
+    logger.debug("Bulk inserting students")
+    # Hashing dominates an import, so it is spread over a process pool
+    students = [list(student) for student in students]
+    passwords = [(index, student[4]) for index, student in enumerate(students)
+                 if len(student) > 4 and student[4] is not None]
+    for (index, _), hashed in zip(passwords, hash_passwords(password for _, password in passwords)):
+        students[index][4] = hashed
+    failures = []
+    try:
+        inserted = _execute_batch("""
+            INSERT INTO students 
+            (student_id, name, mobile_number, email_address, password,
+             year_level, semester, college, program, school_year, enrollment_status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, enumerate(students), failures)
+    except sqlite3.Error as e:
+        logger.error("Database error while inserting students: %s", e)
+        return 0, failures
+    invalidate_student_caches(*(student[0] for student in students), grades=False)
+    
+    logger.info("Inserted %s students (%s rejected)", inserted, len(failures))
+    return inserted, failures
 
 def update_student_data(student_id, name, mobile_number, email_address, 
                        year_level=None, semester=None, college=None, program=None, 
                        school_year=None, enrollment_status=None):
     """Update student information."""
-    logger.debug(f"Updating student: {student_id}")
+    logger.debug("Updating student: %s", student_id)
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -248,17 +653,27 @@ def update_student_data(student_id, name, mobile_number, email_address,
               year_level, semester, college, program,
               school_year, enrollment_status, student_id))
         conn.commit()
-        logger.info(f"Successfully updated student: {student_id}")
+        invalidate_student_caches(student_id, grades=False)
+        logger.info("Successfully updated student: %s", student_id)
         return True
     except sqlite3.Error as e:
-        logger.error(f"Database error while updating student: {e}")
+        logger.error("Database error while updating student: %s", e)
         return False
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
 
 def get_student_info(student_id):
     """Get detailed information about a student."""
-    logger.debug(f"Fetching info for student: {student_id}")
+    key = _cache_key(student_id)
+    version = _table_version('students')
+    if version is not None:
+        student_info = student_info_cache.get(key, version)
+        if student_info is not MISSING:
+            return student_info
+    token = student_info_cache.token()
+    logger.debug("Fetching info for student: %s", student_id)
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -270,17 +685,90 @@ def get_student_info(student_id):
             WHERE student_id = ?
         """, (student_id,))
         student_info = cursor.fetchone()
-        logger.info(f"Successfully fetched student info: {student_id}")
+        logger.debug("Successfully fetched student info: %s", student_id)
+        if version is not None:
+            student_info_cache.put(key, student_info, token, version)
         return student_info
     except sqlite3.Error as e:
-        logger.error(f"Database error while fetching student info: {e}")
+        logger.error("Database error while fetching student info: %s", e)
         return None
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
+
+def get_student_summary(student_id):
+    """Get a student's overall GWA and units from the summary table.
+
+    Returns (gwa, units_total, units_earned, failed_units, updated_at), or
+    None if the student has no grades or on error.
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT gwa, units_total, units_earned, failed_units, updated_at
+            FROM student_summary
+            WHERE student_id = ?
+        """, (str(student_id),))
+        return cursor.fetchone()
+    except sqlite3.Error as e:
+        logger.error("Database error while fetching student summary: %s", e)
+        return None
+    finally:
+        if conn is not None:
+            conn.close()
+
+def fetch_term_summaries(student_id):
+    """Get a student's GWA and units per year level and semester.
+
+    Returns (year_level, semester, gwa, units_total, units_earned,
+    failed_units) rows in term order.
+    """
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT year_level, semester, gwa, units_total, units_earned, failed_units
+            FROM student_term_summary
+            WHERE student_id = ?
+            ORDER BY year_level, semester
+        """, (str(student_id),))
+        return cursor.fetchall()
+    except sqlite3.Error as e:
+        logger.error("Database error while fetching term summaries: %s", e)
+        return []
+    finally:
+        if conn is not None:
+            conn.close()
+
+def rebuild_student_summaries():
+    """Recompute the summary tables from the grades table.
+
+    The triggers keep them current; this repairs them after grades were
+    changed with the triggers absent, e.g. by an external tool.
+    """
+    logger.info("Rebuilding student summaries")
+    conn = None
+    try:
+        conn = get_db_connection()
+        for table, key in SUMMARY_TABLES:
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(summary_backfill_sql(table, key))
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        logger.error("Database error while rebuilding student summaries: %s", e)
+        return False
+    finally:
+        if conn is not None:
+            conn.close()
 
 def delete_student(student_id):
     """Delete a student and their grades."""
-    logger.debug(f"Attempting to delete student: {student_id}")
+    logger.debug("Attempting to delete student: %s", student_id)
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
@@ -289,51 +777,33 @@ def delete_student(student_id):
         # Delete student
         cursor.execute("DELETE FROM students WHERE student_id = ?", (student_id,))
         conn.commit()
-        logger.info(f"Successfully deleted student: {student_id}")
+        invalidate_student_caches(student_id)
+        logger.info("Successfully deleted student: %s", student_id)
         return True
     except sqlite3.Error as e:
-        logger.error(f"Database error while deleting student: {e}")
+        logger.error("Database error while deleting student: %s", e)
         return False
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
 
 def insert_user_dataR(registrar_id, name, password):
     """Insert a new registrar."""
-    logger.debug(f"Attempting to insert new registrar: {registrar_id}")
+    logger.debug("Attempting to insert new registrar: %s", registrar_id)
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         cursor.execute("""
             INSERT INTO registrars (registrar_id, name, password)
             VALUES (?, ?, ?)
-        """, (registrar_id, name, password))
+        """, (registrar_id, name, _stored_password(password)))
         conn.commit()
-        logger.info(f"Successfully inserted registrar: {registrar_id}")
+        logger.info("Successfully inserted registrar: %s", registrar_id)
         return True
     except sqlite3.Error as e:
-        logger.error(f"Database error while inserting registrar: {e}")
+        logger.error("Database error while inserting registrar: %s", e)
         return False
     finally:
-        conn.close()
-
-def populate_treeview_from_db(treeview):
-    """Populate treeview with student data from the database."""
-    # Clear existing items
-    for item in treeview.get_children():
-        treeview.delete(item)
-    
-    try:
-        # Fetch student data
-        students = fetch_student_data()
-        
-        # Insert into treeview
-        for student in students:
-            student_id, name, mobile, email, year, term, college, program, school_year, status = student
-            treeview.insert('', 'end', values=(
-                student_id, name, mobile, email, 
-                year, term, college, program,
-                school_year, status
-            ))
-            
-    except Exception as e:
-        logger.error(f"Error populating treeview: {e}")
+        if conn is not None:
+            conn.close()
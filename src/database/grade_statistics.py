@@ -0,0 +1,104 @@
+"""
+Grade distribution statistics for the Grade Evaluation System.
+"""
+
+import sqlite3
+from bisect import bisect_left
+from ..utils.logger import logger
+from .change_tracking import cached_until_changed
+from .database_operations import RATING_SCALE, get_db_connection
+from .migrations import STATUS_PASSED
+
+SCALE_HUNDREDTHS = [round(float(rating) * 100) for rating in RATING_SCALE]
+
+def scale_bucket(hundredths):
+    """The RATING_SCALE entry a rating (in hundredths) is counted under.
+
+    Ratings between scale steps fall into the next worse step.
+    """
+    index = min(bisect_left(SCALE_HUNDREDTHS, hundredths), len(RATING_SCALE) - 1)
+    return RATING_SCALE[index]
+
+def _nth_rating(counts, n):
+    """The n-th smallest rating (0-based) in sorted (hundredths, count, ...) rows."""
+    seen = 0
+    for hundredths, count, _ in counts:
+        seen += count
+        if n < seen:
+            return hundredths
+    raise IndexError(n)
+
+def summarize_distribution(counts):
+    """Statistics of one group from its exact (hundredths, count, passed) rows.
+
+    counts must be sorted by rating. The median is read off the cumulative
+    counts, averaging the two middle ratings for an even count.
+    """
+    total = sum(count for _, count, _ in counts)
+    histogram = dict.fromkeys(RATING_SCALE, 0)
+    weighted = passed = 0
+    for hundredths, count, group_passed in counts:
+        histogram[scale_bucket(hundredths)] += count
+        weighted += hundredths * count
+        passed += group_passed
+
+    median = None
+    if total:
+        median = (_nth_rating(counts, (total - 1) // 2) + _nth_rating(counts, total // 2)) / 200
+
+    return {
+        'count': total,
+        'mean': round(weighted / total / 100, 4) if total else None,
+        'median': median,
+        'pass_rate': round(passed / total, 4) if total else None,
+        'histogram': histogram,
+    }
+
+@cached_until_changed('grades')
+def subject_statistics(subject=None, year_level=None, semester=None):
+    """Rating statistics per subject and term.
+
+    A single grouped pass counts grades per exact rating; the count, mean,
+    median, pass rate and histogram over RATING_SCALE are derived from those
+    counts. Returns one dict per subject, year level and semester.
+    """
+    conditions = []
+    params = []
+    for column, value in (('subject', subject), ('year_level', year_level),
+                          ('semester', semester)):
+        if value:
+            conditions.append(f"{column} = ?")
+            params.append(str(value))
+    where = f"AND {' AND '.join(conditions)}" if conditions else ""
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT subject, year_level, semester, rating_hundredths,
+                   COUNT(*), SUM(status_code = {STATUS_PASSED})
+            FROM grades
+            WHERE rating_hundredths IS NOT NULL {where}
+            GROUP BY subject, year_level, semester, rating_hundredths
+            ORDER BY subject, year_level, semester, rating_hundredths
+        """, params)
+
+        results = []
+        group, counts = None, []
+        for row in cursor:
+            if row[:3] != group:
+                if counts:
+                    results.append(dict(zip(('subject', 'year_level', 'semester'), group),
+                                        **summarize_distribution(counts)))
+                group, counts = row[:3], []
+            counts.append(row[3:])
+        if counts:
+            results.append(dict(zip(('subject', 'year_level', 'semester'), group),
+                                **summarize_distribution(counts)))
+        return results
+    except sqlite3.Error as e:
+        logger.error("Database error while computing grade statistics: %s", e)
+        return []
+    finally:
+        if conn is not None:
+            conn.close()
@@ -0,0 +1,168 @@
+"""
+Headless CSV import of students and grades for the Grade Evaluation System.
+
+Usage:
+    python -m src.database.import_csv students intake.csv
+    python -m src.database.import_csv grades grades.csv --chunk-size 2000 --rejects rejected.csv
+
+Rows are streamed from the file, validated one at a time and written in
+chunked transactions, so memory use does not grow with the file size.
+"""
+
+import argparse
+import csv
+import sys
+import time
+from itertools import islice
+from ..utils.logger import logger
+from ..utils.validation import validate_email, validate_mobile
+from .connection_pool import configure_pool
+from .database_operations import (
+    GRADE_FIELDS, STUDENT_FIELDS, bulk_insert_students, bulk_upsert_grades
+)
+from .init_database import init_db
+
+DEFAULT_CHUNK_SIZE = 1000
+
+STUDENT_DEFAULTS = {
+    'year_level': '1',
+    'semester': '1',
+    'college': 'EECP',
+    'program': 'BSIT',
+    'school_year': '2024-2025',
+    'enrollment_status': 'Enrolled',
+}
+
+def read_rows(path):
+    """Yield (line_number, row) pairs from a CSV file with a header row."""
+    with open(path, newline='', encoding='utf-8-sig') as csv_file:
+        reader = csv.DictReader(csv_file)
+        for row in reader:
+            yield reader.line_num, {key.strip(): (value or '').strip()
+                                    for key, value in row.items() if key}
+
+def validate_student_row(row):
+    """Validate a student CSV row and return it in STUDENT_FIELDS order."""
+    for field in ('student_id', 'name', 'mobile_number', 'email_address', 'password'):
+        if not row.get(field):
+            raise ValueError(f"Missing {field}")
+    if not validate_email(row['email_address']):
+        raise ValueError("Invalid email address")
+    if not validate_mobile(row['mobile_number']):
+        raise ValueError("Invalid mobile number")
+
+    student = dict(STUDENT_DEFAULTS)
+    student.update({key: value for key, value in row.items() if value})
+    if student['year_level'] not in ('1', '2', '3', '4', '5'):
+        raise ValueError("Invalid year level")
+    if student['semester'] not in ('1', '2', '3'):
+        raise ValueError("Invalid semester")
+    student['name'] = student['name'].upper()
+    student['email_address'] = student['email_address'].lower()
+    return tuple(student[field] for field in STUDENT_FIELDS)
+
+def chunked(iterable, size):
+    """Yield lists of up to size items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+class RejectWriter:
+    """Append rejected rows and their reasons to a side CSV file, opened lazily."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, line_number, row, reason):
+        self.count += 1
+        if self.path is None:
+            logger.warning("Rejected line %s: %s", line_number, reason)
+            return
+        if self._writer is None:
+            self._file = open(self.path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(['line', 'reason'] + list(row.keys()))
+        self._writer.writerow([line_number, reason] + list(row.values()))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+def import_students(path, chunk_size=DEFAULT_CHUNK_SIZE, rejects_path=None):
+    """Import students from a CSV file. Returns (imported, rejected, seconds)."""
+    return _import(path, chunk_size, rejects_path, validate_student_row, bulk_insert_students)
+
+def import_grades(path, chunk_size=DEFAULT_CHUNK_SIZE, rejects_path=None):
+    """Import grades from a CSV file. Returns (imported, rejected, seconds)."""
+    # bulk_upsert_grades validates the numeric fields itself
+    return _import(path, chunk_size, rejects_path,
+                   lambda row: {field: row.get(field) for field in GRADE_FIELDS},
+                   bulk_upsert_grades)
+
+def _import(path, chunk_size, rejects_path, validate_row, write_chunk):
+    """Stream, validate and write a CSV file in chunked transactions."""
+    rejects = RejectWriter(rejects_path)
+    imported = 0
+    started = time.perf_counter()
+
+    def valid_rows():
+        for line_number, row in read_rows(path):
+            try:
+                yield line_number, row, validate_row(row)
+            except ValueError as e:
+                rejects.write(line_number, row, str(e))
+
+    try:
+        for chunk in chunked(valid_rows(), chunk_size):
+            written, failures = write_chunk([params for _, _, params in chunk])
+            imported += written
+            reasons = {}
+            for index, reason in failures:
+                if index is None:
+                    # The whole chunk was rolled back; rows without a
+                    # failure of their own are rejected with it
+                    for other in range(len(chunk)):
+                        reasons.setdefault(other, reason)
+                else:
+                    reasons.setdefault(index, reason)
+            for index in sorted(reasons):
+                line_number, row, _ = chunk[index]
+                rejects.write(line_number, row, reasons[index])
+
+            elapsed = time.perf_counter() - started
+            logger.info("Imported %s rows from %s (%.0f rows/sec)",
+                        imported, path, imported / elapsed if elapsed else 0)
+    finally:
+        rejects.close()
+
+    return imported, rejects.count, time.perf_counter() - started
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Import students or grades from a CSV file.")
+    parser.add_argument('kind', choices=['students', 'grades'], help="Type of records in the file")
+    parser.add_argument('csv_file', help="CSV file with a header row")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Rows written per transaction")
+    parser.add_argument('--rejects', help="CSV file to write rejected rows to")
+    parser.add_argument('--db', help="Database file (defaults to data/eecp_gesys.db)")
+    args = parser.parse_args(argv)
+
+    init_db(args.db)
+    configure_pool(args.db)
+
+    importer = import_students if args.kind == 'students' else import_grades
+    imported, rejected, seconds = importer(args.csv_file, args.chunk_size, args.rejects)
+    rate = imported / seconds if seconds else 0
+    print(f"Imported {imported} {args.kind} in {seconds:.2f}s ({rate:.0f} rows/sec), "
+          f"{rejected} rejected")
+    return 0 if not rejected else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,110 +2,97 @@
 Initialize the database for the Grade Evaluation System.
 """
 
-import sqlite3
 import os
-from datetime import datetime
+import sys
+from .connection_pool import DEFAULT_DB_PATH, apply_pragmas, connect, get_profile_pragmas
+from .database_operations import student_grades_cache, student_info_cache
+from .migrations import MIGRATIONS, current_version, migrate
+from ..utils.passwords import hash_password
 
-def init_db():
-    """Initialize the database with tables and sample data."""
-    # Create data directory if it doesn't exist
-    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
-    os.makedirs(data_dir, exist_ok=True)
-    
-    # Connect to database in data directory
-    db_path = os.path.join(data_dir, 'eecp_gesys.db')
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    # Drop existing tables
-    cursor.execute("DROP TABLE IF EXISTS grades")
-    cursor.execute("DROP TABLE IF EXISTS students")
-    cursor.execute("DROP TABLE IF EXISTS registrars")
-
-    # Create tables
-    cursor.execute("""
-    CREATE TABLE students (
-        student_id TEXT PRIMARY KEY,
-        name TEXT NOT NULL,
-        mobile_number TEXT,
-        email_address TEXT,
-        password TEXT NOT NULL,
-        year_level TEXT DEFAULT '1',
-        semester TEXT DEFAULT '1',
-        college TEXT DEFAULT 'EECP',
-        program TEXT DEFAULT 'BSIT',
-        school_year TEXT DEFAULT '2024-2025',
-        enrollment_status TEXT DEFAULT 'Enrolled'
-    )
-    """)
-
-    cursor.execute("""
-    CREATE TABLE registrars (
-        registrar_id TEXT PRIMARY KEY,
-        name TEXT NOT NULL,
-        password TEXT NOT NULL
-    )
-    """)
-
-    cursor.execute("""
-    CREATE TABLE grades (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        student_id TEXT,
-        subject TEXT,
-        units INTEGER,
-        rating TEXT,
-        final_grade REAL,
-        status TEXT,
-        year_level TEXT,
-        semester TEXT,
-        FOREIGN KEY (student_id) REFERENCES students(student_id)
-    )
-    """)
+# Everything the migrations create, dropped by a reset
+SCHEMA_TABLES = ('change_counters', 'student_term_summary', 'student_summary',
+                 'students_fts', 'grades', 'students', 'registrars')
 
-    # Insert default admin registrar
-    cursor.execute("""
+def seed_sample_data(cursor):
+    """Insert the default registrars and sample students into a new database."""
+    # Insert default admin registrar (passwords are stored hashed)
+    cursor.executemany("""
     INSERT INTO registrars (registrar_id, name, password)
-    VALUES 
-        ('REG001', 'System Administrator', 'admin123'),
-        ('REG002', 'Angelo Manalo', 'admin123')
-    """)
+    VALUES (?, ?, ?)
+    """, [('REG001', 'System Administrator', hash_password('admin123')),
+          ('REG002', 'Angelo Manalo', hash_password('admin123'))])
 
     # Insert sample student accounts
-    cursor.execute("""
+    cursor.executemany("""
     INSERT INTO students (
         student_id, name, mobile_number, 
         email_address, password, year_level, 
         semester, college, program, 
         school_year, enrollment_status
-    ) VALUES 
-        ('202410769', 'Angelo Manalo', '09925528110',
-         '202410769@eecp.edu.ph', 'student123', '1',
-         '1', 'EECP', 'BSIT',
-         '2024-2025', 'Enrolled'),
-        ('202400001', 'John Doe', '09123456789',
-         'student@eecp.edu.ph', 'student123', '1',
-         '1', 'EECP', 'BSIT',
-         '2024-2025', 'Enrolled')
-    """)
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [('202410769', 'Angelo Manalo', '09925528110',
+          '202410769@eecp.edu.ph', hash_password('student123'), '1',
+          '1', 'EECP', 'BSIT',
+          '2024-2025', 'Enrolled'),
+         ('202400001', 'John Doe', '09123456789',
+          'student@eecp.edu.ph', hash_password('student123'), '1',
+          '1', 'EECP', 'BSIT',
+          '2024-2025', 'Enrolled')])
 
-    # Insert sample grades
+    # Insert sample grades (ratings in hundredths, status_code 0 = Passed)
     cursor.execute("""
     INSERT INTO grades (
         student_id, subject, units,
-        rating, final_grade, status,
+        rating_hundredths, final_hundredths, status_code,
         year_level, semester
     ) VALUES 
         ('202410769', 'Introduction to Computing', 3,
-         '1.00', 1.00, 'Passed', '1', '1'),
+         100, 100, 0, 1, 1),
         ('202410769', 'Computer Programming 1', 3,
-         '1.25', 1.25, 'Passed', '1', '1'),
+         125, 125, 0, 1, 1),
         ('202410769', 'Computer Programming 2', 3,
-         '1.50', 1.50, 'Passed', '1', '1')
+         150, 150, 0, 1, 1)
     """)
 
-    conn.commit()
-    conn.close()
+
+def init_db(db_path=None, profile=None, reset=False, seed=True):
+    """Bring the database schema up to date, creating the database if needed.
+
+    Existing data is kept: only the migrations the database is missing are
+    applied. Sample accounts are seeded only into a brand-new database, and
+    only with seed=True. reset=True drops all tables first, for a clean
+    development database.
+    """
+    # Create data directory if it doesn't exist
+    db_path = db_path or DEFAULT_DB_PATH
+    if not db_path.startswith('file:'):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    
+    # Connect to database in data directory
+    conn = connect(db_path)
+    try:
+        # journal_mode is persistent, so WAL is recorded in the database file
+        apply_pragmas(conn, get_profile_pragmas(profile))
+
+        if reset:
+            for table in SCHEMA_TABLES:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute("PRAGMA user_version = 0")
+            conn.commit()
+            student_info_cache.clear()
+            student_grades_cache.clear()
+
+        fresh = current_version(conn) == 0 and not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'students'").fetchone()
+        migrate(conn, MIGRATIONS)
+
+        if fresh and seed:
+            cursor = conn.cursor()
+            seed_sample_data(cursor)
+            conn.commit()
+    finally:
+        conn.close()
     print("Database initialized successfully!")
 
 if __name__ == "__main__":
-    init_db()
+    init_db(reset='--reset' in sys.argv[1:])
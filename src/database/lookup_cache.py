@@ -0,0 +1,101 @@
+"""
+Per-key read-through caches for the Grade Evaluation System.
+
+A LookupCache holds one entry per student, and the write functions
+invalidate exactly the students they touch. Each entry also records the
+change counter of its table (see change_tracking) when it was read, and a
+lookup under a different counter is a miss. So a write by another process
+(a CSV import, a second copy of the app) is seen as soon as it commits,
+just as RefreshGate sees it. Entries also expire after a TTL.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_SIZE = int(os.environ.get('GESYS_CACHE_SIZE', 512))
+CACHE_TTL = float(os.environ.get('GESYS_CACHE_TTL', 30))
+
+MISSING = object()
+
+class LookupCache:
+    """A thread-safe LRU cache whose entries expire after ttl seconds.
+
+    maxsize=0 disables caching. A value read before an invalidation is not
+    stored after it: readers take a token() before querying and pass it to
+    put(), so a slow read can never bring back a row a write just replaced.
+    """
+
+    def __init__(self, name, maxsize=CACHE_SIZE, ttl=CACHE_TTL, clock=time.monotonic):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._invalidations = 0
+        self._counters = dict.fromkeys(
+            ('hits', 'misses', 'evictions', 'expirations', 'stale', 'invalidations'), 0)
+
+    def get(self, key, version=None):
+        """The cached value for key, or MISSING.
+
+        An entry put() under another version is stale and dropped.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires, entry_version = entry
+                if entry_version != version:
+                    del self._entries[key]
+                    self._counters['stale'] += 1
+                elif self.clock() < expires:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return value
+                else:
+                    del self._entries[key]
+                    self._counters['expirations'] += 1
+            self._counters['misses'] += 1
+            return MISSING
+
+    def token(self):
+        """Mark the start of a read whose result may be put() afterwards."""
+        with self._lock:
+            return self._invalidations
+
+    def put(self, key, value, token, version=None):
+        """Cache value, read at version, unless something was invalidated since token()."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if token != self._invalidations:
+                return
+            self._entries[key] = (value, self.clock() + self.ttl, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def invalidate(self, *keys):
+        """Drop the entries for keys."""
+        with self._lock:
+            self._invalidations += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self._counters['invalidations'] += 1
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._invalidations += 1
+            self._entries.clear()
+
+    def stats(self):
+        """Hit, miss, eviction, expiration, stale and invalidation counters, and the size."""
+        with self._lock:
+            requests = self._counters['hits'] + self._counters['misses']
+            return dict(self._counters, size=len(self._entries), maxsize=self.maxsize,
+                        ttl=self.ttl,
+                        hit_rate=round(self._counters['hits'] / requests, 4) if requests else None)
@@ -0,0 +1,401 @@
+"""
+Versioned schema migrations for the Grade Evaluation System database.
+
+The schema version is stored in PRAGMA user_version. Each migration runs in
+its own transaction together with the version bump, so an interrupted
+upgrade resumes at the first step that did not commit. Steps only use
+IF NOT EXISTS and backfills, so databases created by older versions of
+init_db (which never set user_version) are upgraded in place.
+"""
+
+import time
+from ..utils.logger import logger
+from .change_tracking import TRACKED_TABLES
+
+# Summary tables and their keys, most specific last
+SUMMARY_TABLES = (
+    ('student_summary', ('student_id',)),
+    ('student_term_summary', ('student_id', 'year_level', 'semester')),
+)
+
+# Grade statuses by stored code (grades.status_code)
+GRADE_STATUSES = ('Passed', 'Failed')
+STATUS_PASSED = GRADE_STATUSES.index('Passed')
+STATUS_FAILED = GRADE_STATUSES.index('Failed')
+
+def status_name_sql(column):
+    """SQL decoding a status_code column to its name."""
+    cases = ' '.join(f"WHEN {code} THEN '{name}'" for code, name in enumerate(GRADE_STATUSES))
+    return f"CASE {column} {cases} END"
+
+def status_code_sql(column):
+    """SQL encoding a status name column to its code (NULL if unknown)."""
+    cases = ' '.join(f"WHEN '{name}' THEN {code}" for code, name in enumerate(GRADE_STATUSES))
+    return f"CASE {column} {cases} END"
+
+# How the summary SQL reads rating and status from a grade row, with
+# {row} standing for "new.", "old." or nothing. Migration 5 ran against the
+# original TEXT columns; migration 6 replaced them with typed ones.
+LEGACY_GRADE_TERMS = {
+    'hundredths': "CAST(ROUND(CAST({row}rating AS REAL) * 100) AS INTEGER)",
+    'passed': "{row}status = 'Passed'",
+    'failed': "{row}status = 'Failed'",
+}
+GRADE_TERMS = {
+    'hundredths': "{row}rating_hundredths",
+    'passed': f"{{row}}status_code = {STATUS_PASSED}",
+    'failed': f"{{row}}status_code = {STATUS_FAILED}",
+}
+
+def _terms(terms, row):
+    return {name: sql.format(row=row) for name, sql in terms.items()}
+
+def summary_delta_sql(row, sign, terms=GRADE_TERMS):
+    """SQL adding (sign '+') or removing (sign '-') one grade row in every summary table."""
+    grade = _terms(terms, f"{row}.")
+    units = f"COALESCE({row}.units, 0)"
+    weighted = f"COALESCE({grade['hundredths']}, 0) * {units}"
+    statements = []
+    for table, key in SUMMARY_TABLES:
+        values = {
+            'grade_count': '1',
+            'units_total': units,
+            'weighted_hundredths': weighted,
+            'units_earned': f"CASE WHEN {grade['passed']} THEN {units} ELSE 0 END",
+            'failed_units': f"CASE WHEN {grade['failed']} THEN {units} ELSE 0 END",
+        }
+        columns = list(key) + list(values) + ['updated_at']
+        inserted = ([f"COALESCE({row}.{column}, '')" for column in key]
+                    + [value if sign == '+' else f"-({value})" for value in values.values()]
+                    + ["datetime('now')"])
+        updates = [f"{column} = {column} + excluded.{column}" for column in values]
+        statements.append(f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            VALUES ({', '.join(inserted)})
+            ON CONFLICT ({', '.join(key)}) DO UPDATE SET
+                {', '.join(updates)}, updated_at = excluded.updated_at;""")
+        if sign == '-':
+            conditions = ' AND '.join(f"{column} = COALESCE({row}.{column}, '')" for column in key)
+            statements.append(f"""
+            DELETE FROM {table} WHERE {conditions} AND grade_count = 0;""")
+    return ''.join(statements)
+
+def summary_trigger_bodies(terms=GRADE_TERMS):
+    """Trigger bodies keeping the summary tables in step with grades."""
+    return {
+        'INSERT': summary_delta_sql('new', '+', terms),
+        'DELETE': summary_delta_sql('old', '-', terms),
+        'UPDATE': summary_delta_sql('old', '-', terms) + summary_delta_sql('new', '+', terms),
+    }
+
+def summary_backfill_sql(table, key, terms=GRADE_TERMS):
+    """SQL filling one summary table from the grades table."""
+    grade = _terms(terms, "")
+    return f"""
+        INSERT INTO {table} ({', '.join(key)}, grade_count, units_total,
+                             weighted_hundredths, units_earned, failed_units, updated_at)
+        SELECT {', '.join(f"COALESCE({column}, '')" for column in key)},
+               COUNT(*),
+               SUM(COALESCE(units, 0)),
+               SUM(COALESCE({grade['hundredths']}, 0) * COALESCE(units, 0)),
+               SUM(CASE WHEN {grade['passed']} THEN COALESCE(units, 0) ELSE 0 END),
+               SUM(CASE WHEN {grade['failed']} THEN COALESCE(units, 0) ELSE 0 END),
+               datetime('now')
+        FROM grades
+        GROUP BY {', '.join(key)}
+    """
+
+def create_base_tables(cursor):
+    """Students, registrars and grades as created by the original init_db."""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS students (
+        student_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        mobile_number TEXT,
+        email_address TEXT,
+        password TEXT NOT NULL,
+        year_level TEXT DEFAULT '1',
+        semester TEXT DEFAULT '1',
+        college TEXT DEFAULT 'EECP',
+        program TEXT DEFAULT 'BSIT',
+        school_year TEXT DEFAULT '2024-2025',
+        enrollment_status TEXT DEFAULT 'Enrolled'
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS registrars (
+        registrar_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        password TEXT NOT NULL
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS grades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id TEXT,
+        subject TEXT,
+        units INTEGER,
+        rating TEXT,
+        final_grade REAL,
+        status TEXT,
+        year_level TEXT,
+        semester TEXT,
+        FOREIGN KEY (student_id) REFERENCES students(student_id)
+    )
+    """)
+
+def _remove_duplicate_grades(cursor):
+    """Keep only the most recent grade per student, subject and term."""
+    cursor.execute("""
+        DELETE FROM grades
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM grades
+            GROUP BY student_id, year_level, semester, subject
+        )
+    """)
+    if cursor.rowcount:
+        logger.warning("Removed %s duplicate grades", cursor.rowcount)
+
+def add_grade_indexes(cursor):
+    """Enforce one grade per student, subject and term, and cover per-student reads."""
+    # Older databases may hold duplicates
+    _remove_duplicate_grades(cursor)
+
+    # Column order matches the ORDER BY of fetch_student_grades so
+    # per-student reads need no sort.
+    cursor.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_grades_natural_key
+    ON grades (student_id, year_level, semester, subject)
+    """)
+
+    # Covering index so fetch_student_grades never touches the table rows
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_grades_student_cover
+    ON grades (student_id, year_level, semester, subject,
+               units, rating, final_grade, status)
+    """)
+
+def add_student_search(cursor):
+    """Full-text index over the searchable student columns."""
+    # It stores no copy of the data (content='students') and is kept in
+    # sync by triggers.
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+        student_id, name, email_address, mobile_number,
+        college, program, enrollment_status,
+        content='students', content_rowid='rowid', prefix='1 2 3'
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS students_fts_insert AFTER INSERT ON students BEGIN
+        INSERT INTO students_fts (rowid, student_id, name, email_address, mobile_number,
+                                  college, program, enrollment_status)
+        VALUES (new.rowid, new.student_id, new.name, new.email_address, new.mobile_number,
+                new.college, new.program, new.enrollment_status);
+    END
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS students_fts_delete AFTER DELETE ON students BEGIN
+        INSERT INTO students_fts (students_fts, rowid, student_id, name, email_address,
+                                  mobile_number, college, program, enrollment_status)
+        VALUES ('delete', old.rowid, old.student_id, old.name, old.email_address,
+                old.mobile_number, old.college, old.program, old.enrollment_status);
+    END
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS students_fts_update AFTER UPDATE ON students BEGIN
+        INSERT INTO students_fts (students_fts, rowid, student_id, name, email_address,
+                                  mobile_number, college, program, enrollment_status)
+        VALUES ('delete', old.rowid, old.student_id, old.name, old.email_address,
+                old.mobile_number, old.college, old.program, old.enrollment_status);
+        INSERT INTO students_fts (rowid, student_id, name, email_address, mobile_number,
+                                  college, program, enrollment_status)
+        VALUES (new.rowid, new.student_id, new.name, new.email_address, new.mobile_number,
+                new.college, new.program, new.enrollment_status);
+    END
+    """)
+
+    # Index the students that existed before the triggers did
+    cursor.execute("INSERT INTO students_fts (students_fts) VALUES ('rebuild')")
+
+def add_change_counters(cursor):
+    """Per-table write counters read by change_tracking to skip no-op refreshes."""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS change_counters (
+        table_name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    for table in TRACKED_TABLES:
+        cursor.execute("INSERT OR IGNORE INTO change_counters (table_name) VALUES (?)", (table,))
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_changed_{event.lower()}
+            AFTER {event} ON {table} BEGIN
+                UPDATE change_counters SET version = version + 1 WHERE table_name = '{table}';
+            END
+            """)
+
+def add_student_summaries(cursor):
+    """GWA and units per student, overall and per term, kept current by triggers."""
+    # Weighted ratings are summed in hundredths so repeated updates never
+    # accumulate rounding error.
+    for table, key in SUMMARY_TABLES:
+        cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            {' TEXT NOT NULL, '.join(key)} TEXT NOT NULL,
+            grade_count INTEGER NOT NULL DEFAULT 0,
+            units_total INTEGER NOT NULL DEFAULT 0,
+            weighted_hundredths INTEGER NOT NULL DEFAULT 0,
+            units_earned INTEGER NOT NULL DEFAULT 0,
+            failed_units INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT,
+            gwa REAL GENERATED ALWAYS AS (
+                CASE WHEN units_total > 0
+                     THEN weighted_hundredths / 100.0 / units_total END
+            ) VIRTUAL,
+            PRIMARY KEY ({', '.join(key)})
+        )
+        """)
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(summary_backfill_sql(table, key, LEGACY_GRADE_TERMS))
+
+    # Sorted GWA index for rankings over the whole student body
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_student_summary_gwa ON student_summary (gwa)")
+    _create_summary_triggers(cursor, LEGACY_GRADE_TERMS)
+
+def _create_summary_triggers(cursor, terms):
+    for event, sql in summary_trigger_bodies(terms).items():
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS grades_summary_{event.lower()} AFTER {event} ON grades BEGIN
+            {sql}
+        END
+        """)
+
+def _rating_hundredths_sql(column):
+    """SQL converting a legacy TEXT/REAL rating to hundredths (NULL if not a rating)."""
+    return f"""CASE WHEN CAST({column} AS REAL) BETWEEN 1 AND 5
+                    THEN CAST(ROUND(CAST({column} AS REAL) * 100) AS INTEGER) END"""
+
+def _small_int_sql(column):
+    """SQL converting a legacy TEXT year level or semester to an integer."""
+    return f"CASE WHEN CAST({column} AS INTEGER) > 0 THEN CAST({column} AS INTEGER) END"
+
+def compact_grades(cursor):
+    """Store grades in typed columns: integer hundredths, integer terms, coded status."""
+    # SQLite cannot change column types in place, so the table is rebuilt.
+    cursor.execute("""
+    CREATE TABLE grades_typed (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id TEXT,
+        subject TEXT,
+        units INTEGER,
+        rating_hundredths INTEGER CHECK (rating_hundredths BETWEEN 100 AND 500),
+        final_hundredths INTEGER CHECK (final_hundredths BETWEEN 100 AND 500),
+        status_code INTEGER CHECK (status_code IN (0, 1)),
+        year_level INTEGER,
+        semester INTEGER,
+        FOREIGN KEY (student_id) REFERENCES students(student_id)
+    )
+    """)
+    cursor.execute(f"""
+        INSERT INTO grades_typed (id, student_id, subject, units, rating_hundredths,
+                                  final_hundredths, status_code, year_level, semester)
+        SELECT id, student_id, subject, CAST(units AS INTEGER),
+               {_rating_hundredths_sql('rating')}, {_rating_hundredths_sql('final_grade')},
+               {status_code_sql('status')},
+               {_small_int_sql('year_level')}, {_small_int_sql('semester')}
+        FROM grades
+    """)
+    # Dropping the table drops its sqlite_sequence entry; carry it over so
+    # ids are never handed out twice.
+    sequence = cursor.execute(
+        "SELECT seq FROM sqlite_sequence WHERE name = 'grades'").fetchone()
+    cursor.execute("DROP TABLE grades")
+    cursor.execute("ALTER TABLE grades_typed RENAME TO grades")
+    if sequence:
+        cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'grades'",
+                       sequence)
+        if not cursor.rowcount:
+            cursor.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('grades', ?)",
+                           sequence)
+
+    # Terms that only differed in formatting ('1' and '01') are now equal
+    _remove_duplicate_grades(cursor)
+    cursor.execute("""
+    CREATE UNIQUE INDEX idx_grades_natural_key
+    ON grades (student_id, year_level, semester, subject)
+    """)
+    cursor.execute("""
+    CREATE INDEX idx_grades_student_cover
+    ON grades (student_id, year_level, semester, subject,
+               units, rating_hundredths, final_hundredths, status_code)
+    """)
+
+    # The triggers went with the old table
+    add_change_counters(cursor)
+    _create_summary_triggers(cursor, GRADE_TERMS)
+
+    # The summaries still count the removed duplicates and the old term keys
+    for table, key in SUMMARY_TABLES:
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(summary_backfill_sql(table, key))
+
+# (version, description, step) in the order they are applied. Never edit or
+# reorder a released step; append a new one instead.
+MIGRATIONS = (
+    (1, "Create base tables", create_base_tables),
+    (2, "Add grade natural key and covering indexes", add_grade_indexes),
+    (3, "Add student full-text search", add_student_search),
+    (4, "Add change counters", add_change_counters),
+    (5, "Add student GWA summaries", add_student_summaries),
+    (6, "Store grades in compact typed columns", compact_grades),
+)
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def current_version(conn):
+    """The schema version recorded in the database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn, migrations=MIGRATIONS):
+    """Apply the migrations newer than the database's version, in order.
+
+    Each step commits together with its version bump. Returns the versions
+    that were applied.
+    """
+    version = current_version(conn)
+    pending = [migration for migration in migrations if migration[0] > version]
+    if not pending:
+        logger.debug("Database schema is up to date (version %s)", version)
+        return []
+
+    logger.info("Migrating database schema from version %s to %s (%s steps)",
+                version, pending[-1][0], len(pending))
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # transactions are managed explicitly below
+    applied = []
+    try:
+        for step_version, description, step in pending:
+            started = time.perf_counter()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                step(conn.cursor())
+                conn.execute(f"PRAGMA user_version = {int(step_version)}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                logger.error("Migration %s (%s) failed; database left at version %s",
+                             step_version, description, current_version(conn))
+                raise
+            applied.append(step_version)
+            logger.info("Applied migration %s: %s in %.2fs",
+                        step_version, description, time.perf_counter() - started)
+    finally:
+        conn.isolation_level = isolation_level
+    return applied
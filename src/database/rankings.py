@@ -0,0 +1,156 @@
+"""
+Class ranking queries for the Grade Evaluation System.
+
+Rankings are window functions over the trigger-maintained student_summary
+table (lower GWA ranks higher). Results are cached until students or
+grades change, so repeat queries from the Rankings dialog are dictionary
+lookups.
+"""
+
+import sqlite3
+from ..utils.logger import logger
+from .change_tracking import cached_until_changed
+from .database_operations import get_db_connection
+
+HONORS_TOP_PERCENTS = (1, 5, 10, 25)
+
+def _cohort(program=None, year_level=None, school_year=None):
+    """FROM/WHERE clause and parameters selecting the ranked students."""
+    conditions = ["ss.gwa IS NOT NULL"]
+    params = []
+    for column, value in (('program', program), ('year_level', year_level),
+                          ('school_year', school_year)):
+        if value:
+            conditions.append(f"s.{column} = ?")
+            params.append(str(value))
+    return f"""
+        FROM student_summary ss
+        JOIN students s ON s.student_id = ss.student_id
+        WHERE {' AND '.join(conditions)}
+    """, params
+
+@cached_until_changed('students', 'grades')
+def top_students(limit=10, program=None, year_level=None, school_year=None):
+    """Get the best-ranked students of a cohort.
+
+    Returns (rank, student_id, name, program, year_level, school_year, gwa,
+    units_total) rows. Students tied at the last rank are all included, so
+    there may be more than limit rows.
+    """
+    cohort, params = _cohort(program, year_level, school_year)
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT rank, student_id, name, program, year_level, school_year, gwa, units_total
+            FROM (
+                SELECT RANK() OVER (ORDER BY ss.gwa) AS rank,
+                       s.student_id, s.name, s.program, s.year_level, s.school_year,
+                       ROUND(ss.gwa, 4) AS gwa, ss.units_total
+                {cohort}
+            )
+            WHERE rank <= ?
+            ORDER BY rank, student_id
+        """, params + [limit])
+        return cursor.fetchall()
+    except sqlite3.Error as e:
+        logger.error("Database error while ranking students: %s", e)
+        return []
+    finally:
+        if conn is not None:
+            conn.close()
+
+@cached_until_changed('students', 'grades')
+def student_percentile(student_id, program=None, year_level=None, school_year=None):
+    """Get a student's standing within a cohort.
+
+    Returns (rank, cohort_size, percentile), where percentile is 100 for the
+    best GWA and 0 for the worst, or None if the student is not ranked.
+    """
+    cohort, params = _cohort(program, year_level, school_year)
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT rank, cohort_size, ROUND(percentile, 2)
+            FROM (
+                SELECT s.student_id,
+                       RANK() OVER (ORDER BY ss.gwa) AS rank,
+                       COUNT(*) OVER () AS cohort_size,
+                       100.0 * (1 - PERCENT_RANK() OVER (ORDER BY ss.gwa)) AS percentile
+                {cohort}
+            )
+            WHERE student_id = ?
+        """, params + [str(student_id)])
+        return cursor.fetchone()
+    except sqlite3.Error as e:
+        logger.error("Database error while ranking student %s: %s", student_id, e)
+        return None
+    finally:
+        if conn is not None:
+            conn.close()
+
+@cached_until_changed('students', 'grades')
+def honors_cutoffs(top_percents=HONORS_TOP_PERCENTS, program=None, year_level=None,
+                   school_year=None):
+    """Get the GWA needed to be in the top N percent of a cohort.
+
+    Returns (top_percent, cutoff_gwa, students) rows, where students counts
+    everyone at or better than the cutoff, ties included. The cutoff is None
+    for an empty cohort.
+    """
+    cohort, params = _cohort(program, year_level, school_year)
+    # The cutoff is the GWA at the first position covering top_percent of
+    # the cohort; GWA never decreases with position, so that is the MIN.
+    cutoffs = ', '.join("MIN(CASE WHEN position * 100 >= total * ? THEN gwa END)"
+                        for _ in top_percents)
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            WITH ranked AS (
+                SELECT ss.gwa,
+                       ROW_NUMBER() OVER (ORDER BY ss.gwa) AS position,
+                       COUNT(*) OVER () AS total
+                {cohort}
+            )
+            SELECT {cutoffs} FROM ranked
+        """, params + list(top_percents))
+        values = cursor.fetchone()
+
+        results = []
+        for top_percent, cutoff in zip(top_percents, values):
+            students = 0
+            if cutoff is not None:
+                cursor.execute(f"SELECT COUNT(*) {cohort} AND ss.gwa <= ?", params + [cutoff])
+                students = cursor.fetchone()[0]
+            results.append((top_percent, None if cutoff is None else round(cutoff, 4), students))
+        return results
+    except sqlite3.Error as e:
+        logger.error("Database error while computing honors cut-offs: %s", e)
+        return []
+    finally:
+        if conn is not None:
+            conn.close()
+
+@cached_until_changed('students')
+def ranking_filter_values():
+    """Distinct programs and school years to offer as ranking filters."""
+    conn = None
+    try:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        return {
+            column: [row[0] for row in cursor.execute(
+                f"SELECT DISTINCT {column} FROM students WHERE {column} IS NOT NULL ORDER BY {column}")]
+            for column in ('program', 'school_year')
+        }
+    except sqlite3.Error as e:
+        logger.error("Database error while listing ranking filters: %s", e)
+        return {'program': [], 'school_year': []}
+    finally:
+        if conn is not None:
+            conn.close()
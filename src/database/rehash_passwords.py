@@ -0,0 +1,109 @@
+"""
+Hash the plaintext passwords left in an existing database.
+
+Usage:
+    python -m src.database.rehash_passwords [--workers 4] [--chunk-size 500] [--db path]
+
+A login already replaces its account's plaintext password, but accounts
+nobody logs into would keep theirs. This hashes all of them up front,
+spread over a process pool since each hash costs ~100 ms of CPU, and
+writes them back in chunked transactions. Hashes made at an older cost
+cannot be recomputed without the password; they are upgraded at the
+next login instead.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from ..utils.logger import logger
+from ..utils.passwords import hash_password, is_hashed
+from .connection_pool import configure_pool
+from .database_operations import get_db_connection
+from .init_database import init_db
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Tables holding passwords, with their key column
+ACCOUNT_TABLES = (('students', 'student_id'), ('registrars', 'registrar_id'))
+
+def plaintext_accounts(table, key_column):
+    """(account_id, password) of every account whose password is not hashed."""
+    conn = get_db_connection()
+    try:
+        return [(account_id, password) for account_id, password
+                in conn.execute(f"SELECT {key_column}, password FROM {table}")
+                if password is not None and not is_hashed(password)]
+    finally:
+        conn.close()
+
+def _write_chunk(table, key_column, rows):
+    """Store (hash, account_id, old password) rows; returns how many were written.
+
+    An account whose password changed since it was read is left alone.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.executemany(
+            f"UPDATE {table} SET password = ? WHERE {key_column} = ? AND password = ?", rows)
+        conn.commit()
+        return cursor.rowcount
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+def rehash_plaintext_passwords(workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Hash every plaintext password. Returns ({table: rehashed}, seconds)."""
+    started = time.perf_counter()
+    accounts = {table: plaintext_accounts(table, key_column)
+                for table, key_column in ACCOUNT_TABLES}
+    total = sum(len(rows) for rows in accounts.values())
+    counts = dict.fromkeys(accounts, 0)
+    if not total:
+        return counts, time.perf_counter() - started
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for table, key_column in ACCOUNT_TABLES:
+            rows = accounts[table]
+            # Results come back in order while later chunks are still hashing
+            hashes = pool.map(hash_password, [password for _, password in rows],
+                              chunksize=max(1, min(chunk_size, len(rows) // (workers * 4))))
+            pending = iter(zip(rows, hashes))
+            while True:
+                chunk = [(hashed, account_id, password)
+                         for (account_id, password), hashed in islice(pending, chunk_size)]
+                if not chunk:
+                    break
+                counts[table] += _write_chunk(table, key_column, chunk)
+                elapsed = time.perf_counter() - started
+                done = sum(counts.values())
+                logger.info("Hashed %s of %s passwords (%.0f/sec)",
+                            done, total, done / elapsed if elapsed else 0)
+    return counts, time.perf_counter() - started
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Hash the plaintext passwords in the database.")
+    parser.add_argument('--workers', type=int, help="Hashing processes (defaults to CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Passwords written per transaction")
+    parser.add_argument('--db', help="Database file (defaults to data/eecp_gesys.db)")
+    args = parser.parse_args(argv)
+
+    init_db(args.db)
+    configure_pool(args.db)
+
+    counts, seconds = rehash_plaintext_passwords(args.workers, args.chunk_size)
+    total = sum(counts.values())
+    print(f"Hashed {counts['students']} student and {counts['registrars']} registrar "
+          f"passwords in {seconds:.2f}s ({total / seconds if seconds else 0:.0f}/sec)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
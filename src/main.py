@@ -4,12 +4,19 @@ Main application for EECP GESYS.
 
 import tkinter as tk
 from tkinter import ttk
+from .repositories.authentication import Authenticator
+from .repositories.config import create_repositories
 from .ui.auth_screens import LoginScreen, RegistrarSignupScreen, StudentSignupScreen
 from .ui.dashboard_screens import StudentDashboard, RegistrarDashboardNew
 from .ui.ui_components import setup_styles, COLORS
 
 class App:
     def __init__(self):
+        # Storage comes from GESYS_DATABASE_URL; the SQLite backend creates
+        # or upgrades the schema before any screen queries it
+        self.repositories = create_repositories()
+        self.authenticator = Authenticator(self.repositories)
+
         self.root = tk.Tk()
         self.root.title("EECP GESYS")
         
@@ -66,11 +73,13 @@ class App:
         self.current_user = None
         self.user_type = None
         
-        # Remove dashboard frames
+        # Remove dashboard frames and stop their background work
         if "StudentDashboard" in self.frames:
+            self.frames["StudentDashboard"].shutdown()
             self.frames["StudentDashboard"].grid_forget()
             del self.frames["StudentDashboard"]
         if "RegistrarDashboard" in self.frames:
+            self.frames["RegistrarDashboard"].shutdown()
             self.frames["RegistrarDashboard"].grid_forget()
             del self.frames["RegistrarDashboard"]
         
@@ -84,7 +93,10 @@ class App:
     
     def run(self):
         """Start the application."""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.repositories.close()
 
 if __name__ == "__main__":
     app = App()
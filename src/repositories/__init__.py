@@ -0,0 +1,10 @@
+"""
+Storage-independent data access for the Grade Evaluation System.
+"""
+
+from . import base
+from . import config
+from . import sqlite
+from . import memory
+from . import remote
+from . import authentication
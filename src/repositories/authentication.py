@@ -0,0 +1,183 @@
+"""
+Login checks with throttling for the Grade Evaluation System.
+
+Authenticator.authenticate() is the one path the login screens and the
+grade service check credentials through. Before anything reaches the
+database it takes a token from two buckets, one for the account and one
+for the source (the workstation, or the client address on the service),
+so once a burst of guesses has emptied either bucket the rest are turned
+away in microseconds. IDs found not to exist are remembered until their
+table changes, so repeated guesses at them skip the query; they are still
+checked against a dummy hash, so an unknown ID takes as long to reject as
+a wrong password.
+
+    GESYS_LOGIN_ACCOUNT_ATTEMPTS / _WINDOW   attempts per account per window (5 / 300 s)
+    GESYS_LOGIN_SOURCE_ATTEMPTS / _WINDOW    attempts per source per window (30 / 60 s)
+    GESYS_LOGIN_UNKNOWN_TTL                  how long an unknown ID is remembered (300 s)
+
+Setting an ATTEMPTS variable to 0 turns that limit off.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from ..database.change_tracking import get_change_tracker
+from ..database.database_operations import LOGIN_OK, LOGIN_UNKNOWN_ACCOUNT
+from ..database.lookup_cache import MISSING, LookupCache
+from ..utils.logger import logger
+from ..utils.metrics import LatencyMetrics
+from ..utils.passwords import dummy_verify
+
+# Result of authenticate() besides the LOGIN_* results of check_student_login
+LOGIN_THROTTLED = 'throttled'
+
+ACCOUNT_ATTEMPTS = int(os.environ.get('GESYS_LOGIN_ACCOUNT_ATTEMPTS', 5))
+ACCOUNT_WINDOW = float(os.environ.get('GESYS_LOGIN_ACCOUNT_WINDOW', 300))
+SOURCE_ATTEMPTS = int(os.environ.get('GESYS_LOGIN_SOURCE_ATTEMPTS', 30))
+SOURCE_WINDOW = float(os.environ.get('GESYS_LOGIN_SOURCE_WINDOW', 60))
+UNKNOWN_ACCOUNT_TTL = float(os.environ.get('GESYS_LOGIN_UNKNOWN_TTL', 300))
+
+MAX_TRACKED = 10000  # buckets and unknown IDs kept in memory
+LOCAL_SOURCE = 'local'
+
+class TokenBuckets:
+    """A token bucket per key, refilled continuously.
+
+    A bucket holds up to capacity tokens and regains capacity of them per
+    window seconds: capacity attempts go through in a burst, then one every
+    window / capacity seconds. Untouched buckets are the first dropped once
+    more than maxsize keys are tracked; a dropped bucket starts full again.
+    """
+
+    def __init__(self, capacity, window, maxsize=MAX_TRACKED, clock=time.monotonic):
+        self.capacity = capacity
+        self.window = window
+        self.rate = capacity / window if window > 0 else float('inf')
+        self.maxsize = maxsize
+        self.clock = clock
+        self._buckets = OrderedDict()  # key -> (tokens, time they were counted)
+        self._lock = threading.Lock()
+        self._throttled = 0
+
+    def _tokens(self, key, now):
+        tokens, counted = self._buckets.get(key, (self.capacity, now))
+        return min(self.capacity, tokens + (now - counted) * self.rate)
+
+    def take(self, key):
+        """Take a token for key; returns 0, or the seconds until one is available."""
+        if self.capacity <= 0:
+            return 0
+        with self._lock:
+            now = self.clock()
+            tokens = self._tokens(key, now)
+            if tokens < 1:
+                self._throttled += 1
+                return (1 - tokens) / self.rate
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return 0
+
+    def give_back(self, key):
+        """Return a token taken for key."""
+        with self._lock:
+            if key in self._buckets:
+                now = self.clock()
+                self._buckets[key] = (min(self.capacity, self._tokens(key, now) + 1), now)
+
+    def reset(self, key):
+        """Refill key's bucket."""
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def stats(self):
+        """Capacity, window, tracked keys and how many attempts were throttled."""
+        with self._lock:
+            return {'capacity': self.capacity, 'window': self.window,
+                    'tracked': len(self._buckets), 'throttled': self._throttled}
+
+class Authenticator:
+    """Throttled, negatively cached logins over a Repositories.
+
+    Thread-safe: the screens call it from their BackgroundTasks worker and
+    the grade service from its read pool.
+    """
+
+    def __init__(self, repositories, account_attempts=ACCOUNT_ATTEMPTS,
+                 account_window=ACCOUNT_WINDOW, source_attempts=SOURCE_ATTEMPTS,
+                 source_window=SOURCE_WINDOW, unknown_ttl=UNKNOWN_ACCOUNT_TTL,
+                 clock=time.monotonic):
+        self.repositories = repositories
+        self.accounts = TokenBuckets(account_attempts, account_window, clock=clock)
+        self.sources = TokenBuckets(source_attempts, source_window, clock=clock)
+        self.unknown_accounts = LookupCache('unknown_accounts', maxsize=MAX_TRACKED,
+                                            ttl=unknown_ttl, clock=clock)
+        self.metrics = LatencyMetrics()
+
+    def _accounts_of(self, user_type):
+        """The repository and table holding a user type's accounts."""
+        if user_type == 'student':
+            return self.repositories.students, 'students'
+        if user_type == 'registrar':
+            return self.repositories.registrars, 'registrars'
+        raise ValueError(f"Unknown user type: {user_type}")
+
+    def _table_version(self, table):
+        """The table's change counter, or None if it cannot be read."""
+        tracker = self.repositories.change_tracker or get_change_tracker()
+        versions = tracker.versions(table)
+        return versions[0] if versions else None
+
+    def authenticate(self, user_type, account_id, password, source=LOCAL_SOURCE):
+        """Check a student or registrar login.
+
+        Returns (result, retry_after): result is LOGIN_OK,
+        LOGIN_WRONG_PASSWORD, LOGIN_UNKNOWN_ACCOUNT or LOGIN_THROTTLED, and
+        retry_after the seconds until a throttled attempt may be repeated
+        (0 when not throttled, or when a remote service did the throttling).
+        Raises ValueError for an unknown user_type.
+        """
+        started = time.perf_counter()
+        repository, table = self._accounts_of(user_type)
+        account = (user_type, str(account_id))
+
+        retry_after = self.sources.take(source) or self.accounts.take(account)
+        if retry_after:
+            result = LOGIN_THROTTLED
+            # Counted in stats(); a flood would otherwise flood the log too
+            logger.debug("Throttled login for %s %s from %s (retry in %.0fs)",
+                         user_type, account_id, source, retry_after)
+        else:
+            result = self._check(repository, table, account, password)
+            if result == LOGIN_OK:
+                # Failed attempts before a successful one no longer count
+                self.accounts.reset(account)
+                self.sources.give_back(source)
+        self.metrics.record(result, time.perf_counter() - started)
+        return result, retry_after
+
+    def _check(self, repository, table, account, password):
+        version = self._table_version(table)
+        cached = self.unknown_accounts.get(account)
+        if cached is not MISSING:
+            if version is not None and cached == version:
+                # Still hashed so an unknown ID takes as long as a wrong
+                # password; the buckets above bound how often this runs.
+                dummy_verify(password)
+                return LOGIN_UNKNOWN_ACCOUNT
+            # The table changed since; the account may exist now
+            self.unknown_accounts.invalidate(account)
+        token = self.unknown_accounts.token()
+        result = repository.check_password(account[1], password)
+        if result == LOGIN_UNKNOWN_ACCOUNT and version is not None:
+            self.unknown_accounts.put(account, version, token)
+        return result
+
+    def stats(self):
+        """Latency per result, throttle counters and the unknown ID cache."""
+        return {'results': self.metrics.snapshot(),
+                'accounts': self.accounts.stats(),
+                'sources': self.sources.stats(),
+                'unknown_accounts': self.unknown_accounts.stats()}
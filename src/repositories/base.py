@@ -0,0 +1,144 @@
+"""
+Repository interfaces for the Grade Evaluation System.
+
+The screens and tests talk to these interfaces instead of a particular
+database. Every implementation keeps the return values of the matching
+database_operations function (noted on each method), including its
+failure values: False, [] or None rather than exceptions.
+"""
+
+from abc import ABC, abstractmethod
+from ..database.database_operations import SEARCH_RESULT_LIMIT, STUDENT_PAGE_SIZE
+from ..database.rankings import HONORS_TOP_PERCENTS
+
+class StudentRepository(ABC):
+    """Student records, their GWA summaries and student logins."""
+
+    @abstractmethod
+    def all(self):
+        """Every student row, with the display GWA last (fetch_student_data)."""
+
+    @abstractmethod
+    def page(self, after_id=None, page_size=STUDENT_PAGE_SIZE, program=None,
+             year_level=None, enrollment_status=None, offset=0):
+        """One page of students ordered by ID (fetch_student_page)."""
+
+    @abstractmethod
+    def count(self, program=None, year_level=None, enrollment_status=None):
+        """Number of students matching the filters (count_students)."""
+
+    @abstractmethod
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        """Students where every query word starts a word of a field (search_students)."""
+
+    @abstractmethod
+    def get(self, student_id):
+        """A student's details, or None (get_student_info)."""
+
+    @abstractmethod
+    def summary(self, student_id):
+        """(gwa, units_total, units_earned, failed_units, updated_at) or None
+        (get_student_summary)."""
+
+    @abstractmethod
+    def term_summaries(self, student_id):
+        """GWA and units per year level and semester (fetch_term_summaries)."""
+
+    @abstractmethod
+    def add(self, student_number, name, mobile_number, email_address, password,
+            year_level='1', semester='1', college='', program='', school_year='',
+            enrollment_status='Enrolled'):
+        """Insert a student; True on success (insert_user_data_st)."""
+
+    @abstractmethod
+    def update(self, student_id, name, mobile_number, email_address, year_level=None,
+               semester=None, college=None, program=None, school_year=None,
+               enrollment_status=None):
+        """Update a student's details; True on success (update_student_data)."""
+
+    @abstractmethod
+    def delete(self, student_id):
+        """Delete a student and their grades; True on success (delete_student)."""
+
+    @abstractmethod
+    def verify_password(self, student_id, password):
+        """Whether the credentials are valid (fetch_user_credentials)."""
+
+    @abstractmethod
+    def check_password(self, student_id, password):
+        """LOGIN_OK, LOGIN_WRONG_PASSWORD or LOGIN_UNKNOWN_ACCOUNT (check_student_login)."""
+
+class GradeRepository(ABC):
+    """Grades and the rankings and statistics derived from them."""
+
+    @abstractmethod
+    def for_student(self, student_id):
+        """A student's grades in term order (fetch_student_grades)."""
+
+    @abstractmethod
+    def upsert(self, student_id, subject, units, rating, final_grade, status,
+               year_level, semester):
+        """Insert or update a grade; GRADE_INSERTED, GRADE_UPDATED or False
+        (update_grade)."""
+
+    @abstractmethod
+    def upsert_many(self, grades):
+        """Insert or update grades in one transaction, one result each (update_grades)."""
+
+    @abstractmethod
+    def delete(self, student_id, subject, year_level, semester):
+        """Delete a grade; True on success (delete_grade)."""
+
+    @abstractmethod
+    def top_students(self, limit=10, program=None, year_level=None, school_year=None):
+        """Best-ranked students of a cohort, ties included (rankings.top_students)."""
+
+    @abstractmethod
+    def student_percentile(self, student_id, program=None, year_level=None,
+                           school_year=None):
+        """(rank, cohort_size, percentile) or None (rankings.student_percentile)."""
+
+    @abstractmethod
+    def honors_cutoffs(self, top_percents=HONORS_TOP_PERCENTS, program=None,
+                       year_level=None, school_year=None):
+        """(top_percent, cutoff_gwa, students) rows (rankings.honors_cutoffs)."""
+
+    @abstractmethod
+    def ranking_filter_values(self):
+        """Programs and school years to filter rankings by (rankings.ranking_filter_values)."""
+
+    @abstractmethod
+    def subject_statistics(self, subject=None, year_level=None, semester=None):
+        """Rating distribution per subject and term (grade_statistics.subject_statistics)."""
+
+class RegistrarRepository(ABC):
+    """Registrar accounts."""
+
+    @abstractmethod
+    def add(self, registrar_id, name, password):
+        """Insert a registrar; True on success (insert_user_dataR)."""
+
+    @abstractmethod
+    def verify_password(self, registrar_id, password):
+        """Whether the credentials are valid (fetch_user_credentials2)."""
+
+    @abstractmethod
+    def check_password(self, registrar_id, password):
+        """LOGIN_OK, LOGIN_WRONG_PASSWORD or LOGIN_UNKNOWN_ACCOUNT (check_registrar_login)."""
+
+class Repositories:
+    """The repositories of one storage backend.
+
+    change_tracker is passed to RefreshGate; None means the local database's
+    tracker.
+    """
+
+    def __init__(self, students, grades, registrars, change_tracker=None, dsn=None):
+        self.students = students
+        self.grades = grades
+        self.registrars = registrars
+        self.change_tracker = change_tracker
+        self.dsn = dsn
+
+    def close(self):
+        """Release the backend's connections."""
@@ -0,0 +1,37 @@
+"""
+Choosing the repository backend from a DSN.
+
+    sqlite:///path/to/file.db   the local SQLite database (default)
+    memory://                   an empty in-memory SQLite database
+    http://host:port            a grade service (see src.service.server)
+
+The DSN comes from GESYS_DATABASE_URL, or GESYS_SERVICE_URL for
+deployments configured before repositories existed. The service token is
+read from GESYS_SERVICE_TOKEN.
+"""
+
+import os
+from urllib.parse import unquote, urlsplit
+from ..database.connection_pool import DEFAULT_DB_PATH
+
+def configured_dsn():
+    """The DSN the environment selects, or the default database file."""
+    return (os.environ.get('GESYS_DATABASE_URL') or os.environ.get('GESYS_SERVICE_URL')
+            or f"sqlite:///{DEFAULT_DB_PATH}")
+
+def create_repositories(dsn=None):
+    """Open the Repositories a DSN names; raises ValueError for an unknown scheme."""
+    dsn = dsn or configured_dsn()
+    scheme = urlsplit(dsn).scheme
+    if scheme == 'sqlite':
+        from .sqlite import SQLiteRepositories
+        # sqlite:///relative.db and sqlite:////absolute.db, as SQLAlchemy spells them
+        path = unquote(dsn[len('sqlite:///'):]) if dsn.startswith('sqlite:///') else ''
+        return SQLiteRepositories(path or DEFAULT_DB_PATH)
+    if scheme == 'memory':
+        from .memory import MemoryRepositories
+        return MemoryRepositories()
+    if scheme == 'http':
+        from .remote import RemoteRepositories
+        return RemoteRepositories(dsn, token=os.environ.get('GESYS_SERVICE_TOKEN'))
+    raise ValueError(f"Unsupported database URL: {dsn}")
@@ -0,0 +1,41 @@
+"""
+In-memory repositories for tests and benchmarks.
+
+A throwaway in-memory SQLite database behind the ordinary SQLite
+repositories, so every query, ranking and rounding rule is the SQLite
+backend's own. Nothing is persisted: the database disappears when the
+repositories are closed.
+"""
+
+import sqlite3
+import uuid
+from ..database.connection_pool import connect
+from ..database.init_database import init_db
+from .sqlite import SQLiteRepositories
+
+def memory_database_uri():
+    """A URI naming a new in-memory database that every pooled connection shares."""
+    name = f"gesys-{uuid.uuid4().hex}"
+    if sqlite3.sqlite_version_info >= (3, 36):
+        # memdb databases use ordinary locking, so busy_timeout applies
+        return f"file:/{name}?vfs=memdb"
+    return f"file:{name}?mode=memory&cache=shared"
+
+class MemoryRepositories(SQLiteRepositories):
+    """SQLite repositories over a fresh, empty in-memory database.
+
+    Like any SQLiteRepositories, opening one repoints the process-wide
+    connection pool at it.
+    """
+
+    def __init__(self):
+        uri = memory_database_uri()
+        # The database only lives while a connection to it is open
+        self._keeper = connect(uri)
+        init_db(uri, seed=False)
+        super().__init__(uri, migrate=False)
+        self.dsn = 'memory://'
+
+    def close(self):
+        super().close()
+        self._keeper.close()
@@ -0,0 +1,131 @@
+"""
+Repositories backed by a running grade service (see src.service.server).
+
+Each method is one service call. Results are those of the SQLite backend
+on the service's machine; an unreachable service raises ServiceError.
+"""
+
+from ..database.database_operations import SEARCH_RESULT_LIMIT, STUDENT_PAGE_SIZE
+from ..database.rankings import HONORS_TOP_PERCENTS
+from ..service.client import ServiceClient
+from .base import GradeRepository, RegistrarRepository, Repositories, StudentRepository
+
+class RemoteStudentRepository(StudentRepository):
+
+    def __init__(self, client):
+        self.client = client
+
+    def all(self):
+        return self.client.call('fetch_student_data')
+
+    def page(self, after_id=None, page_size=STUDENT_PAGE_SIZE, program=None,
+             year_level=None, enrollment_status=None, offset=0):
+        return self.client.call('fetch_student_page', after_id, page_size, program,
+                                year_level, enrollment_status, offset)
+
+    def count(self, program=None, year_level=None, enrollment_status=None):
+        return self.client.call('count_students', program, year_level, enrollment_status)
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        return self.client.call('search_students', query, limit)
+
+    def get(self, student_id):
+        return self.client.call('get_student_info', student_id)
+
+    def summary(self, student_id):
+        return self.client.call('get_student_summary', student_id)
+
+    def term_summaries(self, student_id):
+        return self.client.call('fetch_term_summaries', student_id)
+
+    def add(self, student_number, name, mobile_number, email_address, password,
+            year_level='1', semester='1', college='', program='', school_year='',
+            enrollment_status='Enrolled'):
+        return self.client.call('insert_user_data_st', student_number, name, mobile_number,
+                                email_address, password, year_level, semester, college,
+                                program, school_year, enrollment_status)
+
+    def update(self, student_id, name, mobile_number, email_address, year_level=None,
+               semester=None, college=None, program=None, school_year=None,
+               enrollment_status=None):
+        return self.client.call('update_student_data', student_id, name, mobile_number,
+                                email_address, year_level, semester, college, program,
+                                school_year, enrollment_status)
+
+    def delete(self, student_id):
+        return self.client.call('delete_student', student_id)
+
+    def verify_password(self, student_id, password):
+        return self.client.call('fetch_user_credentials', student_id, password)
+
+    def check_password(self, student_id, password):
+        return self.client.call('check_student_login', student_id, password)
+
+class RemoteGradeRepository(GradeRepository):
+
+    def __init__(self, client):
+        self.client = client
+
+    def for_student(self, student_id):
+        return self.client.call('fetch_student_grades', student_id)
+
+    def upsert(self, student_id, subject, units, rating, final_grade, status,
+               year_level, semester):
+        return self.client.call('update_grade', student_id, subject, units, rating,
+                                final_grade, status, year_level, semester)
+
+    def upsert_many(self, grades):
+        return self.client.call('update_grades', list(grades))
+
+    def delete(self, student_id, subject, year_level, semester):
+        return self.client.call('delete_grade', student_id, subject, year_level, semester)
+
+    def top_students(self, limit=10, program=None, year_level=None, school_year=None):
+        return self.client.call('top_students', limit, program, year_level, school_year)
+
+    def student_percentile(self, student_id, program=None, year_level=None,
+                           school_year=None):
+        return self.client.call('student_percentile', student_id, program, year_level,
+                                school_year)
+
+    def honors_cutoffs(self, top_percents=HONORS_TOP_PERCENTS, program=None,
+                       year_level=None, school_year=None):
+        return self.client.call('honors_cutoffs', list(top_percents), program, year_level,
+                                school_year)
+
+    def ranking_filter_values(self):
+        return self.client.call('ranking_filter_values')
+
+    def subject_statistics(self, subject=None, year_level=None, semester=None):
+        return self.client.call('subject_statistics', subject, year_level, semester)
+
+class RemoteRegistrarRepository(RegistrarRepository):
+
+    def __init__(self, client):
+        self.client = client
+
+    def add(self, registrar_id, name, password):
+        return self.client.call('insert_user_dataR', registrar_id, name, password)
+
+    def verify_password(self, registrar_id, password):
+        return self.client.call('fetch_user_credentials2', registrar_id, password)
+
+    def check_password(self, registrar_id, password):
+        return self.client.call('check_registrar_login', registrar_id, password)
+
+class RemoteRepositories(Repositories):
+    """Repositories over the grade service at url.
+
+    The client doubles as the change tracker, so RefreshGate reads the
+    service's change counters.
+    """
+
+    def __init__(self, url, token=None):
+        self.client = ServiceClient(url, token=token)
+        super().__init__(RemoteStudentRepository(self.client),
+                         RemoteGradeRepository(self.client),
+                         RemoteRegistrarRepository(self.client),
+                         change_tracker=self.client, dsn=url)
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,122 @@
+"""
+SQLite repositories, the default backend.
+
+Thin wrappers over database_operations, rankings and grade_statistics,
+which keep their pooled connections, query caches and change tracking.
+"""
+
+from ..database import database_operations as db
+from ..database import grade_statistics, rankings
+from ..database.connection_pool import configure_pool
+from ..database.init_database import init_db
+from .base import GradeRepository, RegistrarRepository, Repositories, StudentRepository
+
+class SQLiteStudentRepository(StudentRepository):
+
+    def all(self):
+        return db.fetch_student_data()
+
+    def page(self, after_id=None, page_size=db.STUDENT_PAGE_SIZE, program=None,
+             year_level=None, enrollment_status=None, offset=0):
+        return db.fetch_student_page(after_id, page_size, program, year_level,
+                                     enrollment_status, offset)
+
+    def count(self, program=None, year_level=None, enrollment_status=None):
+        return db.count_students(program, year_level, enrollment_status)
+
+    def search(self, query, limit=db.SEARCH_RESULT_LIMIT):
+        return db.search_students(query, limit)
+
+    def get(self, student_id):
+        return db.get_student_info(student_id)
+
+    def summary(self, student_id):
+        return db.get_student_summary(student_id)
+
+    def term_summaries(self, student_id):
+        return db.fetch_term_summaries(student_id)
+
+    def add(self, student_number, name, mobile_number, email_address, password,
+            year_level='1', semester='1', college='', program='', school_year='',
+            enrollment_status='Enrolled'):
+        return db.insert_user_data_st(student_number, name, mobile_number, email_address,
+                                      password, year_level, semester, college, program,
+                                      school_year, enrollment_status)
+
+    def update(self, student_id, name, mobile_number, email_address, year_level=None,
+               semester=None, college=None, program=None, school_year=None,
+               enrollment_status=None):
+        return db.update_student_data(student_id, name, mobile_number, email_address,
+                                      year_level, semester, college, program,
+                                      school_year, enrollment_status)
+
+    def delete(self, student_id):
+        return db.delete_student(student_id)
+
+    def verify_password(self, student_id, password):
+        return db.fetch_user_credentials(student_id, password)
+
+    def check_password(self, student_id, password):
+        return db.check_student_login(student_id, password)
+
+class SQLiteGradeRepository(GradeRepository):
+
+    def for_student(self, student_id):
+        return db.fetch_student_grades(student_id)
+
+    def upsert(self, student_id, subject, units, rating, final_grade, status,
+               year_level, semester):
+        return db.update_grade(student_id, subject, units, rating, final_grade, status,
+                               year_level, semester)
+
+    def upsert_many(self, grades):
+        return db.update_grades(grades)
+
+    def delete(self, student_id, subject, year_level, semester):
+        return db.delete_grade(student_id, subject, year_level, semester)
+
+    def top_students(self, limit=10, program=None, year_level=None, school_year=None):
+        return rankings.top_students(limit, program, year_level, school_year)
+
+    def student_percentile(self, student_id, program=None, year_level=None,
+                           school_year=None):
+        return rankings.student_percentile(student_id, program, year_level, school_year)
+
+    def honors_cutoffs(self, top_percents=rankings.HONORS_TOP_PERCENTS, program=None,
+                       year_level=None, school_year=None):
+        return rankings.honors_cutoffs(tuple(top_percents), program, year_level, school_year)
+
+    def ranking_filter_values(self):
+        return rankings.ranking_filter_values()
+
+    def subject_statistics(self, subject=None, year_level=None, semester=None):
+        return grade_statistics.subject_statistics(subject, year_level, semester)
+
+class SQLiteRegistrarRepository(RegistrarRepository):
+
+    def add(self, registrar_id, name, password):
+        return db.insert_user_dataR(registrar_id, name, password)
+
+    def verify_password(self, registrar_id, password):
+        return db.fetch_user_credentials2(registrar_id, password)
+
+    def check_password(self, registrar_id, password):
+        return db.check_registrar_login(registrar_id, password)
+
+class SQLiteRepositories(Repositories):
+    """Repositories over the SQLite database at db_path (migrated on open).
+
+    The connection pool is process-wide, so opening another database
+    repoints every SQLite repository at it.
+    """
+
+    def __init__(self, db_path, migrate=True):
+        if migrate:
+            init_db(db_path)
+        self.pool = configure_pool(db_path)
+        self.db_path = db_path
+        super().__init__(SQLiteStudentRepository(), SQLiteGradeRepository(),
+                         SQLiteRegistrarRepository(), dsn=f"sqlite:///{db_path}")
+
+    def close(self):
+        self.pool.close()
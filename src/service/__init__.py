@@ -0,0 +1,7 @@
+"""
+HTTP/JSON service for the Grade Evaluation System database.
+"""
+
+from . import operations
+from . import client
+from . import server
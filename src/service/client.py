@@ -0,0 +1,120 @@
+"""
+Client for the grade service.
+
+ServiceClient has a method for every operation in OPERATIONS, with the
+same name, arguments and return values as the database function, so the
+Tk screens can use it in place of database_operations. It also works as
+a change tracker for RefreshGate.
+"""
+
+import http.client
+import json
+import threading
+from urllib.parse import urlsplit
+from ..utils.logger import logger
+from .operations import OPERATIONS, READ, restore
+
+class ServiceError(Exception):
+    """The grade service could not be reached or rejected a request."""
+
+class ServiceClient:
+    """Call the grade service over HTTP/JSON.
+
+    Each thread keeps its own keep-alive connection. Reads are retried once
+    on a fresh connection; writes are not, since the service may already
+    have applied them.
+    """
+
+    def __init__(self, url, token=None, timeout=10.0):
+        parts = urlsplit(url)
+        if parts.scheme != 'http' or not parts.hostname:
+            raise ValueError(f"Unsupported grade service URL: {url}")
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.token = token
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _discard_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+
+    def request(self, method, path, payload=None, retry=False):
+        """Send one request and return the decoded JSON response."""
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['X-Service-Token'] = self.token
+        for attempt in range(2 if retry else 1):
+            try:
+                conn = self._connection()
+                conn.request(method, path, body, headers)
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (OSError, http.client.HTTPException) as e:
+                self._discard_connection()
+                if attempt or not retry:
+                    raise ServiceError(f"Grade service at {self.url} is unreachable: {e}") from e
+        if response.getheader('Connection', '').lower() == 'close':
+            self._discard_connection()
+        try:
+            decoded = json.loads(data) if data else {}
+        except ValueError as e:
+            raise ServiceError(f"Invalid response from grade service: {e}") from e
+        if response.status != 200:
+            raise ServiceError(decoded.get('error') or f"HTTP {response.status}")
+        return decoded
+
+    def call(self, name, *args, **kwargs):
+        """Run an operation on the service and return its result."""
+        if name not in OPERATIONS:
+            raise ServiceError(f"Unknown operation {name}")
+        response = self.request('POST', f'/api/{name}', {'args': list(args), 'kwargs': kwargs},
+                                retry=OPERATIONS[name][0] == READ)
+        return restore(name, response.get('result'))
+
+    def __getattr__(self, name):
+        if name not in OPERATIONS:
+            raise AttributeError(name)
+
+        def operation(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+        operation.__name__ = name
+        return operation
+
+    def versions(self, *tables):
+        """Change counters for RefreshGate, or None if the service is unreachable."""
+        try:
+            return self.call('change_versions', *tables)
+        except ServiceError as e:
+            logger.error("Failed to read change counters from the grade service: %s", e)
+            return None
+
+    def stats(self):
+        """The service's latency and batching metrics."""
+        return self.request('GET', '/metrics', retry=True)
+
+    def close(self):
+        """Close every thread's connection."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
@@ -0,0 +1,70 @@
+"""
+Operations exposed by the grade service, shared by the server and the client.
+
+Each operation is a function of database_operations, rankings or
+grade_statistics with the same name and arguments. The kind decides which
+executor runs it on the server; the shape lets the client turn JSON lists
+back into the tuples the database functions return.
+"""
+
+READ = 'read'
+WRITE = 'write'
+
+ROWS = 'rows'    # list of row tuples
+ROW = 'row'      # one row tuple, or None/False
+VALUE = 'value'  # anything else, returned as decoded
+
+OPERATIONS = {
+    # Students
+    'fetch_student_data': (READ, ROWS),
+    'fetch_student_page': (READ, ROWS),
+    'count_students': (READ, VALUE),
+    'search_students': (READ, ROWS),
+    'get_student_info': (READ, ROW),
+    'get_student_summary': (READ, ROW),
+    'fetch_term_summaries': (READ, ROWS),
+    'insert_user_data_st': (WRITE, VALUE),
+    'update_student_data': (WRITE, VALUE),
+    'delete_student': (WRITE, VALUE),
+    # Grades
+    'fetch_student_grades': (READ, ROWS),
+    'update_grade': (WRITE, VALUE),
+    'update_grades': (WRITE, VALUE),
+    'delete_grade': (WRITE, VALUE),
+    # Authentication and registrars. Logins are reads so the ~100 ms password
+    # hash never holds up the writer; the rare hash upgrade writes from the
+    # read pool, relying on SQLite's busy timeout.
+    'fetch_user_credentials': (READ, VALUE),
+    'fetch_user_credentials2': (READ, VALUE),
+    'check_student_login': (READ, VALUE),
+    'check_registrar_login': (READ, VALUE),
+    'insert_user_dataR': (WRITE, VALUE),
+    # Reports
+    'top_students': (READ, ROWS),
+    'student_percentile': (READ, ROW),
+    'honors_cutoffs': (READ, ROWS),
+    'ranking_filter_values': (READ, VALUE),
+    'subject_statistics': (READ, VALUE),
+    # Change counters, so clients can skip refreshes (see change_tracking)
+    'change_versions': (READ, ROW),
+}
+
+# Writes a client holding only the kiosk token may make: student sign-up.
+# Every other write needs the registrar token.
+KIOSK_WRITES = {'insert_user_data_st'}
+
+# Reads of one student's records, taking the student ID first. A kiosk may
+# only make them for the student logged in on it; its other reads are
+# limited to logins and change counters.
+STUDENT_READS = {'get_student_info', 'get_student_summary', 'fetch_term_summaries',
+                 'fetch_student_grades', 'student_percentile'}
+KIOSK_READS = {'change_versions'}
+
+def restore(name, result):
+    """Give a decoded JSON result the shape the database function returns."""
+    shape = OPERATIONS[name][1]
+    if shape == ROWS and isinstance(result, list):
+        return [tuple(row) if isinstance(row, list) else row for row in result]
+    if shape == ROW and isinstance(result, list):
+        return tuple(result)
+    return result
@@ -0,0 +1,418 @@
+"""
+Asynchronous HTTP/JSON service over the Grade Evaluation System database.
+
+Run it on the machine that holds the database file:
+    set GESYS_SERVICE_TOKEN=<kiosk secret>
+    set GESYS_REGISTRAR_TOKEN=<registrar secret>
+    python -m src.service.server --host 0.0.0.0 --port 8765
+
+Workstations and kiosks then set GESYS_SERVICE_URL=http://<host>:8765
+instead of opening the file over a network share. Requests:
+    POST /api/<operation>   {"args": [...], "kwargs": {...}} -> {"result": ...}
+    GET  /metrics           per-operation latency, write batching, cache and login counters
+    GET  /health
+
+Reads run on a thread pool sized to the connection pool. Every write runs
+on one writer thread, so the database only ever has a single writer.
+update_grade calls are group-committed: while one batch is being written,
+newly arriving grades queue up and are then committed together as one
+update_grades transaction, so an idle service adds no delay.
+
+Logins go through an Authenticator keyed by the client's address, so a
+burst of bad logins from one machine is turned away before it reaches the
+database.
+
+Requests carry a token in an X-Service-Token header. The kiosk token
+(GESYS_SERVICE_TOKEN) allows logins, student sign-up and reading the
+records of the student last logged in from the kiosk's address; every
+other operation needs the registrar token (GESYS_REGISTRAR_TOKEN), which
+only registrar workstations are given. With neither token set every
+request is allowed, so the service then refuses to listen on anything but
+a loopback address.
+
+A request must arrive within GESYS_SERVICE_READ_TIMEOUT seconds (default
+30), or the connection is closed.
+"""
+
+import argparse
+import asyncio
+import functools
+import hmac
+import ipaddress
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ..database import database_operations, grade_statistics, rankings
+from ..database.change_tracking import get_change_tracker
+from ..database.connection_pool import DEFAULT_DB_PATH, configure_pool, get_pool
+from ..database.init_database import init_db
+from ..repositories.authentication import Authenticator
+from ..repositories.base import Repositories
+from ..repositories.sqlite import (
+    SQLiteGradeRepository, SQLiteRegistrarRepository, SQLiteStudentRepository
+)
+from ..utils.logger import logger
+from ..utils.metrics import LatencyMetrics
+from .operations import KIOSK_READS, KIOSK_WRITES, OPERATIONS, READ, STUDENT_READS
+
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADERS = 100
+READ_TIMEOUT = float(os.environ.get('GESYS_SERVICE_READ_TIMEOUT', 30))
+MAX_BATCH = 200
+
+REGISTRAR = 'registrar'
+KIOSK = 'kiosk'
+
+REASONS = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 403: 'Forbidden',
+           404: 'Not Found',
+           405: 'Method Not Allowed', 413: 'Payload Too Large',
+           431: 'Request Header Fields Too Large', 500: 'Internal Server Error'}
+
+def change_versions(*tables):
+    """Change counters of the given tables (see change_tracking)."""
+    return get_change_tracker().versions(*tables)
+
+def _handler(name):
+    if name == 'change_versions':
+        return change_versions
+    for module in (database_operations, rankings, grade_statistics):
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise LookupError(f"No function implements operation {name}")
+
+HANDLERS = {name: _handler(name) for name in OPERATIONS}
+
+# Login operations: (user type, whether the result is reduced to a boolean)
+LOGIN_OPERATIONS = {
+    'fetch_user_credentials': ('student', True),
+    'fetch_user_credentials2': ('registrar', True),
+    'check_student_login': ('student', False),
+    'check_registrar_login': ('registrar', False),
+}
+
+def is_loopback(host):
+    """Whether host only accepts connections from this machine."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def _freeze(value):
+    """Turn JSON lists into tuples, so arguments can key the query caches."""
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+class HTTPError(Exception):
+    """A request the service answers with an error status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class GradeService:
+    """The HTTP front end, read pool, single writer and grade batching."""
+
+    def __init__(self, read_workers=None, max_batch=MAX_BATCH, token=None,
+                 registrar_token=None):
+        self.max_batch = max_batch
+        self.token = token
+        self.registrar_token = registrar_token
+        self.readers = ThreadPoolExecutor(max_workers=read_workers or get_pool().max_size,
+                                          thread_name_prefix='gesys-read')
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='gesys-write')
+        self.metrics = LatencyMetrics()
+        self.authenticator = Authenticator(Repositories(
+            SQLiteStudentRepository(), SQLiteGradeRepository(), SQLiteRegistrarRepository()))
+        self.batching = {'batches': 0, 'grades': 0, 'largest': 0}
+        self.port = None
+        self._server = None
+        self._pending_grades = []
+        self._flush_handle = None
+        self._batch_running = False
+        self._kiosk_students = {}  # client address -> student logged in there
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        """Start accepting connections; port 0 picks a free port.
+
+        Raises ValueError for a non-loopback host when no token is set.
+        """
+        if not (self.token or self.registrar_token) and not is_loopback(host):
+            raise ValueError(f"Refusing to listen on {host} without GESYS_SERVICE_TOKEN "
+                             f"or GESYS_REGISTRAR_TOKEN")
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Grade service listening on %s:%s", host, self.port)
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting requests and finish the queued writes."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        while self._pending_grades or self._batch_running:
+            self._flush_grades()
+            await asyncio.sleep(0.01)
+        await asyncio.to_thread(self.writer.shutdown)
+        await asyncio.to_thread(self.readers.shutdown)
+
+    async def call(self, name, args=(), kwargs=None, source=None):
+        """Run one operation on the executor for its kind.
+
+        source is the client's address, which logins are throttled by.
+        """
+        kwargs = kwargs or {}
+        if name == 'update_grade':
+            return await self._update_grade(args, kwargs)
+        if name in LOGIN_OPERATIONS:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.readers, functools.partial(self._login, name, source or 'unknown',
+                                                *args, **kwargs))
+        executor = self.readers if OPERATIONS[name][0] == READ else self.writer
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, functools.partial(HANDLERS[name], *args, **kwargs))
+
+    async def _update_grade(self, args, kwargs):
+        """Queue an update_grade for the next batch and wait for its result."""
+        if len(args) > len(database_operations.GRADE_FIELDS):
+            raise TypeError("update_grade() got too many arguments")
+        grade = dict(zip(database_operations.GRADE_FIELDS, args), **kwargs)
+        future = asyncio.get_running_loop().create_future()
+        self._pending_grades.append((grade, future))
+        if not self._batch_running and self._flush_handle is None:
+            # Let the requests already read this loop iteration join in
+            self._flush_handle = asyncio.get_running_loop().call_soon(self._flush_grades)
+        return await future
+
+    def _login(self, name, source, account_id, password):
+        """Check a login through the authenticator, in the operation's result shape."""
+        user_type, boolean = LOGIN_OPERATIONS[name]
+        result, _ = self.authenticator.authenticate(user_type, account_id, password, source)
+        return result == database_operations.LOGIN_OK if boolean else result
+
+    def _flush_grades(self):
+        """Hand the queued grades to the writer as one update_grades call.
+
+        Only one batch is in flight at a time; grades queued meanwhile are
+        flushed as soon as it finishes.
+        """
+        self._flush_handle = None
+        if self._batch_running or not self._pending_grades:
+            return
+        batch = self._pending_grades[:self.max_batch]
+        del self._pending_grades[:self.max_batch]
+        self._batch_running = True
+        self.batching['batches'] += 1
+        self.batching['grades'] += len(batch)
+        self.batching['largest'] = max(self.batching['largest'], len(batch))
+
+        done = asyncio.get_running_loop().run_in_executor(
+            self.writer, database_operations.update_grades, [grade for grade, _ in batch])
+
+        def resolve(done):
+            self._batch_running = False
+            if self._pending_grades:
+                self._flush_grades()
+            error = done.exception()
+            results = [None] * len(batch) if error else done.result()
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+        done.add_done_callback(resolve)
+
+    def stats(self):
+        """The body of GET /metrics."""
+        return {'operations': self.metrics.snapshot(),
+                'grade_batching': dict(self.batching),
+                'pool': get_pool().stats(),
+                'caches': database_operations.get_cache_stats(),
+                'logins': self.authenticator.stats()}
+
+    async def _handle_connection(self, reader, writer):
+        peer = writer.get_extra_info('peername')
+        source = peer[0] if peer else None
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader),
+                                                     READ_TIMEOUT)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    status, payload = await self._respond(method, path, headers, body, source)
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                except HTTPError as e:
+                    status, payload, keep_alive = e.status, {'error': str(e)}, False
+                data = json.dumps(payload).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    .encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """Read one request; returns None when the client closed the connection."""
+        line = await self._read_line(reader)
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        while True:
+            line = await self._read_line(reader)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise HTTPError(431, "Too many headers")
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length > 0 else b''
+        return method.upper(), target.split('?', 1)[0], headers, body
+
+    async def _read_line(self, reader):
+        try:
+            return await reader.readline()
+        except (asyncio.LimitOverrunError, ValueError):
+            raise HTTPError(431, "Request line or header too long")
+
+    def _role(self, headers):
+        """REGISTRAR, KIOSK or None (rejected) for the request's token."""
+        if not (self.token or self.registrar_token):
+            return REGISTRAR  # loopback only, see start()
+        supplied = headers.get('x-service-token', '')
+        if self.registrar_token and hmac.compare_digest(supplied, self.registrar_token):
+            return REGISTRAR
+        if self.token and hmac.compare_digest(supplied, self.token):
+            return KIOSK
+        return None
+
+    def _kiosk_allows(self, name, args, kwargs, source):
+        """Whether a kiosk at source may call name with these arguments."""
+        if name in KIOSK_WRITES or name in KIOSK_READS or name in LOGIN_OPERATIONS:
+            return True
+        if name in STUDENT_READS:
+            student_id = args[0] if args else kwargs.get('student_id')
+            return (student_id is not None
+                    and str(student_id) == self._kiosk_students.get(source))
+        return False
+
+    def _record_kiosk_login(self, name, args, source, result):
+        """Remember which student is logged in on the kiosk at source."""
+        if LOGIN_OPERATIONS[name][0] != 'student':
+            return
+        # Any student login attempt ends the previous student's access
+        self._kiosk_students.pop(source, None)
+        if args and result in (True, database_operations.LOGIN_OK):
+            self._kiosk_students[source] = str(args[0])
+
+    async def _respond(self, method, path, headers, body, source=None):
+        """Route a request; returns (status, payload)."""
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        role = self._role(headers)
+        if role is None:
+            return 401, {'error': "Missing or invalid service token"}
+        if path == '/metrics':
+            return 200, self.stats()
+        if not path.startswith('/api/'):
+            return 404, {'error': f"Unknown path {path}"}
+
+        name = path[len('/api/'):]
+        if name not in OPERATIONS:
+            return 404, {'error': f"Unknown operation {name}"}
+        if method != 'POST':
+            return 405, {'error': "Operations must be POSTed"}
+        try:
+            request = json.loads(body or b'{}')
+            args = request.get('args', [])
+            kwargs = request.get('kwargs', {})
+            if not isinstance(args, list) or not isinstance(kwargs, dict):
+                raise ValueError("args must be a list and kwargs an object")
+        except (ValueError, AttributeError) as e:
+            return 400, {'error': f"Invalid request body: {e}"}
+        if role == KIOSK and not self._kiosk_allows(name, args, kwargs, source):
+            if name in STUDENT_READS:
+                return 403, {'error': f"{name} is limited to the student logged in "
+                                      f"on this kiosk"}
+            return 403, {'error': f"{name} needs the registrar token"}
+
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = await self.call(name, _freeze(args),
+                                     {key: _freeze(value) for key, value in kwargs.items()},
+                                     source)
+            if role == KIOSK and name in LOGIN_OPERATIONS:
+                self._record_kiosk_login(name, args, source, result)
+            ok = True
+            return 200, {'result': result}
+        except TypeError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            logger.exception("Operation %s failed", name)
+            return 500, {'error': f"{name} failed: {e}"}
+        finally:
+            self.metrics.record(name, time.perf_counter() - started, ok)
+
+async def serve(host='127.0.0.1', port=DEFAULT_PORT, **options):
+    """Run a GradeService until cancelled."""
+    service = GradeService(**options)
+    await service.start(host, port)
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the grade database over HTTP/JSON.")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="Interface to listen on (0.0.0.0 for all)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="Path to the database file")
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH,
+                        help="Most update_grade calls committed in one transaction")
+    args = parser.parse_args(argv)
+    token = os.environ.get('GESYS_SERVICE_TOKEN')
+    registrar_token = os.environ.get('GESYS_REGISTRAR_TOKEN')
+    if not (token or registrar_token) and not is_loopback(args.host):
+        parser.error(f"set GESYS_SERVICE_TOKEN and GESYS_REGISTRAR_TOKEN to listen on {args.host}")
+    if token and not registrar_token:
+        logger.warning("GESYS_REGISTRAR_TOKEN is not set; grade and registrar writes "
+                       "will be refused")
+
+    init_db(args.db)
+    configure_pool(args.db)
+    try:
+        asyncio.run(serve(args.host, args.port, max_batch=args.max_batch,
+                          token=token, registrar_token=registrar_token))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -3,5 +3,6 @@ UI components for the Grade Evaluation System.
 """
 
 from . import auth_screens
+from . import background_tasks
 from . import dashboard_screens
 from . import ui_components
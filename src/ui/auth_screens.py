@@ -4,8 +4,10 @@ Authentication screens for the Grade Evaluation System.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
+import math
 import re
-from ..database.database_operations import fetch_user_credentials, fetch_user_credentials2, insert_user_dataR
+from ..database.database_operations import LOGIN_OK
+from ..repositories.authentication import LOGIN_THROTTLED
 from ..utils.form_utilities import validate_email, validate_mobile
 from .ui_components import (
     COLORS, 
@@ -15,6 +17,24 @@ from .ui_components import (
     create_button,
     create_entry
 )
+from .background_tasks import BackgroundTasks
+
+def show_busy(widget, busy, button=None):
+    """Show a busy cursor, and disable button, while a password is being checked."""
+    widget.configure(cursor='watch' if busy else '')
+    if button is not None:
+        button.state(['disabled'] if busy else ['!disabled'])
+
+def show_login_error(e):
+    messagebox.showerror("Error", f"Login failed: {str(e)}")
+
+def show_login_rejected(result, retry_after):
+    """Tell the user why Authenticator.authenticate() turned a login down."""
+    if result == LOGIN_THROTTLED:
+        wait = f"in {math.ceil(retry_after)} seconds" if retry_after else "later"
+        messagebox.showerror("Error", f"Too many login attempts. Please try again {wait}.")
+    else:
+        messagebox.showerror("Error", "Invalid credentials")
 
 class LoginScreen(ttk.Frame):
     """Login screen for EECP GESYS."""
@@ -27,6 +47,10 @@ class LoginScreen(ttk.Frame):
         
         self.configure(style='App.TFrame', padding=40)
         self.create_widgets()
+        # Password hashing takes ~100 ms, so logins are checked on a worker
+        self.tasks = BackgroundTasks(
+            self, max_workers=1,
+            on_busy_changed=lambda busy: show_busy(self, busy, self.login_button))
     
     def create_widgets(self):
         """Create login screen widgets."""
@@ -90,11 +114,11 @@ class LoginScreen(ttk.Frame):
         button_frame = ttk.Frame(form_frame, style='App.TFrame')
         button_frame.pack(fill=tk.X, pady=(0, 20))
         
-        login_button = create_button(button_frame,
-                                   "Login",
-                                   self.login,
-                                   is_primary=False)
-        login_button.pack(fill=tk.X)
+        self.login_button = create_button(button_frame,
+                                        "Login",
+                                        self.login,
+                                        is_primary=False)
+        self.login_button.pack(fill=tk.X)
         
         # Register link
         register_frame = ttk.Frame(form_frame, style='App.TFrame')
@@ -122,18 +146,18 @@ class LoginScreen(ttk.Frame):
             messagebox.showerror("Error", "Please fill in all fields")
             return
         
-        if user_type == "student":
-            user_data = fetch_user_credentials(username, password)
-        else:
-            user_data = fetch_user_credentials2(username, password)
+        def on_checked(outcome):
+            result, retry_after = outcome
+            if result == LOGIN_OK:
+                self.app.current_user = True
+                self.app.user_type = user_type
+                # Create and show the appropriate dashboard
+                self.app.create_dashboard(user_type, username)
+            else:
+                show_login_rejected(result, retry_after)
         
-        if user_data:
-            self.app.current_user = user_data
-            self.app.user_type = user_type
-            # Create and show the appropriate dashboard
-            self.app.create_dashboard(user_type, username)
-        else:
-            messagebox.showerror("Error", "Invalid credentials")
+        self.tasks.submit(self.app.authenticator.authenticate, user_type, username, password,
+                          key='login', on_success=on_checked, on_error=show_login_error)
     
     def show_register(self):
         """Show registration screen based on user type."""
@@ -153,6 +177,8 @@ class RegistrarLoginScreen(ttk.Frame):
         self.app = app
         
         self.create_widgets()
+        self.tasks = BackgroundTasks(self, max_workers=1,
+                                     on_busy_changed=lambda busy: show_busy(self, busy))
     
     def create_widgets(self):
         """Create and setup the login screen widgets."""
@@ -190,13 +216,18 @@ class RegistrarLoginScreen(ttk.Frame):
             messagebox.showerror("Error", "Please fill in all fields")
             return
         
-        user_data = fetch_user_credentials2(registrar_number, password)
-        if user_data:
-            self.app.current_user = user_data
-            self.app.user_type = "registrar"
-            self.app.create_dashboard("registrar", registrar_number)
-        else:
-            messagebox.showerror("Error", "Invalid credentials")
+        def on_checked(outcome):
+            result, retry_after = outcome
+            if result == LOGIN_OK:
+                self.app.current_user = True
+                self.app.user_type = "registrar"
+                self.app.create_dashboard("registrar", registrar_number)
+            else:
+                show_login_rejected(result, retry_after)
+        
+        self.tasks.submit(self.app.authenticator.authenticate, "registrar",
+                          registrar_number, password, key='login',
+                          on_success=on_checked, on_error=show_login_error)
 
 class StudentSignupScreen(tk.Frame):
     """Student signup screen."""
@@ -262,6 +293,9 @@ class RegistrarSignupScreen(ttk.Frame):
         self.app = app
         self.entries = {}
         self.create_widgets()
+        # Storing the password hashes it, which takes ~100 ms
+        self.tasks = BackgroundTasks(self, max_workers=1,
+                                     on_busy_changed=lambda busy: show_busy(self, busy))
         
     def create_widgets(self):
         """Create and setup all widgets for the registrar signup screen."""
@@ -369,22 +403,23 @@ class RegistrarSignupScreen(ttk.Frame):
             messagebox.showwarning("Input Error", "Password must be at least 8 characters long!")
             return
         
-        try:
-            # Insert into database
-            success = insert_user_dataR(
-                registrar_id=fields['registrar_number'].get().strip(),
-                name=fields['name'].get().strip().upper(),
-                password=fields['password'].get()
-            )
-            
+        def on_saved(success):
             if success:
                 messagebox.showinfo("Success", "Registration successful! You can now login.")
                 self.show_login()
             else:
                 messagebox.showerror("Error", "Registration failed. Please try again.")
         
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        # Insert into database
+        self.tasks.submit(
+            self.app.repositories.registrars.add,
+            registrar_id=fields['registrar_number'].get().strip(),
+            name=fields['name'].get().strip().upper(),
+            password=fields['password'].get(),
+            key='signup',
+            on_success=on_saved,
+            on_error=lambda e: messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        )
     
     def show_login(self):
         """Return to login screen."""
@@ -0,0 +1,127 @@
+"""
+Background execution of database work for the Grade Evaluation System UI.
+"""
+
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from ..utils.logger import logger
+
+class BackgroundTasks:
+    """Run blocking calls on worker threads and deliver results on the Tk thread.
+
+    Results are handed back through a queue that is polled with after(), so
+    callbacks always run on the Tk main thread. Tasks submitted with a key
+    supersede earlier tasks with the same key: a stale task is cancelled if
+    it has not started yet, and its result is discarded if it has.
+    """
+
+    def __init__(self, widget, max_workers=2, poll_interval=30, on_busy_changed=None):
+        self.widget = widget
+        self.poll_interval = poll_interval
+        self.on_busy_changed = on_busy_changed
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='gesys-db')
+        self._results = queue.Queue()
+        self._pending = {}
+        self._latest = {}
+        self._generation = 0
+        self._polling = False
+        self._closed = False
+
+    @property
+    def busy(self):
+        """Whether any task is still waiting for its result."""
+        return bool(self._pending)
+
+    def submit(self, func, *args, on_success=None, on_error=None, key=None, **kwargs):
+        """Run func(*args, **kwargs) in the background.
+
+        on_success receives the return value and on_error the exception, both
+        on the Tk thread. Returns the task's generation number.
+        """
+        if self._closed:
+            return None
+        if key is not None:
+            self.cancel(key)
+        was_busy = self.busy
+        self._generation += 1
+        generation = self._generation
+        if key is not None:
+            self._latest[key] = generation
+
+        future = self._executor.submit(self._run, generation, func, args, kwargs)
+        self._pending[generation] = (future, key, on_success, on_error)
+        self._schedule_poll()
+        if not was_busy:
+            self._notify_busy()
+        return generation
+
+    def cancel(self, key):
+        """Cancel the latest task submitted with key, if it is still pending."""
+        generation = self._latest.pop(key, None)
+        task = self._pending.get(generation)
+        if task is not None and task[0].cancel():
+            del self._pending[generation]
+            if not self.busy:
+                self._notify_busy()
+
+    def _run(self, generation, func, args, kwargs):
+        """Worker thread body: run the call and queue its outcome."""
+        try:
+            self._results.put((generation, True, func(*args, **kwargs)))
+        except Exception as e:
+            logger.error("Background task %s failed: %s", getattr(func, '__name__', func), e)
+            self._results.put((generation, False, e))
+
+    def _schedule_poll(self):
+        if not self._polling and not self._closed:
+            self._polling = True
+            try:
+                self.widget.after(self.poll_interval, self._poll)
+            except tk.TclError:
+                self._polling = False
+
+    def _poll(self):
+        """Deliver finished results to their callbacks on the Tk thread."""
+        self._polling = False
+        was_busy = self.busy
+        while True:
+            try:
+                generation, ok, result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            task = self._pending.pop(generation, None)
+            if task is None:
+                continue
+            _, key, on_success, on_error = task
+            if key is not None:
+                if self._latest.get(key) != generation:
+                    continue  # superseded by a newer task
+                del self._latest[key]
+            callback = on_success if ok else on_error
+            if callback is not None:
+                try:
+                    callback(result)
+                except Exception as e:
+                    logger.error("Background task callback failed: %s", e)
+
+        if self._pending:
+            self._schedule_poll()
+        elif was_busy:
+            self._notify_busy()
+
+    def _notify_busy(self):
+        if self.on_busy_changed is not None:
+            try:
+                self.on_busy_changed(self.busy)
+            except tk.TclError:
+                pass
+
+    def shutdown(self):
+        """Stop accepting work and drop queued tasks."""
+        self._closed = True
+        self._pending.clear()
+        self._latest.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -5,13 +5,41 @@ Dashboard screens for the Grade Evaluation System.
 import tkinter as tk
 from tkinter import ttk, messagebox
 import re
-from ..database.database_operations import (
-    fetch_student_data, fetch_student_grades, update_grade,
-    delete_grade, search_students, insert_user_data_st,
-    update_student_data, get_student_info, delete_student
-)
+from ..database.database_operations import STUDENT_PAGE_SIZE, RATING_SCALE
+from ..database.change_tracking import RefreshGate
 from ..utils.form_utilities import validate_email, validate_mobile
-from .ui_components import COLORS, create_custom_button
+from ..utils.search_index import StudentSearchIndex, IncrementalSearch
+from .ui_components import (
+    COLORS, create_custom_button, VirtualTreeview, ListDataSource, PagedDataSource,
+    AutoRefresh
+)
+from .background_tasks import BackgroundTasks
+
+AUTO_REFRESH_INTERVAL = 5000  # milliseconds
+SEARCH_DEBOUNCE_MS = 250
+
+def fetch_grades_and_summary(repositories, student_id):
+    """Load a student's grades and their GWA summary (worker thread)."""
+    return (repositories.grades.for_student(student_id),
+            repositories.students.summary(student_id))
+
+def load_search_index(repositories):
+    """Load every student into an in-memory search index (worker thread)."""
+    students = repositories.students.all()
+    return StudentSearchIndex(students) if students else None
+
+def show_loading(widget, label, busy):
+    """Show or hide a dashboard's loading indicator."""
+    label.config(text="Loading..." if busy else "")
+    widget.configure(cursor='watch' if busy else '')
+
+def grade_key(grade):
+    """Natural key of a grade row: subject, year level and semester."""
+    return f"{grade[0]}|{grade[5]}|{grade[6]}"
+
+def show_task_error(title):
+    """Build an error callback for background database tasks."""
+    return lambda e: messagebox.showerror("Error", f"{title}: {str(e)}")
 
 class StudentDashboard(ttk.Frame):
     """Dashboard screen for students."""
@@ -22,8 +50,16 @@ class StudentDashboard(ttk.Frame):
         self.nav_manager = nav_manager
         self.app = app
         self.student_id = student_id
+        self.repositories = app.repositories
+        
+        # Refreshes only reload what changed since the last load
+        self.info_gate = RefreshGate(('students',), self.repositories.change_tracker)
+        self.grades_gate = RefreshGate(('grades',), self.repositories.change_tracker)
+        self.auto_refresh = AutoRefresh(self, self.refresh, AUTO_REFRESH_INTERVAL)
         
         self.create_widgets()
+        self.tasks = BackgroundTasks(
+            self, on_busy_changed=lambda busy: show_loading(self, self.loading_label, busy))
         self.load_student_info()
         self.load_student_grades(self.student_id)
     
@@ -85,9 +121,8 @@ class StudentDashboard(ttk.Frame):
         grades_frame = ttk.LabelFrame(main_container, text="Grade Information", padding="10")
         grades_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
         
-        # Create Treeview for grades
+        # Create virtual Treeview for grades
         columns = ('Subject', 'Units', 'Rating', 'Final Grade', 'Status', 'Year Level', 'Term')
-        self.grades_tree = ttk.Treeview(grades_frame, columns=columns, show='headings', height=10)
         
         # Set column headings and widths
         column_widths = {
@@ -100,17 +135,10 @@ class StudentDashboard(ttk.Frame):
             'Term': 100
         }
         
-        for col in columns:
-            self.grades_tree.heading(col, text=col)
-            self.grades_tree.column(col, width=column_widths[col])
-        
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(grades_frame, orient=tk.VERTICAL, command=self.grades_tree.yview)
-        self.grades_tree.configure(yscrollcommand=scrollbar.set)
-        
-        # Pack tree and scrollbar
-        self.grades_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.grades_list = VirtualTreeview(grades_frame, columns, column_widths,
+                                           height=10, key=grade_key)
+        self.grades_list.pack(fill=tk.BOTH, expand=True)
+        self.grades_tree = self.grades_list.tree
         
         # Summary Frame
         summary_frame = ttk.LabelFrame(main_container, text="Summary", padding="10")
@@ -126,21 +154,57 @@ class StudentDashboard(ttk.Frame):
         
         ttk.Label(gpa_frame, text="Total Units:").pack(side=tk.LEFT, padx=(0, 10))
         self.units_value = ttk.Label(gpa_frame, text="0")
-        self.units_value.pack(side=tk.LEFT)
+        self.units_value.pack(side=tk.LEFT, padx=(0, 20))
+        
+        ttk.Label(gpa_frame, text="Units Earned:").pack(side=tk.LEFT, padx=(0, 10))
+        self.earned_value = ttk.Label(gpa_frame, text="0")
+        self.earned_value.pack(side=tk.LEFT, padx=(0, 20))
+        
+        ttk.Label(gpa_frame, text="Failed Units:").pack(side=tk.LEFT, padx=(0, 10))
+        self.failed_value = ttk.Label(gpa_frame, text="0")
+        self.failed_value.pack(side=tk.LEFT)
         
         # Button Frame
         button_frame = ttk.Frame(main_container)
         button_frame.pack(fill=tk.X)
         
         ttk.Button(button_frame, text="Refresh", 
-                  command=lambda: self.load_student_grades(self.student_id)).pack(side=tk.LEFT, padx=5)
+                  command=self.refresh).pack(side=tk.LEFT, padx=5)
+        self.auto_refresh_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text="Auto-refresh", variable=self.auto_refresh_var,
+                        command=self.toggle_auto_refresh).pack(side=tk.LEFT, padx=5)
+        self.loading_label = ttk.Label(button_frame, text="")
+        self.loading_label.pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Logout", 
                   command=self.app.logout).pack(side=tk.RIGHT, padx=5)
 
+    def refresh(self):
+        """Reload student information and grades if they changed."""
+        self.load_student_info()
+        self.load_student_grades(self.student_id)
+    
+    def toggle_auto_refresh(self):
+        """Start or stop periodic refreshes."""
+        if self.auto_refresh_var.get():
+            self.auto_refresh.start()
+        else:
+            self.auto_refresh.stop()
+    
+    def shutdown(self):
+        """Stop periodic refreshes and background workers."""
+        self.auto_refresh.stop()
+        self.tasks.shutdown()
+
     def load_student_info(self):
-        """Load and display student information."""
+        """Load student information in the background."""
+        self.tasks.submit(self.info_gate.load, self.student_id,
+                          self.repositories.students.get, self.student_id, key='student_info',
+                          on_success=self.info_gate.deliver(self.show_student_info),
+                          on_error=show_task_error("An error occurred"))
+    
+    def show_student_info(self, student_info):
+        """Display loaded student information."""
         try:
-            student_info = get_student_info(self.student_id)
             if student_info:
                 student_id, name, mobile, email, year, term, college, program, school_year, status = student_info
                 
@@ -161,31 +225,29 @@ class StudentDashboard(ttk.Frame):
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
     def load_student_grades(self, student_id):
-        """Load and display student grades in the treeview."""
-        # Clear existing items
-        for item in self.grades_tree.get_children():
-            self.grades_tree.delete(item)
-        
-        # Fetch and display grades
-        grades = fetch_student_grades(student_id)
-        total_units = 0
-        total_rating = 0
-        
-        for grade in grades:
-            self.grades_tree.insert("", tk.END, values=grade)
-            units = float(grade[1])
-            rating = float(grade[2])
-            total_units += units
-            total_rating += units * rating
-        
-        # Update summary
-        if total_units > 0:
-            gpa = total_rating / total_units
-            self.gpa_value.config(text=f"{gpa:.2f}")
-            self.units_value.config(text=str(total_units))
+        """Load student grades in the background."""
+        self.tasks.submit(self.grades_gate.load, student_id,
+                          fetch_grades_and_summary, self.repositories, student_id,
+                          key='grades',
+                          on_success=self.grades_gate.deliver(self.show_student_grades),
+                          on_error=show_task_error("Failed to load grades"))
+    
+    def show_student_grades(self, result):
+        """Display loaded grades and the student's summary."""
+        grades, summary = result
+        self.grades_list.set_source(ListDataSource(grades))
+        
+        # GWA and units come precomputed from the student_summary table
+        if summary and summary[0] is not None:
+            gwa, units_total, units_earned, failed_units, _ = summary
+            self.gpa_value.config(text=f"{gwa:.2f}")
+            self.units_value.config(text=str(units_total))
+            self.earned_value.config(text=str(units_earned))
+            self.failed_value.config(text=str(failed_units))
         else:
             self.gpa_value.config(text="N/A")
-            self.units_value.config(text="0")
+            for label in (self.units_value, self.earned_value, self.failed_value):
+                label.config(text="0")
 
 class RegistrarDashboardNew(ttk.Frame):
     """Dashboard screen for registrars with enhanced functionality."""
@@ -195,7 +257,24 @@ class RegistrarDashboardNew(ttk.Frame):
         self.root = root
         self.registrar_number = registrar_number
         self.app = app
+        self.repositories = app.repositories
+        
+        tracker = self.repositories.change_tracker
+        self.student_gate = RefreshGate(('students', 'grades'), tracker)
+        self.grades_gate = RefreshGate(('grades',), tracker)
+        self.shown_students = None
+        
+        # Search-as-you-type runs against an in-memory index of all students,
+        # rebuilt in the background whenever students or their grades change
+        self.index_gate = RefreshGate(('students', 'grades'), tracker)
+        self.student_search = None
+        self.index_loading = False
+        self.search_after_id = None
+        
+        self.auto_refresh = AutoRefresh(self, self.search_students, AUTO_REFRESH_INTERVAL)
         
+        self.tasks = BackgroundTasks(
+            self, on_busy_changed=lambda busy: show_loading(self, self.loading_label, busy))
         self.create_widgets()
         self.populate_treeview_from_db()
     
@@ -212,17 +291,29 @@ class RegistrarDashboardNew(ttk.Frame):
         self.search_var = tk.StringVar()
         self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
         self.search_entry.pack(side=tk.LEFT, padx=5)
+        self.search_var.trace_add('write', self.on_search_changed)
         
         ttk.Button(search_frame, text="Search", 
                   command=self.search_students).pack(side=tk.LEFT)
         
+        # Filters applied to the paged student list
+        self.year_filter = ttk.Combobox(search_frame, values=['', '1', '2', '3', '4', '5'],
+                                        width=5, state='readonly')
+        self.status_filter = ttk.Combobox(search_frame, values=['', 'Enrolled', 'Not Enrolled', 'LOA', 'Graduated'],
+                                          width=12, state='readonly')
+        ttk.Label(search_frame, text="Year:").pack(side=tk.LEFT, padx=(20, 5))
+        self.year_filter.pack(side=tk.LEFT)
+        ttk.Label(search_frame, text="Status:").pack(side=tk.LEFT, padx=(10, 5))
+        self.status_filter.pack(side=tk.LEFT)
+        self.year_filter.bind('<<ComboboxSelected>>', lambda e: self.populate_treeview_from_db())
+        self.status_filter.bind('<<ComboboxSelected>>', lambda e: self.populate_treeview_from_db())
+        
         # Student List Frame
         list_frame = ttk.Frame(self)
         list_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
-        # Create Treeview
-        columns = ('ID', 'Name', 'Mobile', 'Email', 'Year', 'Term', 'College', 'Program', 'School Year', 'Status')
-        self.tree = ttk.Treeview(list_frame, columns=columns, show='headings')
+        # Create virtual Treeview
+        columns = ('ID', 'Name', 'Mobile', 'Email', 'Year', 'Term', 'College', 'Program', 'School Year', 'Status', 'GWA')
         
         # Set column headings and widths
         column_widths = {
@@ -235,24 +326,14 @@ class RegistrarDashboardNew(ttk.Frame):
             'College': 150,
             'Program': 150,
             'School Year': 100,
-            'Status': 100
+            'Status': 100,
+            'GWA': 70
         }
         
-        # Set column headings and widths
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=column_widths[col])
-        
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        
-        # Pack tree and scrollbar
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Populate tree with data
-        self.populate_treeview_from_db()
+        # Only the rows in view are materialized; pages load as they scroll in
+        self.student_list = VirtualTreeview(list_frame, columns, column_widths, height=20)
+        self.student_list.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.student_list.tree
         
         # Button Frame
         btn_frame = ttk.Frame(self)
@@ -267,13 +348,34 @@ class RegistrarDashboardNew(ttk.Frame):
                   command=self.delete_student).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Manage Grades", 
                   command=self.show_manage_grades_dialog).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Rankings", 
+                  command=self.show_rankings_dialog).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Grade Report", 
+                  command=self.show_grade_report_dialog).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Refresh", 
                   command=self.populate_treeview_from_db).pack(side=tk.LEFT, padx=5)
+        self.auto_refresh_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(btn_frame, text="Auto-refresh", variable=self.auto_refresh_var,
+                        command=self.toggle_auto_refresh).pack(side=tk.LEFT, padx=5)
+        self.loading_label = ttk.Label(btn_frame, text="")
+        self.loading_label.pack(side=tk.LEFT, padx=5)
         
         # Logout Button
         ttk.Button(btn_frame, text="Logout", 
                   command=self.app.logout).pack(side=tk.RIGHT, padx=5)
 
+    def toggle_auto_refresh(self):
+        """Start or stop periodic refreshes of the student list."""
+        if self.auto_refresh_var.get():
+            self.auto_refresh.start()
+        else:
+            self.auto_refresh.stop()
+    
+    def shutdown(self):
+        """Stop periodic refreshes and background workers."""
+        self.auto_refresh.stop()
+        self.tasks.shutdown()
+
     def show_add_student_dialog(self):
         """Show dialog for adding a new student."""
         dialog = tk.Toplevel(self)
@@ -470,75 +572,127 @@ class RegistrarDashboardNew(ttk.Frame):
             messagebox.showwarning("Input Error", "Mobile number must contain only digits!")
             return
         
-        try:
-            # Get all field values
-            success = insert_user_data_st(
-                student_number=fields['student_id'].get().strip(),
-                name=fields['name'].get().strip().upper(),
-                mobile_number=fields['mobile_number'].get().strip(),
-                email_address=fields['email_address'].get().strip().lower(),
-                password=fields['password'].get(),
-                college=fields['college'].get().strip(),
-                program=fields['program'].get().strip(),
-                year_level=fields['year_level'].get().strip(),
-                semester=fields['semester'].get().strip(),
-                school_year=fields['school_year'].get().strip(),
-                enrollment_status=fields['enrollment_status'].get().strip()
-            )
-            
+        def on_saved(success):
             if success:
                 messagebox.showinfo("Success", "Student added successfully!")
                 dialog.destroy()
                 self.populate_treeview_from_db()
             else:
                 messagebox.showerror("Error", "Failed to add student. Please try again.")
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        
+        # Get all field values
+        self.tasks.submit(
+            self.repositories.students.add,
+            student_number=fields['student_id'].get().strip(),
+            name=fields['name'].get().strip().upper(),
+            mobile_number=fields['mobile_number'].get().strip(),
+            email_address=fields['email_address'].get().strip().lower(),
+            password=fields['password'].get(),
+            college=fields['college'].get().strip(),
+            program=fields['program'].get().strip(),
+            year_level=fields['year_level'].get().strip(),
+            semester=fields['semester'].get().strip(),
+            school_year=fields['school_year'].get().strip(),
+            enrollment_status=fields['enrollment_status'].get().strip(),
+            on_success=on_saved,
+            on_error=show_task_error("An error occurred")
+        )
+
+    def on_search_changed(self, *args):
+        """Search once typing pauses for SEARCH_DEBOUNCE_MS."""
+        if self.search_after_id is not None:
+            self.after_cancel(self.search_after_id)
+        self.search_after_id = self.after(SEARCH_DEBOUNCE_MS, self.search_students)
 
     def search_students(self):
         """Search students based on the search entry text"""
-        search_text = self.search_var.get().strip().upper()
+        if self.search_after_id is not None:
+            self.after_cancel(self.search_after_id)
+            self.search_after_id = None
+        search_text = self.search_var.get().strip()
+        if not search_text:
+            self.populate_treeview_from_db()
+            return
         
-        # Clear the treeview
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.load_search_index()
+        if self.student_search is not None:
+            # Answered in memory, narrowing the previous matches while typing
+            self.show_search_results(self.student_search.search(search_text),
+                                     ('search', search_text))
+            self.student_gate.invalidate()
+            return
         
-        try:
-            # Get all students
-            students = fetch_student_data()
-            
-            # Filter and display matching students
-            for student in students:
-                student_id, name, mobile, email, year, term, college, program, school_year, status = student
-                
-                # Check if search text matches any field
-                if (search_text in str(student_id).upper() or
-                    search_text in str(name).upper() or
-                    search_text in str(mobile).upper() or
-                    search_text in str(email).upper() or
-                    search_text in str(college).upper() or
-                    search_text in str(program).upper() or
-                    search_text in str(status).upper()):
-                    
-                    self.tree.insert('', 'end', values=(
-                        student_id, name, mobile, email,
-                        year, term, college, program,
-                        school_year, status
-                    ))
-                    
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred while searching: {str(e)}")
+        # The full-text index answers until the in-memory index is ready.
+        # A newer search or page load supersedes this one.
+        view = ('search', search_text)
+        self.tasks.submit(self.student_gate.load, view,
+                          self.repositories.students.search, search_text, key='students',
+                          on_success=self.student_gate.deliver(
+                              lambda students: self.show_search_results(students, view)),
+                          on_error=show_task_error("An error occurred while searching"))
+    
+    def load_search_index(self):
+        """Rebuild the in-memory search index in the background if students changed."""
+        if self.index_loading:
+            return
+        
+        def on_done(result):
+            try:
+                deliver(result)
+            finally:
+                self.index_loading = False
+        
+        def on_failed(error):
+            self.index_loading = False
+            self.index_gate.invalidate()
+        
+        deliver = self.index_gate.deliver(self.set_search_index)
+        self.index_loading = True
+        self.tasks.submit(self.index_gate.load, (), load_search_index, self.repositories,
+                          on_success=on_done, on_error=on_failed)
+    
+    def set_search_index(self, index):
+        """Switch searches to a newly built index and rerun the current search."""
+        self.student_search = IncrementalSearch(index) if index is not None else None
+        if index is not None and self.search_var.get().strip():
+            self.search_students()
+    
+    def show_search_results(self, students, view=None):
+        """Replace the student list with search results."""
+        self.student_list.set_source(ListDataSource(students),
+                                     keep_position=view == self.shown_students)
+        self.shown_students = view
+
+    def student_filters(self):
+        """Filters selected for the student list."""
+        return {
+            'year_level': self.year_filter.get() or None,
+            'enrollment_status': self.status_filter.get() or None
+        }
 
     def populate_treeview_from_db(self):
-        """Populate the treeview with student data from the database"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
-        # Fetch and insert student data
-        students = fetch_student_data()
-        for student in students:
-            self.tree.insert('', 'end', values=student)
+        """Show all students in the virtual list; pages load as they scroll into view"""
+        filters = self.student_filters()
+        view = ('list', tuple(sorted(filters.items())))
+        self.tasks.submit(self.student_gate.load, view,
+                          self.repositories.students.count, **filters, key='students',
+                          on_success=self.student_gate.deliver(
+                              lambda total: self.show_student_pages(total, filters, view)),
+                          on_error=show_task_error("Failed to load students"))
+    
+    def show_student_pages(self, total, filters, view=None):
+        """Back the student list with keyset pages of the filtered students."""
+        def fetch_page(offset, limit, previous_row):
+            if previous_row is not None:
+                return self.repositories.students.page(after_id=previous_row[0], page_size=limit,
+                                                       **filters)
+            return self.repositories.students.page(page_size=limit, offset=offset, **filters)
+        
+        # Stay in place when the same view is reloaded because the data changed
+        self.student_list.set_source(
+            PagedDataSource(fetch_page, total, page_size=STUDENT_PAGE_SIZE, submit=self.tasks.submit),
+            keep_position=view == self.shown_students)
+        self.shown_students = view
 
     def show_edit_student_dialog(self):
         """Show dialog for editing student information."""
@@ -752,15 +906,18 @@ class RegistrarDashboardNew(ttk.Frame):
                 'enrollment_status': fields['enrollment_status'].get().strip()
             }
             
-            # Update in database
-            success = update_student_data(**student_data)
+            def on_saved(success):
+                if success:
+                    messagebox.showinfo("Success", "Student information updated successfully!")
+                    dialog.destroy()
+                    self.populate_treeview_from_db()
+                else:
+                    messagebox.showerror("Error", "Failed to update student information. Please try again.")
             
-            if success:
-                messagebox.showinfo("Success", "Student information updated successfully!")
-                dialog.destroy()
-                self.populate_treeview_from_db()
-            else:
-                messagebox.showerror("Error", "Failed to update student information. Please try again.")
+            # Update in database
+            self.tasks.submit(self.repositories.students.update, **student_data,
+                              on_success=on_saved,
+                              on_error=show_task_error("An error occurred"))
         
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
@@ -796,33 +953,25 @@ class RegistrarDashboardNew(ttk.Frame):
         tree_frame.pack(fill=tk.BOTH, expand=True)
         
         columns = ('Subject', 'Units', 'Rating', 'Final Grade', 'Status', 'Year Level', 'Semester')
-        self.grades_tree = ttk.Treeview(tree_frame, columns=columns, show='headings')
-        
-        # Configure columns
-        self.grades_tree.heading('Subject', text='Subject', anchor=tk.W)
-        self.grades_tree.heading('Units', text='Units', anchor=tk.CENTER)
-        self.grades_tree.heading('Rating', text='Rating', anchor=tk.CENTER)
-        self.grades_tree.heading('Final Grade', text='Final Grade', anchor=tk.CENTER)
-        self.grades_tree.heading('Status', text='Status', anchor=tk.CENTER)
-        self.grades_tree.heading('Year Level', text='Year Level', anchor=tk.CENTER)
-        self.grades_tree.heading('Semester', text='Semester', anchor=tk.CENTER)
         
         # Set column widths and alignment
-        self.grades_tree.column('Subject', width=200, anchor=tk.W)
-        self.grades_tree.column('Units', width=70, anchor=tk.CENTER)
-        self.grades_tree.column('Rating', width=70, anchor=tk.CENTER)
-        self.grades_tree.column('Final Grade', width=100, anchor=tk.CENTER)
-        self.grades_tree.column('Status', width=100, anchor=tk.CENTER)
-        self.grades_tree.column('Year Level', width=100, anchor=tk.CENTER)
-        self.grades_tree.column('Semester', width=100, anchor=tk.CENTER)
-        
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.grades_tree.yview)
-        self.grades_tree.configure(yscrollcommand=scrollbar.set)
-        
-        # Pack tree and scrollbar
-        self.grades_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        column_widths = {
+            'Subject': 200,
+            'Units': 70,
+            'Rating': 70,
+            'Final Grade': 100,
+            'Status': 100,
+            'Year Level': 100,
+            'Semester': 100
+        }
+        anchors = {col: tk.CENTER for col in columns}
+        anchors['Subject'] = tk.W
+        
+        self.grades_list = VirtualTreeview(tree_frame, columns, column_widths, anchors,
+                                           key=grade_key)
+        self.grades_list.pack(fill=tk.BOTH, expand=True)
+        self.grades_tree = self.grades_list.tree
+        self.grades_gate.invalidate()  # a new tree starts empty
         
         # Button frame
         btn_frame = ttk.Frame(main_frame)
@@ -878,8 +1027,7 @@ class RegistrarDashboardNew(ttk.Frame):
         
         # Rating
         ttk.Label(main_frame, text="Rating *").grid(row=row, column=0, sticky='w')
-        ratings = ['1.00', '1.25', '1.50', '1.75', '2.00', '2.25', '2.50', '2.75', '3.00', '5.00']
-        fields['rating'] = ttk.Combobox(main_frame, values=ratings, width=27, state='readonly')
+        fields['rating'] = ttk.Combobox(main_frame, values=RATING_SCALE, width=27, state='readonly')
         fields['rating'].grid(row=row, column=1, pady=5, sticky='w')
         
         def update_status(*args):
@@ -954,26 +1102,24 @@ class RegistrarDashboardNew(ttk.Frame):
         dialog.wait_window()
     
     def refresh_grades(self, student_id):
-        """Refresh the grades treeview."""
-        for item in self.grades_tree.get_children():
-            self.grades_tree.delete(item)
-        
-        grades = fetch_student_grades(student_id)
-        for grade in grades:
-            self.grades_tree.insert('', 'end', values=grade)
+        """Reload the grades treeview in the background if grades changed."""
+        self.tasks.submit(self.grades_gate.load, student_id,
+                          self.repositories.grades.for_student, student_id, key='grades',
+                          on_success=self.grades_gate.deliver(self.show_grades),
+                          on_error=show_task_error("Failed to load grades"))
+    
+    def show_grades(self, grades):
+        """Display loaded grades in the grades treeview."""
+        self.grades_list.set_source(ListDataSource(grades))
     
     def add_grade(self, student_id, fields, dialog):
         """Add a grade for the selected student."""
         values = {field: widget.get() for field, widget in fields.items()}
         
-        try:
-            # Get all field values
-            update_grade(
-                student_id, values['subject'],
-                float(values['rating']), int(values['units']),
-                values['final_grade'], values['status'],
-                1, 1  # TODO: Get current year and semester
-            )
+        def on_saved(result):
+            if not result:
+                messagebox.showerror("Error", "Failed to add grade. Please check the values.")
+                return
             messagebox.showinfo("Success", "Grade added successfully!")
             
             # Refresh grades display
@@ -985,8 +1131,16 @@ class RegistrarDashboardNew(ttk.Frame):
                     widget.delete(0, tk.END)
                 else:
                     widget.set('')
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to add grade: {str(e)}")
+        
+        self.tasks.submit(
+            self.repositories.grades.upsert,
+            student_id, values['subject'],
+            values['units'], values['rating'],
+            values['final_grade'], values['status'],
+            values['year_level'], values['semester'],
+            on_success=on_saved,
+            on_error=show_task_error("Failed to add grade")
+        )
     
     def update_grade(self, student_id, fields, dialog):
         """Update the selected grade."""
@@ -997,20 +1151,24 @@ class RegistrarDashboardNew(ttk.Frame):
         
         values = {field: widget.get() for field, widget in fields.items()}
         
-        try:
-            # Get all field values
-            update_grade(
-                student_id, values['subject'],
-                float(values['rating']), int(values['units']),
-                values['final_grade'], values['status'],
-                1, 1  # TODO: Get current year and semester
-            )
+        def on_saved(result):
+            if not result:
+                messagebox.showerror("Error", "Failed to update grade. Please check the values.")
+                return
             messagebox.showinfo("Success", "Grade updated successfully!")
             
             # Refresh grades display
             self.refresh_grades(student_id)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update grade: {str(e)}")
+        
+        self.tasks.submit(
+            self.repositories.grades.upsert,
+            student_id, values['subject'],
+            values['units'], values['rating'],
+            values['final_grade'], values['status'],
+            values['year_level'], values['semester'],
+            on_success=on_saved,
+            on_error=show_task_error("Failed to update grade")
+        )
     
     def delete_selected_grade(self, student_id):
         """Delete the selected grade."""
@@ -1021,22 +1179,26 @@ class RegistrarDashboardNew(ttk.Frame):
         
         grade_values = self.grades_tree.item(selected[0])['values']
         
+        def on_deleted(success):
+            if not success:
+                messagebox.showerror("Error", "Failed to delete grade. Please try again.")
+                return
+            messagebox.showinfo("Success", "Grade deleted successfully!")
+            
+            # Refresh grades display
+            self.refresh_grades(student_id)
+        
         if messagebox.askyesno("Confirm Delete", 
                              f"Are you sure you want to delete this grade?\n\nSubject: {grade_values[0]}\nYear Level: {grade_values[5]}\nSemester: {grade_values[6]}"):
-            try:
-                delete_grade(
-                    student_id=student_id,
-                    subject=grade_values[0],
-                    year_level=grade_values[5],
-                    semester=grade_values[6]
-                )
-                
-                messagebox.showinfo("Success", "Grade deleted successfully!")
-                
-                # Refresh grades display
-                self.refresh_grades(student_id)
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete grade: {str(e)}")
+            self.tasks.submit(
+                self.repositories.grades.delete,
+                student_id=student_id,
+                subject=grade_values[0],
+                year_level=grade_values[5],
+                semester=grade_values[6],
+                on_success=on_deleted,
+                on_error=show_task_error("Failed to delete grade")
+            )
 
     def delete_student(self):
         """Delete selected student."""
@@ -1048,11 +1210,176 @@ class RegistrarDashboardNew(ttk.Frame):
         
         student_id = self.tree.item(selected[0])['values'][0]
         
+        def on_deleted(success):
+            if not success:
+                messagebox.showerror("Error", "Failed to delete student. Please try again.")
+                return
+            messagebox.showinfo("Success", "Student deleted successfully!")
+            self.populate_treeview_from_db()
+        
         if messagebox.askyesno("Confirm Delete", 
                              "Are you sure you want to delete this student?"):
+            self.tasks.submit(self.repositories.students.delete, student_id,
+                              on_success=on_deleted,
+                              on_error=show_task_error("Failed to delete student"))
+
+    def show_rankings_dialog(self):
+        """Show class rankings, honors cut-offs and percentiles."""
+        dialog = tk.Toplevel(self)
+        dialog.title("Class Rankings")
+        dialog.geometry("800x600")
+        
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Cohort filters
+        filter_frame = ttk.Frame(main_frame)
+        filter_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        filters = {}
+        for label, name, values, width in (
+                ("Program:", 'program', [''], 30),
+                ("Year:", 'year_level', ['', '1', '2', '3', '4', '5'], 5),
+                ("School Year:", 'school_year', [''], 12)):
+            ttk.Label(filter_frame, text=label).pack(side=tk.LEFT, padx=(0, 5))
+            filters[name] = ttk.Combobox(filter_frame, values=values, width=width, state='readonly')
+            filters[name].pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Label(filter_frame, text="Top:").pack(side=tk.LEFT, padx=(0, 5))
+        limit_var = tk.StringVar(value='10')
+        ttk.Spinbox(filter_frame, from_=1, to=1000, textvariable=limit_var, width=5).pack(side=tk.LEFT)
+        
+        # Ranked students
+        columns = ('Rank', 'ID', 'Name', 'Program', 'Year', 'School Year', 'GWA', 'Units')
+        column_widths = {'Rank': 50, 'ID': 100, 'Name': 200, 'Program': 150,
+                         'Year': 50, 'School Year': 100, 'GWA': 70, 'Units': 60}
+        ranking_list = VirtualTreeview(main_frame, columns, column_widths, height=15,
+                                       key=lambda row: row[1])
+        ranking_list.pack(fill=tk.BOTH, expand=True)
+        
+        honors_label = ttk.Label(main_frame, text="")
+        honors_label.pack(fill=tk.X, pady=(10, 0))
+        
+        # Percentile of one student within the same cohort
+        percentile_frame = ttk.Frame(main_frame)
+        percentile_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Label(percentile_frame, text="Student ID:").pack(side=tk.LEFT, padx=(0, 5))
+        student_entry = ttk.Entry(percentile_frame, width=15)
+        student_entry.pack(side=tk.LEFT)
+        percentile_label = ttk.Label(percentile_frame, text="")
+        
+        def cohort():
+            return {name: widget.get() or None for name, widget in filters.items()}
+        
+        def show_filter_values(values):
+            filters['program']['values'] = [''] + values['program']
+            filters['school_year']['values'] = [''] + values['school_year']
+        
+        def show_cutoffs(cutoffs):
+            honors_label.config(text="Honors cut-offs:  " + "   ".join(
+                f"Top {percent}%: {cutoff:.2f} ({students} students)"
+                for percent, cutoff, students in cutoffs if cutoff is not None)
+                or "No ranked students")
+        
+        def load_rankings():
             try:
-                delete_student(student_id)
-                messagebox.showinfo("Success", "Student deleted successfully!")
-                self.populate_treeview_from_db()
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete student: {str(e)}")
+                limit = max(1, int(limit_var.get()))
+            except ValueError:
+                limit = 10
+            self.tasks.submit(self.repositories.grades.top_students, limit, **cohort(),
+                              key='rankings',
+                              on_success=lambda rows: ranking_list.set_source(ListDataSource(rows)),
+                              on_error=show_task_error("Failed to load rankings"))
+            self.tasks.submit(self.repositories.grades.honors_cutoffs, **cohort(), key='honors',
+                              on_success=show_cutoffs,
+                              on_error=show_task_error("Failed to load honors cut-offs"))
+        
+        def show_percentile(result):
+            if result is None:
+                percentile_label.config(text="Student is not ranked in this cohort")
+            else:
+                rank, cohort_size, percentile = result
+                percentile_label.config(
+                    text=f"Rank {rank} of {cohort_size}, {percentile:.2f} percentile")
+        
+        def find_percentile():
+            student_id = student_entry.get().strip()
+            if student_id:
+                self.tasks.submit(self.repositories.grades.student_percentile, student_id,
+                                  **cohort(), key='percentile',
+                                  on_success=show_percentile,
+                                  on_error=show_task_error("Failed to rank student"))
+        
+        ttk.Button(percentile_frame, text="Find Percentile",
+                   command=find_percentile).pack(side=tk.LEFT, padx=5)
+        percentile_label.pack(side=tk.LEFT, padx=10)
+        
+        for widget in filters.values():
+            widget.bind('<<ComboboxSelected>>', lambda e: load_rankings())
+        
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(btn_frame, text="Show", command=load_rankings).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Close", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
+        
+        self.tasks.submit(self.repositories.grades.ranking_filter_values,
+                          on_success=show_filter_values,
+                          on_error=show_task_error("Failed to load ranking filters"))
+        load_rankings()
+        dialog.transient(self)
+
+    def show_grade_report_dialog(self):
+        """Show rating statistics and histograms per subject and term."""
+        dialog = tk.Toplevel(self)
+        dialog.title("Grade Distribution Report")
+        dialog.geometry("1100x600")
+        
+        main_frame = ttk.Frame(dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        filter_frame = ttk.Frame(main_frame)
+        filter_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Label(filter_frame, text="Year Level:").pack(side=tk.LEFT, padx=(0, 5))
+        year_filter = ttk.Combobox(filter_frame, values=['', '1', '2', '3', '4', '5'],
+                                   width=5, state='readonly')
+        year_filter.pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(filter_frame, text="Semester:").pack(side=tk.LEFT, padx=(0, 5))
+        semester_filter = ttk.Combobox(filter_frame, values=['', '1', '2', '3'],
+                                       width=5, state='readonly')
+        semester_filter.pack(side=tk.LEFT)
+        
+        # One histogram column per rating on the grading scale
+        columns = ('Subject', 'Year', 'Sem', 'Count', 'Mean', 'Median', 'Pass Rate') + RATING_SCALE
+        column_widths = {'Subject': 200, 'Year': 45, 'Sem': 45, 'Count': 55, 'Mean': 55,
+                         'Median': 60, 'Pass Rate': 70}
+        column_widths.update({rating: 45 for rating in RATING_SCALE})
+        anchors = {column: tk.CENTER for column in columns}
+        anchors['Subject'] = tk.W
+        report_list = VirtualTreeview(main_frame, columns, column_widths, anchors, height=20,
+                                      key=lambda row: f"{row[0]}|{row[1]}|{row[2]}")
+        report_list.pack(fill=tk.BOTH, expand=True)
+        
+        def show_statistics(statistics):
+            rows = [(row['subject'], row['year_level'], row['semester'], row['count'],
+                     f"{row['mean']:.2f}", f"{row['median']:.2f}", f"{row['pass_rate']:.0%}",
+                     *(row['histogram'][rating] for rating in RATING_SCALE))
+                    for row in statistics]
+            report_list.set_source(ListDataSource(rows))
+        
+        def load_statistics():
+            self.tasks.submit(self.repositories.grades.subject_statistics,
+                              year_level=year_filter.get() or None,
+                              semester=semester_filter.get() or None, key='grade_report',
+                              on_success=show_statistics,
+                              on_error=show_task_error("Failed to load grade report"))
+        
+        year_filter.bind('<<ComboboxSelected>>', lambda e: load_statistics())
+        semester_filter.bind('<<ComboboxSelected>>', lambda e: load_statistics())
+        
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(btn_frame, text="Refresh", command=load_statistics).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Close", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
+        
+        load_statistics()
+        dialog.transient(self)
@@ -3,6 +3,7 @@ UI components and styles for the Grade Evaluation System.
 """
 
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import ttk
 
 # Color scheme
@@ -137,3 +138,301 @@ def create_treeview(parent, columns, show='headings'):
     parent.grid_rowconfigure(0, weight=1)
     
     return tree
+
+class ListDataSource:
+    """In-memory rows for a VirtualTreeview."""
+    
+    def __init__(self, rows=()):
+        self._rows = list(rows)
+        self.on_loaded = None
+    
+    def __len__(self):
+        return len(self._rows)
+    
+    def get_rows(self, start, stop):
+        """Return the rows in [start, stop)."""
+        return self._rows[max(start, 0):stop]
+    
+    def prefetch(self, start, stop):
+        """Nothing to prefetch; every row is already in memory."""
+
+class PagedDataSource:
+    """Rows for a VirtualTreeview fetched in fixed-size pages on demand.
+    
+    fetch_page(offset, limit, previous_row) returns up to limit rows starting
+    at offset. previous_row is the row just before offset when its page is
+    cached, so the fetch can seek by key instead of skipping offset rows.
+    Only the max_pages most recently used pages are kept.
+    
+    When submit (e.g. BackgroundTasks.submit) is given, pages load in the
+    background: missing rows come back as None and on_loaded is called once
+    the page arrives.
+    """
+    
+    def __init__(self, fetch_page, total, page_size=100, max_pages=10, submit=None):
+        self.fetch_page = fetch_page
+        self.total = total
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.submit = submit
+        self.on_loaded = None
+        self._pages = OrderedDict()
+        self._loading = set()
+    
+    def __len__(self):
+        return self.total
+    
+    def get_rows(self, start, stop):
+        """Return the rows in [start, stop), with None for rows still loading."""
+        start, stop = max(start, 0), min(stop, self.total)
+        rows = []
+        if stop <= start:
+            return rows
+        for index in range(start // self.page_size, (stop - 1) // self.page_size + 1):
+            page = self._page(index)
+            page_start = index * self.page_size
+            lo = max(start, page_start) - page_start
+            hi = min(stop, page_start + self.page_size) - page_start
+            if page is None:
+                rows.extend([None] * (hi - lo))
+            else:
+                rows.extend(page[lo:hi])
+                rows.extend([None] * (hi - lo - len(page[lo:hi])))
+        return rows
+    
+    def prefetch(self, start, stop):
+        """Start loading the pages covering [start, stop) without returning them."""
+        start, stop = max(start, 0), min(stop, self.total)
+        if stop > start:
+            for index in range(start // self.page_size, (stop - 1) // self.page_size + 1):
+                self._page(index)
+    
+    def _page(self, index):
+        if index in self._pages:
+            self._pages.move_to_end(index)
+            return self._pages[index]
+        
+        previous_page = self._pages.get(index - 1)
+        previous_row = previous_page[-1] if previous_page else None
+        args = (index * self.page_size, self.page_size, previous_row)
+        if self.submit is None:
+            return self._store(index, self.fetch_page(*args))
+        
+        if index not in self._loading:
+            self._loading.add(index)
+            self.submit(self.fetch_page, *args,
+                        on_success=lambda rows: self._loaded(index, rows),
+                        on_error=lambda e: self._loading.discard(index))
+        return None
+    
+    def _store(self, index, rows):
+        self._pages[index] = rows
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return rows
+    
+    def _loaded(self, index, rows):
+        self._loading.discard(index)
+        self._store(index, rows)
+        if self.on_loaded is not None:
+            self.on_loaded()
+
+class TreeviewReconciler:
+    """Keep a Treeview in sync with a keyed list of rows by applying only the delta.
+    
+    The reconciler remembers the item IDs and values it last applied, so a
+    refresh costs Tk calls only for rows that were added, removed, moved or
+    changed, and selection and scroll position survive the refresh.
+    """
+    
+    def __init__(self, tree):
+        self.tree = tree
+        self._order = []
+        self._values = {}
+    
+    def reset(self):
+        """Forget the applied state, e.g. after the tree was cleared elsewhere."""
+        self._order = []
+        self._values = {}
+    
+    def apply(self, items):
+        """Make the tree show the (item_id, values) pairs in order.
+        
+        Returns the number of Tk calls made.
+        """
+        desired = []
+        desired_values = {}
+        for iid, values in items:
+            if iid not in desired_values:
+                desired.append(iid)
+                desired_values[iid] = tuple(values)
+        
+        calls = 0
+        stale = [iid for iid in self._order if iid not in desired_values]
+        if stale:
+            self.tree.delete(*stale)
+            calls += 1
+        
+        # Walk the desired order against the surviving items. Everything
+        # before index is already in place, so an item that is not next in
+        # line gets moved up to index.
+        current = [iid for iid in self._order if iid in desired_values]
+        moved = set()
+        next_current = 0
+        for index, iid in enumerate(desired):
+            while next_current < len(current) and current[next_current] in moved:
+                next_current += 1
+            values = desired_values[iid]
+            if iid not in self._values:
+                self.tree.insert('', index, iid=iid, values=values)
+                calls += 1
+                continue
+            if next_current < len(current) and current[next_current] == iid:
+                next_current += 1
+            else:
+                self.tree.move(iid, '', index)
+                moved.add(iid)
+                calls += 1
+            if self._values[iid] != values:
+                self.tree.item(iid, values=values)
+                calls += 1
+        
+        self._order = desired
+        self._values = desired_values
+        return calls
+
+class VirtualTreeview(ttk.Frame):
+    """A Treeview that only holds the rows currently in view.
+    
+    Rows come from a data source (ListDataSource or PagedDataSource). The
+    scrollbar is driven by the source length, and only the rows in the
+    visible viewport are inserted into the Treeview; a buffer of rows on
+    either side is prefetched so scrolling does not wait on the source.
+    Item IDs are the row keys, so selection() and item() work as on a plain
+    Treeview. Rows are applied through a TreeviewReconciler, so scrolling
+    by one row or refreshing an unchanged view costs only the delta.
+    """
+    
+    def __init__(self, parent, columns, column_widths=None, anchors=None,
+                 height=10, buffer=None, key=None):
+        super().__init__(parent)
+        self.key = key or (lambda row: row[0])
+        self.visible_rows = height
+        self.buffer = height if buffer is None else buffer
+        self.first = 0
+        self.source = ListDataSource()
+        
+        self.tree = ttk.Treeview(self, columns=columns, show='headings', height=height)
+        self.reconciler = TreeviewReconciler(self.tree)
+        for col in columns:
+            anchor = (anchors or {}).get(col)
+            self.tree.heading(col, text=col, anchor=anchor or tk.CENTER)
+            self.tree.column(col, width=(column_widths or {}).get(col, 100), anchor=anchor or tk.W)
+        
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        self.tree.bind('<Button-4>', lambda e: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll(3))
+    
+    def item_id(self, row):
+        """Treeview item ID for a row."""
+        return str(self.key(row))
+    
+    def set_source(self, source, keep_position=False):
+        """Show rows from a new data source."""
+        if self.source is not source:
+            self.source.on_loaded = None
+        self.source = source
+        source.on_loaded = self.render
+        if not keep_position:
+            self.first = 0
+        self.render()
+    
+    def render(self):
+        """Materialize the rows in the current viewport."""
+        total = len(self.source)
+        self.first = max(0, min(self.first, total - self.visible_rows))
+        stop = self.first + self.visible_rows
+        rows = self.source.get_rows(self.first, stop)
+        self.source.prefetch(self.first - self.buffer, stop + self.buffer)
+        
+        self.reconciler.apply(
+            (f"loading-{self.first + offset}", ("Loading...",)) if row is None
+            else (self.item_id(row), row)
+            for offset, row in enumerate(rows)
+        )
+        
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, stop / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def scroll(self, rows):
+        """Scroll the viewport by a number of rows."""
+        self.first += rows
+        self.render()
+    
+    def yview(self, *args):
+        """Scrollbar command handler ('moveto' and 'scroll')."""
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.source))
+            self.render()
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            self.scroll(amount * self.visible_rows if args[2] == 'pages' else amount)
+    
+    def on_resize(self, event):
+        """Recompute how many rows fit when the Treeview is resized."""
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        visible_rows = max(1, (event.height - row_height) // row_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render()
+
+class AutoRefresh:
+    """Call a refresh function every interval milliseconds while enabled.
+    
+    The schedule lives on the widget's after() queue, so the callback runs
+    on the Tk thread and the loop stops by itself once the widget is gone.
+    """
+    
+    def __init__(self, widget, callback, interval=5000):
+        self.widget = widget
+        self.callback = callback
+        self.interval = interval
+        self._after_id = None
+    
+    @property
+    def running(self):
+        return self._after_id is not None
+    
+    def start(self):
+        """Start (or restart) the periodic refresh."""
+        self.stop()
+        self._schedule()
+    
+    def stop(self):
+        """Cancel the pending refresh, if any."""
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+    
+    def _schedule(self):
+        try:
+            self._after_id = self.widget.after(self.interval, self._tick)
+        except tk.TclError:
+            self._after_id = None
+    
+    def _tick(self):
+        self._after_id = None
+        try:
+            self.callback()
+        finally:
+            self._schedule()
@@ -4,4 +4,6 @@ Utility functions for the Grade Evaluation System.
 
 from . import form_utilities
 from . import logger
+from . import metrics
+from . import passwords
 from . import validation
@@ -1,39 +1,101 @@
 """
 Logging configuration for the Grade Evaluation System.
+
+Log calls only put the unformatted record on a queue. A background
+listener thread formats it, including any traceback, and writes it to the
+console and a rotating log file, so the UI thread never formats messages
+or waits on disk I/O. Messages use %-style arguments, which are only
+formatted when the record is actually emitted. Because formatting happens
+later, arguments should not be mutated right after the log call.
+
+Environment settings:
+    GESYS_LOG_LEVEL      DEBUG, INFO (default), WARNING or ERROR
+    GESYS_LOG_DIR        directory for app.log (default: logs)
+    GESYS_LOG_ROTATION   'size' (default) or 'daily'
+    GESYS_LOG_MAX_BYTES  size at which app.log is rotated (default: 5 MB)
+    GESYS_LOG_BACKUPS    rotated files to keep (default: 5)
 """
 
+import atexit
 import logging
 import os
-from datetime import datetime
+import queue
+from logging.handlers import (
+    QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+)
+
+LOG_FORMAT = '%(asctime)s [%(levelname)s] %(module)s: %(message)s'
+LOG_LEVEL = os.environ.get('GESYS_LOG_LEVEL', 'INFO')
+LOG_DIR = os.environ.get('GESYS_LOG_DIR', 'logs')
+LOG_ROTATION = os.environ.get('GESYS_LOG_ROTATION', 'size')
+LOG_MAX_BYTES = int(os.environ.get('GESYS_LOG_MAX_BYTES', 5 * 1024 * 1024))
+LOG_BACKUPS = int(os.environ.get('GESYS_LOG_BACKUPS', 5))
+
+_listener = None
+_queue_handler = None
+
+class DeferredQueueHandler(QueueHandler):
+    """A QueueHandler that leaves formatting to the listener thread.
+
+    QueueHandler.prepare() formats the message and traceback on the
+    calling thread so records can be pickled; ours never leave the
+    process, so they are enqueued as they are.
+    """
+
+    def prepare(self, record):
+        return record
+
+def parse_level(name, default=logging.INFO):
+    """Convert a level name such as 'debug' to its number, or return default."""
+    level = logging.getLevelName(str(name).strip().upper())
+    return level if isinstance(level, int) else default
+
+def _file_handler(log_dir):
+    """The rotating handler for log_dir/app.log."""
+    path = os.path.join(log_dir, 'app.log')
+    if LOG_ROTATION.lower() == 'daily':
+        return TimedRotatingFileHandler(path, when='midnight', backupCount=LOG_BACKUPS,
+                                        encoding='utf-8', delay=True)
+    return RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS,
+                               encoding='utf-8', delay=True)
 
 def setup_logger():
     """Configure and return the application logger."""
-    # Create logs directory if it doesn't exist
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-
-    # Configure logging
+    global _listener, _queue_handler
     logger = logging.getLogger('GradeEvaluationSystem')
-    logger.setLevel(logging.DEBUG)
+    if _listener is not None:
+        return logger
+    logger.setLevel(parse_level(LOG_LEVEL))
 
-    # Create handlers
-    file_handler = logging.FileHandler(
-        f'logs/app_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
-    )
-    console_handler = logging.StreamHandler()
+    # Create logs directory if it doesn't exist
+    os.makedirs(LOG_DIR, exist_ok=True)
 
-    # Create formatters and add it to handlers
-    log_format = logging.Formatter(
-        '%(asctime)s [%(levelname)s] %(module)s: %(message)s'
-    )
+    # Create handlers; they run on the listener thread
+    log_format = logging.Formatter(LOG_FORMAT)
+    file_handler = _file_handler(LOG_DIR)
+    console_handler = logging.StreamHandler()
     file_handler.setFormatter(log_format)
     console_handler.setFormatter(log_format)
 
-    # Add handlers to the logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-
+    # The logger itself only enqueues records
+    log_queue = queue.SimpleQueue()
+    _queue_handler = DeferredQueueHandler(log_queue)
+    logger.addHandler(_queue_handler)
+    _listener = QueueListener(log_queue, file_handler, console_handler,
+                              respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logger)
     return logger
 
+def shutdown_logger():
+    """Detach the queue, write out the queued records and stop the listener thread."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger('GradeEvaluationSystem').removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 # Create and export logger instance
 logger = setup_logger()
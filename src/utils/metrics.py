@@ -0,0 +1,53 @@
+"""
+Latency metrics shared by the grade service and the login throttle.
+"""
+
+import threading
+from collections import deque
+
+LATENCY_WINDOW = 1000  # recent calls kept per name for percentiles
+
+class LatencyMetrics:
+    """Call counts, errors and latency percentiles per name (operation, outcome)."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self._operations = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, ok=True):
+        with self._lock:
+            stats = self._operations.get(name)
+            if stats is None:
+                stats = self._operations[name] = {
+                    'count': 0, 'errors': 0, 'total': 0.0, 'max': 0.0,
+                    'recent': deque(maxlen=self.window),
+                }
+            stats['count'] += 1
+            stats['errors'] += not ok
+            stats['total'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+            stats['recent'].append(seconds)
+
+    def snapshot(self):
+        """Per-name counters with latencies in milliseconds."""
+        result = {}
+        with self._lock:
+            operations = [(name, dict(stats, recent=sorted(stats['recent'])))
+                          for name, stats in self._operations.items()]
+        for name, stats in operations:
+            recent = stats['recent']
+
+            def percentile(p):
+                return round(recent[min(len(recent) - 1, int(len(recent) * p))] * 1000, 3)
+
+            result[name] = {
+                'count': stats['count'],
+                'errors': stats['errors'],
+                'mean_ms': round(stats['total'] / stats['count'] * 1000, 3),
+                'p50_ms': percentile(0.50),
+                'p95_ms': percentile(0.95),
+                'p99_ms': percentile(0.99),
+                'max_ms': round(stats['max'] * 1000, 3),
+            }
+        return result
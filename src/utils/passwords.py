@@ -0,0 +1,128 @@
+"""
+Password hashing for the Grade Evaluation System.
+
+Passwords are stored as salted key-derivation hashes:
+    scrypt$<n>$<r>$<p>$<salt>$<hash>
+    pbkdf2_sha256$<iterations>$<salt>$<hash>
+with base64 salt and hash. The cost is read from the environment
+(GESYS_PASSWORD_SCHEME, GESYS_SCRYPT_N/R/P, GESYS_PBKDF2_ITERATIONS), so it
+can be raised as hardware gets faster: needs_rehash() flags hashes made
+with another scheme or cost, and plaintext passwords from older databases, for
+upgrade at the next login. A hash takes around 100 ms, so callers on the
+Tk thread must run it on a worker.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+SCRYPT = 'scrypt'
+PBKDF2 = 'pbkdf2_sha256'
+
+PASSWORD_SCHEME = os.environ.get('GESYS_PASSWORD_SCHEME',
+                                 SCRYPT if hasattr(hashlib, 'scrypt') else PBKDF2)
+SCRYPT_N = int(os.environ.get('GESYS_SCRYPT_N', 2 ** 15))
+SCRYPT_R = int(os.environ.get('GESYS_SCRYPT_R', 8))
+SCRYPT_P = int(os.environ.get('GESYS_SCRYPT_P', 1))
+PBKDF2_ITERATIONS = int(os.environ.get('GESYS_PBKDF2_ITERATIONS', 600000))
+
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii')
+
+def _scrypt(password, salt, n, r, p):
+    # scrypt needs 128 * n * r bytes; allow twice that over OpenSSL's 32 MB default
+    return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r, dklen=HASH_BYTES)
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations, HASH_BYTES)
+
+def _parse(stored):
+    """(scheme, cost parameters, salt, hash) of a stored hash, or None if it is not one."""
+    parts = str(stored).split('$')
+    try:
+        if parts[0] == SCRYPT and len(parts) == 6:
+            params = tuple(int(value) for value in parts[1:4])
+        elif parts[0] == PBKDF2 and len(parts) == 4:
+            params = (int(parts[1]),)
+        else:
+            return None
+        return parts[0], params, base64.b64decode(parts[-2]), base64.b64decode(parts[-1])
+    except ValueError:
+        return None
+
+def current_cost(scheme=None):
+    """The configured cost parameters of a scheme."""
+    scheme = scheme or PASSWORD_SCHEME
+    if scheme == SCRYPT:
+        return SCRYPT_N, SCRYPT_R, SCRYPT_P
+    if scheme == PBKDF2:
+        return (PBKDF2_ITERATIONS,)
+    raise ValueError(f"Unknown password scheme: {scheme}")
+
+def hash_password(password, scheme=None, cost=None):
+    """Hash a password with a fresh salt, by default at the configured cost."""
+    scheme = scheme or PASSWORD_SCHEME
+    cost = tuple(cost or current_cost(scheme))
+    salt = os.urandom(SALT_BYTES)
+    if scheme == SCRYPT:
+        derived = _scrypt(password, salt, *cost)
+    else:
+        derived = _pbkdf2(password, salt, *cost)
+    return '$'.join([scheme, *(str(value) for value in cost), _b64(salt), _b64(derived)])
+
+def is_hashed(stored):
+    """Whether a stored password is a hash rather than legacy plaintext."""
+    return _parse(stored) is not None
+
+def verify_password(password, stored):
+    """Check a password against a stored hash (or legacy plaintext) in constant time."""
+    if stored is None or password is None:
+        return False
+    parsed = _parse(stored)
+    if parsed is None:
+        return hmac.compare_digest(str(stored).encode('utf-8'), str(password).encode('utf-8'))
+    scheme, cost, salt, expected = parsed
+    try:
+        if scheme == SCRYPT:
+            derived = _scrypt(password, salt, *cost)
+        else:
+            derived = _pbkdf2(password, salt, *cost)
+    except (ValueError, MemoryError):
+        return False
+    return hmac.compare_digest(derived, expected)
+
+def needs_rehash(stored):
+    """Whether a stored password is plaintext or hashed other than currently configured."""
+    parsed = _parse(stored)
+    return parsed is None or parsed[0] != PASSWORD_SCHEME or parsed[1] != current_cost()
+
+# Verified against when an account does not exist, so a login for an unknown
+# ID takes as long as one with a wrong password
+_DUMMY_HASH = None
+
+def dummy_verify(password):
+    """Spend one verification's time on a password that cannot match."""
+    global _DUMMY_HASH
+    if _DUMMY_HASH is None:
+        _DUMMY_HASH = hash_password(_b64(os.urandom(SALT_BYTES)))
+    verify_password(password, _DUMMY_HASH)
+    return False
+
+def hash_passwords(passwords, workers=None, parallel_threshold=8):
+    """Hash many passwords, across a process pool when there are enough of them.
+
+    Returns the hashes in the same order. Used by bulk imports and the
+    rehash tool.
+    """
+    passwords = list(passwords)
+    if len(passwords) < parallel_threshold or workers == 1:
+        return [hash_password(password) for password in passwords]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(passwords) // ((workers or os.cpu_count() or 1) * 4))
+        return list(pool.map(hash_password, passwords, chunksize=chunksize))
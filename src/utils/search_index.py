@@ -0,0 +1,102 @@
+"""
+In-memory word-prefix search over student rows for the Grade Evaluation System.
+
+Matches the semantics of the students_fts index: text is split into words,
+and a row matches when every query word is a prefix of some word in one of
+the searchable columns, case-insensitively.
+"""
+
+import re
+from bisect import bisect_left
+
+# Columns of a fetch_student_data() row covered by students_fts
+SEARCH_COLUMNS = (0, 1, 2, 3, 6, 7, 9)
+
+_WORD = re.compile(r'[^\W_]+')
+
+def tokenize(text):
+    """Split text into lowercase words the way the FTS tokenizer does."""
+    return _WORD.findall(str(text).lower())
+
+def extends(words, previous):
+    """Whether a query only narrows a previous one.
+
+    True when every previous word is a prefix of the word in the same
+    position, so the new matches are a subset of the previous matches.
+    """
+    if len(words) < len(previous):
+        return False
+    return all(word.startswith(old) for word, old in zip(words, previous))
+
+class StudentSearchIndex:
+    """Sorted word list with postings, searched by prefix with bisect."""
+
+    def __init__(self, rows, columns=SEARCH_COLUMNS):
+        self.rows = list(rows)
+        postings = {}
+        for position, row in enumerate(self.rows):
+            for column in columns:
+                value = row[column]
+                if value is None:
+                    continue
+                for word in tokenize(value):
+                    postings.setdefault(word, set()).add(position)
+        self._words = sorted(postings)
+        self._postings = [postings[word] for word in self._words]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _positions(self, prefix):
+        """Positions of the rows containing a word that starts with prefix."""
+        start = bisect_left(self._words, prefix)
+        stop = bisect_left(self._words, prefix + '\U0010ffff', start)
+        if stop - start == 1:
+            return self._postings[start]
+        return set().union(*self._postings[start:stop])
+
+    def positions(self, words, within=None):
+        """Positions of the rows matching every word, optionally within a subset."""
+        matches = set(within) if within is not None else None
+        # Longer words are more selective, so they shrink the set first
+        for word in sorted(set(words), key=len, reverse=True):
+            found = self._positions(word)
+            matches = set(found) if matches is None else matches.intersection(found)
+            if not matches:
+                break
+        return sorted(matches) if matches else []
+
+    def search(self, query):
+        """Return the rows matching a free-text query, in load order."""
+        words = tokenize(query)
+        if not words:
+            return []
+        return [self.rows[position] for position in self.positions(words)]
+
+class IncrementalSearch:
+    """Answer successive queries against an index, narrowing when possible.
+
+    While the user keeps typing, each query usually extends the previous
+    one; its matches are then looked up only among the previous matches.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self._previous = None
+
+    def search(self, query):
+        words = tokenize(query)
+        if not words:
+            self._previous = None
+            return []
+        if self._previous is not None and extends(words, self._previous[0]):
+            # The previous matches already satisfy the unchanged words
+            previous_words, previous_positions = self._previous
+            changed = [word for i, word in enumerate(words)
+                       if i >= len(previous_words) or word != previous_words[i]]
+            positions = (self.index.positions(changed, previous_positions)
+                         if changed else previous_positions)
+        else:
+            positions = self.index.positions(words)
+        self._previous = (words, positions)
+        return [self.index.rows[position] for position in positions]
@@ -0,0 +1,22 @@
+"""
+Shared fixtures for the Grade Evaluation System tests.
+"""
+
+import os
+import pytest
+
+# Cheap password hashes keep fixtures fast; set before src reads its settings
+os.environ.setdefault('GESYS_SCRYPT_N', '1024')
+os.environ.setdefault('GESYS_PBKDF2_ITERATIONS', '1000')
+
+from src.database.connection_pool import configure_pool
+from src.database.init_database import init_db
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Initialize a fresh database and point the connection pool at it."""
+    db_path = str(tmp_path / 'test_gesys.db')
+    init_db(db_path)
+    pool = configure_pool(db_path)
+    yield db_path
+    pool.close()
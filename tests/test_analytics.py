@@ -0,0 +1,83 @@
+"""
+Tests for the batch GWA and academic standing engine.
+"""
+
+import pytest
+from src.analytics import columns as grade_columns
+from src.analytics.columns import grade_columns_from_rows, load_grade_columns
+from src.analytics.standing import (
+    STANDING_DEANS_LIST, STANDING_GOOD, STANDING_PROBATION, academic_standing
+)
+from src.database import database_operations as db
+from src.database.connection_pool import configure_pool
+
+ROWS = [
+    # Dean's List: 18 units, GWA 1.5, nothing below 2.50
+    *[('A', '1', '1', 3, '1.50', False) for _ in range(6)],
+    # Probation by failed share: 3 of 9 units failed
+    ('B', '1', '1', 3, '2.00', False),
+    ('B', '1', '1', 3, '2.00', False),
+    ('B', '1', '1', 3, '5.00', True),
+    # Good standing, and a second term
+    ('C', '1', '1', 3, '2.25', False),
+    ('C', '1', '2', 2, '1.00', False),
+    ('C', '1', '2', 3, 'INC', False),
+]
+
+def by_student(results):
+    return {row['student_id']: row for row in results}
+
+@pytest.fixture(params=[False, True], ids=['python', 'numpy'])
+def use_numpy(request):
+    if request.param and not grade_columns.HAVE_NUMPY:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+def test_standing_per_student(use_numpy):
+    columns = grade_columns_from_rows(ROWS, use_numpy)
+    assert columns.is_numpy == use_numpy
+    assert len(columns) == len(ROWS) - 1  # the ungraded row is skipped
+
+    results = by_student(academic_standing(columns))
+    assert results['A']['gwa'] == 1.5
+    assert results['A']['standing'] == STANDING_DEANS_LIST
+    assert results['B']['standing'] == STANDING_PROBATION
+    assert results['B']['failed_units'] == 3
+    assert results['C']['gwa'] == pytest.approx(1.75)
+    assert results['C']['standing'] == STANDING_GOOD  # too few units for the Dean's List
+
+def test_standing_per_term(use_numpy):
+    results = academic_standing(grade_columns_from_rows(ROWS, use_numpy), by_term=True)
+    terms = {(row['student_id'], row['year_level'], row['semester']): row for row in results}
+
+    assert sorted(terms) == [('A', '1', '1'), ('B', '1', '1'), ('C', '1', '1'), ('C', '1', '2')]
+    assert terms[('C', '1', '2')]['gwa'] == 1.0
+    assert terms[('C', '1', '2')]['units'] == 2
+
+def test_numpy_and_python_paths_agree():
+    if not grade_columns.HAVE_NUMPY:
+        pytest.skip("NumPy is not installed")
+    rows = [(f"S{n % 97}", str(n % 4 + 1), str(n % 2 + 1), n % 3 + 1,
+             f"{1 + (n * 7 % 17) * 0.25:.2f}", n % 23 == 0)
+            for n in range(5000)]
+    for by_term in (False, True):
+        expected = academic_standing(grade_columns_from_rows(rows, False), by_term)
+        actual = academic_standing(grade_columns_from_rows(rows, True), by_term)
+        key = lambda row: (row['student_id'], row.get('year_level'), row.get('semester'))
+        assert sorted(actual, key=key) == sorted(expected, key=key)
+
+def test_gwa_matches_the_summary_table(test_db):
+    db.update_grade('202400001', 'Discrete Mathematics', 3, 2.75, 2.75, 'Passed', 1, 1)
+    results = by_student(academic_standing(load_grade_columns(school_year='2024-2025')))
+
+    for student_id, row in results.items():
+        assert row['gwa'] == pytest.approx(db.get_student_summary(student_id)[0])
+    assert load_grade_columns(school_year='1999-2000').student_ids == []
+
+def test_pool_timeout_loads_no_columns(test_db):
+    configure_pool(test_db, max_size=1, timeout=0.01)
+    held = db.get_db_connection()
+    try:
+        assert len(load_grade_columns()) == 0
+    finally:
+        held.close()
@@ -0,0 +1,89 @@
+"""
+Tests for throttled logins through the Authenticator.
+"""
+
+import pytest
+from src.database import database_operations as db
+from src.repositories.authentication import LOGIN_THROTTLED, Authenticator, TokenBuckets
+from src.repositories.base import Repositories
+from src.repositories.memory import MemoryRepositories
+from src.repositories.sqlite import (
+    SQLiteGradeRepository, SQLiteRegistrarRepository, SQLiteStudentRepository
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def repositories():
+    repositories = MemoryRepositories()
+    repositories.students.add('2024001', 'Juan Dela Cruz', '09123456789', 'juan@eecp.edu.ph',
+                              'secret123')
+    repositories.registrars.add('REG100', 'Registrar', 'admin123')
+    yield repositories
+    repositories.close()
+
+def test_token_buckets_refill_over_the_window(clock):
+    buckets = TokenBuckets(3, 30, clock=clock)
+    assert [buckets.take('a') for _ in range(3)] == [0, 0, 0]
+    assert buckets.take('a') == pytest.approx(10)
+    assert buckets.take('b') == 0
+    clock.now += 10
+    assert buckets.take('a') == 0
+    buckets.reset('a')
+    assert buckets.take('a') == 0
+    assert buckets.stats() == {'capacity': 3, 'window': 30, 'tracked': 2, 'throttled': 1}
+    assert TokenBuckets(0, 30).take('a') == 0
+
+def test_account_is_throttled_after_failed_attempts(repositories, clock):
+    auth = Authenticator(repositories, account_attempts=3, account_window=60, clock=clock)
+    assert auth.authenticate('student', '2024001', 'secret123') == (db.LOGIN_OK, 0)
+    for _ in range(3):
+        assert auth.authenticate('student', '2024001', 'wrong') == (db.LOGIN_WRONG_PASSWORD, 0)
+    result, retry_after = auth.authenticate('student', '2024001', 'secret123')
+    assert result == LOGIN_THROTTLED and retry_after == pytest.approx(20)
+    # Other accounts and user types are not affected
+    assert auth.authenticate('registrar', 'REG100', 'admin123') == (db.LOGIN_OK, 0)
+
+    clock.now += 20
+    assert auth.authenticate('student', '2024001', 'secret123') == (db.LOGIN_OK, 0)
+    assert auth.authenticate('student', '2024001', 'wrong') == (db.LOGIN_WRONG_PASSWORD, 0)
+    assert auth.stats()['results'][LOGIN_THROTTLED]['count'] == 1
+    with pytest.raises(ValueError):
+        auth.authenticate('teacher', '2024001', 'secret123')
+
+def test_source_is_throttled_across_accounts(repositories, clock):
+    auth = Authenticator(repositories, source_attempts=4, source_window=40, clock=clock)
+    for n in range(4):
+        assert auth.authenticate('student', f"2024{n:03d}", 'guess', source='10.0.0.5')[0] != LOGIN_THROTTLED
+    assert auth.authenticate('student', '2024001', 'secret123', source='10.0.0.5')[0] == LOGIN_THROTTLED
+    assert auth.authenticate('student', '2024001', 'secret123', source='10.0.0.6') == (db.LOGIN_OK, 0)
+
+def test_unknown_accounts_are_cached_until_the_table_changes(repositories, clock):
+    auth = Authenticator(repositories, account_attempts=0, source_attempts=0, clock=clock)
+    assert auth.authenticate('student', '2024002', 'secret123') == (db.LOGIN_UNKNOWN_ACCOUNT, 0)
+    assert auth.authenticate('student', '2024002', 'secret123') == (db.LOGIN_UNKNOWN_ACCOUNT, 0)
+    assert auth.stats()['unknown_accounts']['hits'] == 1
+
+    repositories.students.add('2024002', 'Maria Santos', '09123456789', 'maria@eecp.edu.ph',
+                              'secret123')
+    assert auth.authenticate('student', '2024002', 'secret123') == (db.LOGIN_OK, 0)
+
+def test_sqlite_logins(test_db):
+    auth = Authenticator(Repositories(SQLiteStudentRepository(), SQLiteGradeRepository(),
+                                      SQLiteRegistrarRepository()))
+    assert auth.authenticate('registrar', 'REG001', 'admin123') == (db.LOGIN_OK, 0)
+    assert auth.authenticate('registrar', 'REG001', 'wrong') == (db.LOGIN_WRONG_PASSWORD, 0)
+    assert auth.authenticate('student', 'missing', 'wrong') == (db.LOGIN_UNKNOWN_ACCOUNT, 0)
+    assert auth.authenticate('student', 'missing', 'wrong') == (db.LOGIN_UNKNOWN_ACCOUNT, 0)
+    assert auth.stats()['unknown_accounts']['hits'] == 1
+    assert db.insert_user_data_st('missing', 'Student', '', '', 'secret123')
+    assert auth.authenticate('student', 'missing', 'secret123') == (db.LOGIN_OK, 0)
@@ -0,0 +1,76 @@
+"""
+Tests for the background task runner used by the dashboards.
+"""
+
+import threading
+import time
+from src.ui.background_tasks import BackgroundTasks
+
+class FakeWidget:
+    """Stands in for a Tk widget: after() callbacks run when pump() is called."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, delay, callback):
+        self.callbacks.append(callback)
+
+    def pump(self, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while self.callbacks and time.monotonic() < deadline:
+            callbacks, self.callbacks = self.callbacks, []
+            for callback in callbacks:
+                callback()
+            time.sleep(0.005)
+
+def test_results_are_delivered_through_the_poll_loop():
+    widget = FakeWidget()
+    busy_states = []
+    tasks = BackgroundTasks(widget, on_busy_changed=busy_states.append)
+    results = []
+
+    tasks.submit(sum, [1, 2, 3], on_success=results.append)
+    tasks.submit(int, 'x', on_error=lambda e: results.append(type(e).__name__))
+    assert tasks.busy
+    widget.pump()
+
+    assert sorted(map(str, results)) == ['6', 'ValueError']
+    assert busy_states == [True, False]
+    assert not tasks.busy
+    tasks.shutdown()
+
+def test_newer_task_with_same_key_supersedes_older():
+    widget = FakeWidget()
+    tasks = BackgroundTasks(widget, max_workers=1)
+    release = threading.Event()
+    results = []
+
+    tasks.submit(release.wait, on_success=lambda _: results.append('blocker'))
+    tasks.submit(lambda: 'first search', key='search', on_success=results.append)
+    tasks.submit(lambda: 'second search', key='search', on_success=results.append)
+    release.set()
+    widget.pump()
+
+    assert results == ['blocker', 'second search']
+    tasks.shutdown()
+
+def test_running_task_result_is_discarded_when_superseded():
+    widget = FakeWidget()
+    tasks = BackgroundTasks(widget, max_workers=2)
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def slow():
+        started.set()
+        release.wait()
+        return 'stale'
+
+    tasks.submit(slow, key='students', on_success=results.append)
+    started.wait()
+    tasks.submit(lambda: 'fresh', key='students', on_success=results.append)
+    release.set()
+    widget.pump()
+
+    assert results == ['fresh']
+    tasks.shutdown()
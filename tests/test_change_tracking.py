@@ -0,0 +1,46 @@
+"""
+Tests for change detection used to skip no-op refreshes.
+"""
+
+from src.database import database_operations as db
+from src.database.change_tracking import RefreshGate, get_change_tracker
+
+def test_writes_bump_only_their_table_counter(test_db):
+    tracker = get_change_tracker()
+    students, grades, registrars = tracker.versions('students', 'grades', 'registrars')
+
+    assert db.update_grade('202410769', 'Data Structures', 3, 1.75, 1.75, 'Passed', 1, 2)
+    assert tracker.versions('students', 'grades', 'registrars') == (students, grades + 1, registrars)
+
+    assert db.delete_grade('202410769', 'Data Structures', '1', '2')
+    assert tracker.versions('grades') == (grades + 2,)
+
+    assert db.delete_student('202400001')
+    assert tracker.versions('students')[0] > students
+
+def test_gate_skips_unchanged_views(test_db):
+    gate = RefreshGate(('grades',))
+    calls = []
+
+    def loader(student_id):
+        calls.append(student_id)
+        return db.fetch_student_grades(student_id)
+
+    shown = []
+    deliver = gate.deliver(shown.append)
+    deliver(gate.load('202410769', loader, '202410769'))
+    assert gate.load('202410769', loader, '202410769') is None
+    assert len(calls) == 1
+
+    # Different parameters and new writes both reload
+    deliver(gate.load('202400001', loader, '202400001'))
+    assert db.update_grade('202400001', 'Discrete Mathematics', 3, 2.0, 2.0, 'Passed', 1, 1)
+    deliver(gate.load('202400001', loader, '202400001'))
+    assert calls == ['202410769', '202400001', '202400001']
+    assert [len(grades) for grades in shown] == [3, 0, 1]
+
+def test_gate_retries_after_failed_load(test_db):
+    gate = RefreshGate(('students',))
+    gate.deliver(lambda info: None)(gate.load('missing', db.get_student_info, 'missing'))
+
+    assert gate.load('missing', db.get_student_info, 'missing') is not None
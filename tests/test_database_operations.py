@@ -0,0 +1,331 @@
+"""
+Tests for the database operations of the Grade Evaluation System.
+"""
+
+import sqlite3
+import threading
+import pytest
+from src.database import database_operations as db
+from src.database.connection_pool import ConnectionPool, configure_pool
+
+def test_connections_are_reused(test_db):
+    """Repeated operations reuse a single pooled connection."""
+    assert db.get_student_info('202410769')[1] == 'Angelo Manalo'
+    assert len(db.fetch_student_grades('202410769')) == 3
+    assert db.fetch_user_credentials('202410769', 'student123')
+
+    stats = db.get_connection_stats()
+    assert stats['opened'] == 1
+    assert stats['reused'] == 2
+    assert stats['in_use'] == 0
+
+def test_pool_rolls_back_unfinished_transactions(test_db):
+    """A connection returned mid-transaction is rolled back before reuse."""
+    conn = db.get_db_connection()
+    conn.execute("DELETE FROM grades")
+    conn.close()
+
+    assert len(db.fetch_student_grades('202410769')) == 3
+
+def test_pool_applies_pragmas_once_per_connection(test_db):
+    """PRAGMAs configured on the pool are applied when a connection is opened."""
+    pool = ConnectionPool(test_db, max_size=2, pragmas={'cache_size': -4096})
+    with pool.acquire() as conn:
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -4096
+    pool.close()
+
+def test_pool_is_bounded_across_threads(test_db):
+    """Concurrent callers never hold more connections than max_size."""
+    pool = ConnectionPool(test_db, max_size=2)
+    errors = []
+
+    def worker():
+        try:
+            for _ in range(20):
+                with pool.acquire() as conn:
+                    conn.execute("SELECT COUNT(*) FROM students").fetchone()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.stats()
+    assert not errors
+    assert stats['opened'] <= 2
+    assert stats['opened'] + stats['reused'] == 120
+    pool.close()
+
+def test_performance_profile_enables_wal(test_db):
+    """The default profile runs the database in WAL mode with relaxed syncing."""
+    conn = db.get_db_connection()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    finally:
+        conn.close()
+
+def test_safe_profile_uses_rollback_journal(test_db):
+    """The safe profile switches back to a fully synced rollback journal."""
+    pool = ConnectionPool(test_db, profile='safe')
+    with pool.acquire() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+    pool.close()
+
+def query_plan(sql, params):
+    """Return the EXPLAIN QUERY PLAN detail lines for a statement."""
+    conn = db.get_db_connection()
+    try:
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+    finally:
+        conn.close()
+
+def test_grades_natural_key_is_unique(test_db):
+    """The grades table rejects a second row for the same student, subject and term."""
+    conn = db.get_db_connection()
+    try:
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("""
+                INSERT INTO grades (student_id, subject, units, rating_hundredths,
+                                    final_hundredths, status_code, year_level, semester)
+                VALUES ('202410769', 'Introduction to Computing', 3, 100, 100, 0, 1, 1)
+            """)
+    finally:
+        conn.close()
+
+def test_fetch_student_grades_uses_covering_index(test_db):
+    """Per-student grade reads are a covering index seek with no sort step."""
+    plan = query_plan("""
+        SELECT subject, units, rating_hundredths, final_hundredths, status_code,
+               year_level, semester
+        FROM grades
+        WHERE student_id = ?
+        ORDER BY year_level, semester, subject
+    """, ('202410769',))
+    assert any('USING COVERING INDEX idx_grades_student_cover' in line for line in plan)
+    assert not any('TEMP B-TREE' in line for line in plan)
+
+def test_grade_writes_seek_the_natural_key(test_db):
+    """Updating or deleting a grade seeks the unique natural key index."""
+    key = ('202410769', 'Computer Programming 1', 1, 1)
+    for sql in ("""
+            UPDATE grades SET units = 3
+            WHERE student_id = ? AND subject = ? AND year_level = ? AND semester = ?
+        """, """
+            DELETE FROM grades
+            WHERE student_id = ? AND subject = ? AND year_level = ? AND semester = ?
+        """):
+        plan = query_plan(sql, key)
+        assert any(line.startswith('SEARCH grades') and 'INDEX idx_grades_natural_key' in line
+                   for line in plan), plan
+
+def test_update_grade_reports_insert_or_update(test_db):
+    """update_grade upserts on the natural key and says which branch ran."""
+    args = ('202400001', 'Discrete Mathematics', 3, 1.5, 1.5, 'Passed', 1, 2)
+    assert db.update_grade(*args) == db.GRADE_INSERTED
+    assert db.update_grade('202400001', 'Discrete Mathematics', 3, 2.0, 2.0,
+                           'Passed', 1, 2) == db.GRADE_UPDATED
+    assert db.update_grade('202400001', 'Data Structures', 3, 1.75, 1.75,
+                           'Passed', 1, 2) == db.GRADE_INSERTED
+
+    grades = db.fetch_student_grades('202400001')
+    assert len(grades) == 2
+    assert [g[0] for g in grades] == ['Data Structures', 'Discrete Mathematics']
+    assert float(grades[1][2]) == 2.0
+
+def test_update_grade_result_ignores_other_tables_inserts(test_db):
+    """An insert into another table on the same pooled connection does not
+    make a new grade look like an update."""
+    configure_pool(test_db, max_size=1)
+    conn = db.get_db_connection()
+    next_grade_id = conn.execute(
+        "SELECT seq + 1 FROM sqlite_sequence WHERE name = 'grades'").fetchone()[0]
+    conn.execute("INSERT INTO students (rowid, student_id, name, password) VALUES (?, 'SX', 'X', 'x')",
+                 (next_grade_id,))
+    conn.commit()
+    conn.close()
+
+    assert db.update_grade('SX', 'NEWSUBJ', 3, 1.5, 1.5, 'Passed', 1, 1) == db.GRADE_INSERTED
+    assert db.update_grades([('SX', 'NEWSUBJ', 3, 1.25, '', '', 1, 1),
+                             ('SX', 'OTHER', 3, 1.25, '', '', 1, 1)]) == [db.GRADE_UPDATED,
+                                                                         db.GRADE_INSERTED]
+
+def test_pool_timeouts_return_failure_values(test_db):
+    """A connection that cannot be acquired is a logged failure, not an exception."""
+    configure_pool(test_db, max_size=1, timeout=0.01)
+    held = db.get_db_connection()
+    try:
+        assert db.fetch_student_data() == []
+        assert db.fetch_student_grades('202410769') == []
+        assert db.get_student_info('202410769') is None
+        assert db.update_grade('202410769', 'Physics', 3, 1.0, 1.0, 'Passed', 1, 1) is False
+        assert db.delete_grade('202410769', 'Physics', 1, 1) is False
+    finally:
+        held.close()
+
+def test_update_grade_rejects_out_of_range_values(test_db):
+    """Invalid units, ratings or terms are rejected before touching the database."""
+    assert db.update_grade('202400001', 'Physics', 7, 1.0, 1.0, 'Passed', 1, 1) is False
+    assert db.update_grade('202400001', 'Physics', 3, 5.5, 5.5, 'Failed', 1, 1) is False
+    assert db.update_grade('202400001', 'Physics', 3, 1.0, 1.0, 'Passed', 6, 1) is False
+    assert db.fetch_student_grades('202400001') == []
+
+def test_grades_are_stored_typed(test_db):
+    """Ratings are kept in hundredths, terms as integers and status as a code."""
+    assert db.update_grade('202400001', 'Physics', 3, '2.25', '', '', '1', '2') == db.GRADE_INSERTED
+    assert db.update_grade('202400001', 'Calculus', 3, 3.5, 3.5, '', 1, 2) == db.GRADE_INSERTED
+    assert db.update_grade('202400001', 'Chemistry', 3, 1.0, 1.0, 'Dropped', 1, 2) is False
+
+    conn = db.get_db_connection()
+    try:
+        rows = conn.execute("""
+            SELECT subject, rating_hundredths, final_hundredths, status_code,
+                   typeof(year_level), typeof(semester)
+            FROM grades WHERE student_id = '202400001' ORDER BY subject
+        """).fetchall()
+    finally:
+        conn.close()
+    assert rows == [('Calculus', 350, 350, 1, 'integer', 'integer'),
+                    ('Physics', 225, 225, 0, 'integer', 'integer')]
+    assert db.fetch_student_grades('202400001')[1] == ('Physics', 3, '2.25', 2.25, 'Passed', 1, 2)
+
+def test_bulk_upsert_grades_posts_a_section_in_one_call(test_db):
+    """A whole section posts in one transaction and bad rows are reported, not fatal."""
+    students = [f"2024{n:05d}" for n in range(40)]
+    subjects = [f"Subject {n}" for n in range(8)]
+    rows = [
+        {'student_id': student_id, 'subject': subject, 'units': 3,
+         'rating': '1.75', 'year_level': '1', 'semester': '2'}
+        for student_id in students for subject in subjects
+    ]
+    rows[5]['rating'] = '7.00'
+    rows[17]['units'] = 'three'
+    rows.append(('202410769', 'Introduction to Computing', 3, 2.0, 2.0, 'Passed', 1, 1))
+
+    posted, failures = db.bulk_upsert_grades(iter(rows))
+
+    assert posted == len(rows) - 2
+    assert [index for index, _ in failures] == [5, 17]
+    assert failures[0][1] == "Invalid rating value"
+    grades = db.fetch_student_grades(students[0])
+    assert len(grades) == 7
+    assert grades[0][4] == 'Passed'
+    assert float(db.fetch_student_grades('202410769')[2][2]) == 2.0
+
+def test_bulk_upsert_grades_skips_rows_the_database_rejects(test_db):
+    """A constraint failure on one row does not roll back the rest of the batch."""
+    conn = db.get_db_connection()
+    conn.execute("""
+        CREATE TRIGGER reject_archived BEFORE INSERT ON grades
+        WHEN NEW.subject = 'Archived'
+        BEGIN SELECT RAISE(ABORT, 'archived subject'); END
+    """)
+    conn.commit()
+    conn.close()
+
+    rows = [('202400001', subject, 3, 1.5, 1.5, 'Passed', 1, 1)
+            for subject in ('Algebra', 'Archived', 'Biology')]
+    posted, failures = db.bulk_upsert_grades(rows)
+
+    assert posted == 2
+    assert failures == [(1, 'archived subject')]
+    assert [g[0] for g in db.fetch_student_grades('202400001')] == ['Algebra', 'Biology']
+
+def test_fetch_student_page_walks_students_by_key(test_db):
+    """Keyset pages cover every student once, in student ID order, with filters."""
+    students = [(f"2023{n:05d}", f"STUDENT {n}", '09170000000', f"s{n}@eecp.edu.ph", 'pw',
+                 str(n % 4 + 1), '1', 'EECP', 'BSCS' if n % 2 else 'BSIT', '2024-2025', 'Enrolled')
+                for n in range(25)]
+    assert db.bulk_insert_students(students)[0] == 25
+
+    seen = []
+    after_id = None
+    while True:
+        page = db.fetch_student_page(after_id=after_id, page_size=10)
+        seen.extend(row[0] for row in page)
+        if len(page) < 10:
+            break
+        after_id = page[-1][0]
+    assert seen == sorted(row[0] for row in db.fetch_student_data())
+    assert len(seen) == 27
+
+    page = db.fetch_student_page(page_size=100, program='BSCS', year_level='2')
+    assert [row[0] for row in page] == [f"2023{n:05d}" for n in range(25) if n % 4 == 1]
+    assert db.count_students(program='BSCS', year_level='2') == len(page)
+    assert db.fetch_student_page(page_size=2, offset=25) == db.fetch_student_page(after_id=seen[24], page_size=2)
+
+def test_search_students_matches_word_prefixes(test_db):
+    """Every query word must prefix-match a word in a searchable column."""
+    assert [r[0] for r in db.search_students('angel')] == ['202410769']
+    assert [r[0] for r in db.search_students('ANGELO MAN')] == ['202410769']
+    assert [r[0] for r in db.search_students('0912345')] == ['202400001']
+    assert sorted(r[0] for r in db.search_students('eecp.edu')) == ['202400001', '202410769']
+    assert db.search_students('angelo doe') == []
+    assert db.search_students('"') == []
+    assert len(db.search_students('enrolled', limit=1)) == 1
+
+def test_search_index_follows_student_changes(test_db):
+    """Inserts, updates and deletes on students are mirrored into the search index."""
+    db.insert_user_data_st('202499999', 'MARIA CLARA', '09181112222', 'maria@eecp.edu.ph', 'pw')
+    assert [r[0] for r in db.search_students('mar cla')] == ['202499999']
+
+    db.update_student_data('202499999', 'MARIA SANTOS', '09181112222', 'maria@eecp.edu.ph',
+                           '1', '1', 'EECP', 'BSIT', '2024-2025', 'LOA')
+    assert db.search_students('clara') == []
+    assert [r[9] for r in db.search_students('santos loa')] == ['LOA']
+
+    db.delete_student('202499999')
+    assert db.search_students('maria') == []
+
+def read_summaries():
+    conn = db.get_db_connection()
+    try:
+        overall = conn.execute("""
+            SELECT student_id, grade_count, units_total, units_earned, failed_units, gwa
+            FROM student_summary ORDER BY student_id
+        """).fetchall()
+        terms = conn.execute("""
+            SELECT student_id, year_level, semester, units_total, gwa
+            FROM student_term_summary ORDER BY student_id, year_level, semester
+        """).fetchall()
+        return overall, terms
+    finally:
+        conn.close()
+
+def test_summary_triggers_track_grade_writes(test_db):
+    """Student and term summaries follow inserts, updates and deletes on grades."""
+    assert db.get_student_summary('202410769')[:4] == (1.25, 9, 9, 0)
+
+    db.update_grade('202410769', 'Data Structures', 2, 3.5, 3.5, 'Failed', 1, 2)
+    db.update_grade('202400001', 'Discrete Mathematics', 3, 2.0, 2.0, 'Passed', 2, 1)
+    gwa, units_total, units_earned, failed_units, _ = db.get_student_summary('202410769')
+    assert (units_total, units_earned, failed_units) == (11, 9, 2)
+    assert gwa == pytest.approx((1.00 * 3 + 1.25 * 3 + 1.50 * 3 + 3.5 * 2) / 11)
+    assert db.fetch_term_summaries('202410769') == [
+        ('1', '1', 1.25, 9, 9, 0), ('1', '2', 3.5, 2, 0, 2)]
+
+    db.update_grade('202410769', 'Data Structures', 2, 1.75, 1.75, 'Passed', 1, 2)
+    assert db.fetch_term_summaries('202410769')[1] == ('1', '2', 1.75, 2, 2, 0)
+
+    db.delete_grade('202410769', 'Data Structures', '1', '2')
+    assert [row[:2] for row in db.fetch_term_summaries('202410769')] == [('1', '1')]
+
+    db.delete_student('202400001')
+    assert db.get_student_summary('202400001') is None
+
+    # The triggers agree with a full recomputation
+    maintained = read_summaries()
+    assert db.rebuild_student_summaries()
+    assert read_summaries() == maintained
+
+def test_student_rows_carry_gwa(test_db):
+    """Student listings end with the display GWA, blank for students without grades."""
+    rows = {row[0]: row[-1] for row in db.fetch_student_page()}
+    assert rows == {'202400001': '', '202410769': '1.25'}
+    assert db.search_students('angelo')[0][-1] == '1.25'
@@ -0,0 +1,40 @@
+"""
+Tests for grade distribution statistics.
+"""
+
+from src.database import database_operations as db
+from src.database.grade_statistics import scale_bucket, subject_statistics, summarize_distribution
+
+def test_scale_bucket_rounds_towards_worse_ratings():
+    assert scale_bucket(100) == '1.00'
+    assert scale_bucket(110) == '1.25'
+    assert scale_bucket(400) == '5.00'
+
+def test_median_from_counts():
+    assert summarize_distribution([(100, 1, 1), (150, 1, 1), (300, 1, 0)])['median'] == 1.5
+    assert summarize_distribution([(100, 2, 2), (200, 2, 2)])['median'] == 1.5
+    assert summarize_distribution([(100, 5, 5), (500, 1, 0)])['median'] == 1.0
+
+def test_subject_statistics(test_db):
+    grades = [{'student_id': student, 'subject': 'Computer Programming 1', 'units': 3,
+               'rating': rating, 'status': status, 'year_level': 1, 'semester': 1}
+              for student, rating, status in (('202400001', 2.0, 'Passed'),
+                                              ('202400002', 5.0, 'Failed'),
+                                              ('202400003', 1.25, 'Passed'))]
+    db.bulk_upsert_grades(grades)
+
+    stats = {row['subject']: row for row in subject_statistics(year_level='1', semester='1')}
+    assert set(stats) == {'Introduction to Computing', 'Computer Programming 1',
+                          'Computer Programming 2'}
+    programming = stats['Computer Programming 1']
+    # Ratings 1.25 (seed), 1.25, 2.00 and 5.00
+    assert programming['count'] == 4
+    assert programming['mean'] == 2.375
+    assert programming['median'] == 1.625
+    assert programming['pass_rate'] == 0.75
+    assert programming['histogram']['1.25'] == 2
+    assert sum(programming['histogram'].values()) == 4
+
+    assert subject_statistics(subject='Computer Programming 1') == [programming]
+    db.delete_grade('202400002', 'Computer Programming 1', '1', '1')
+    assert subject_statistics(subject='Computer Programming 1')[0]['count'] == 3
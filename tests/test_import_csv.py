@@ -0,0 +1,84 @@
+"""
+Tests for the CSV importer of the Grade Evaluation System.
+"""
+
+import csv
+from src.database import database_operations as db
+from src.database import import_csv
+from src.database.import_csv import _import, chunked, main
+
+def write_csv(path, header, rows):
+    with open(path, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def test_chunked_streams_fixed_size_lists():
+    assert list(chunked(iter(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+def test_rolled_back_chunk_reports_each_row_once(tmp_path, monkeypatch):
+    """Rows of a rolled-back chunk keep their own failure and progress is still logged."""
+    grades_csv = tmp_path / 'grades.csv'
+    write_csv(grades_csv, ['subject'], [['Calculus'], ['Physics'], ['Chemistry'], ['Biology']])
+    rejects_csv = tmp_path / 'rejects.csv'
+
+    def write_chunk(params):
+        if len(params) == 3:
+            return 0, [(1, 'Invalid units'), (None, 'disk I/O error')]
+        return len(params), []
+
+    progress = []
+    monkeypatch.setattr(import_csv.logger, 'info', lambda *args: progress.append(args))
+    imported, rejected, _ = _import(str(grades_csv), 3, str(rejects_csv),
+                                    lambda row: row['subject'], write_chunk)
+
+    assert (imported, rejected) == (1, 3)
+    with open(rejects_csv, newline='') as csv_file:
+        rows = list(csv.DictReader(csv_file))
+    assert [(r['line'], r['reason']) for r in rows] == [
+        ('2', 'disk I/O error'),
+        ('3', 'Invalid units'),
+        ('4', 'disk I/O error'),
+    ]
+    assert [args[1] for args in progress] == [0, 1]
+
+def test_import_students_and_grades(test_db, tmp_path, capsys):
+    """Valid rows are imported in chunks and invalid ones land in the rejects file."""
+    students_csv = tmp_path / 'students.csv'
+    rows = [[f"2025{n:05d}", f"Student {n}", f"0917{n:07d}", f"s{n}@eecp.edu.ph", 'secret123']
+            for n in range(25)]
+    rows[3][3] = 'bad@gmail.com'
+    rows[10][2] = '12345'
+    rows.append(['202410769', 'Duplicate', '09171234567', 'dup@eecp.edu.ph', 'secret123'])
+    write_csv(students_csv, ['student_id', 'name', 'mobile_number', 'email_address', 'password'], rows)
+    rejects_csv = tmp_path / 'rejects.csv'
+
+    status = main(['students', str(students_csv), '--chunk-size', '4',
+                   '--rejects', str(rejects_csv), '--db', test_db])
+
+    assert status == 1
+    assert 'Imported 23 students' in capsys.readouterr().out
+    assert db.get_student_info('202500000')[1] == 'STUDENT 0'
+    with open(rejects_csv, newline='') as csv_file:
+        rejected = list(csv.DictReader(csv_file))
+    assert [(r['line'], r['reason']) for r in rejected] == [
+        ('5', 'Invalid email address'),
+        ('12', 'Invalid mobile number'),
+        ('27', 'UNIQUE constraint failed: students.student_id'),
+    ]
+
+    grades_csv = tmp_path / 'grades.csv'
+    write_csv(grades_csv, ['student_id', 'subject', 'units', 'rating', 'year_level', 'semester'],
+              [['202500000', 'Calculus', '3', '1.25', '1', '1'],
+               ['202500000', 'Physics', '9', '1.25', '1', '1']])
+
+    assert main(['grades', str(grades_csv), '--db', test_db]) == 1
+    assert [g[0] for g in db.fetch_student_grades('202500000')] == ['Calculus']
+
+def test_import_creates_a_new_database(tmp_path):
+    students_csv = tmp_path / 'students.csv'
+    write_csv(students_csv, ['student_id', 'name', 'mobile_number', 'email_address', 'password'],
+              [['202500001', 'New Student', '09171234567', 'new@eecp.edu.ph', 'secret123']])
+
+    assert main(['students', str(students_csv), '--db', str(tmp_path / 'new.db')]) == 0
+    assert db.get_student_info('202500001')[1] == 'NEW STUDENT'
@@ -0,0 +1,42 @@
+"""
+Tests for the queued application logger.
+"""
+
+import logging
+from src.utils import logger as logger_module
+from src.utils.logger import DeferredQueueHandler, logger, parse_level
+
+class Exploding:
+    def __str__(self):
+        raise AssertionError("formatted a disabled message")
+
+def test_logger_only_enqueues_records():
+    assert [type(handler) for handler in logger.handlers] == [DeferredQueueHandler]
+
+def test_disabled_messages_are_never_formatted():
+    level = logger.level
+    logger.setLevel(logging.INFO)
+    try:
+        logger.debug("Fetching grades for student: %s", Exploding())
+    finally:
+        logger.setLevel(level)
+
+def test_records_are_formatted_on_the_listener_thread():
+    record = logger.makeRecord(logger.name, logging.ERROR, __file__, 1,
+                               "Grade %s failed", ('Physics',), None)
+    prepared = DeferredQueueHandler(None).prepare(record)
+    assert (prepared.msg, prepared.args) == ("Grade %s failed", ('Physics',))
+    assert not hasattr(prepared, 'message')
+
+def test_shutdown_detaches_the_queue():
+    logger_module.shutdown_logger()
+    try:
+        assert logger.handlers == []
+    finally:
+        logger_module.setup_logger()
+    assert len(logger.handlers) == 1
+
+def test_parse_level():
+    assert parse_level('debug') == logging.DEBUG
+    assert parse_level(' WARNING ') == logging.WARNING
+    assert parse_level('chatty') == logging.INFO
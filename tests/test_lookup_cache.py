@@ -0,0 +1,93 @@
+"""
+Tests for the per-student lookup caches.
+"""
+
+import sqlite3
+from src.database.change_tracking import RefreshGate
+from src.database import database_operations as db
+from src.database.lookup_cache import MISSING, LookupCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_least_recently_used_entries_are_evicted():
+    cache = LookupCache('test', maxsize=2)
+    for key in ('a', 'b'):
+        cache.put(key, key.upper(), cache.token())
+    assert cache.get('a') == 'A'
+    cache.put('c', 'C', cache.token())
+
+    assert cache.get('b') is MISSING
+    assert cache.get('a') == 'A'
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (2, 1, 1, 2)
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LookupCache('test', ttl=30, clock=clock)
+    cache.put('a', None, cache.token())
+    clock.now = 29.9
+    assert cache.get('a') is None
+    clock.now = 30.0
+    assert cache.get('a') is MISSING
+    assert cache.stats()['expirations'] == 1
+
+def test_reads_started_before_an_invalidation_are_not_cached():
+    cache = LookupCache('test')
+    token = cache.token()
+    cache.invalidate('a')
+    cache.put('a', 'stale', token)
+    assert cache.get('a') is MISSING
+
+def test_entries_read_under_another_version_are_stale():
+    cache = LookupCache('test')
+    cache.put('a', 'A', cache.token(), version=1)
+    assert cache.get('a', 1) == 'A'
+    assert cache.get('a', 2) is MISSING
+    assert cache.stats()['stale'] == 1
+
+def cache_hits():
+    return {name: stats['hits'] for name, stats in db.get_cache_stats().items()}
+
+def test_writes_invalidate_only_the_students_they_touch(test_db):
+    db.fetch_student_grades('202410769')
+    db.get_student_info('202410769')
+    db.get_student_info('202400001')
+    before = cache_hits()
+
+    db.update_grade('202410769', 'Physics', 3, 2.0, 2.0, 'Passed', 1, 1)
+    assert ('Physics', 3, '2.00', 2.0, 'Passed', 1, 1) in db.fetch_student_grades('202410769')
+    assert db.get_student_info('202410769')[0] == '202410769'
+    assert db.get_student_info('202400001')[0] == '202400001'
+    assert cache_hits() == {'student_info': before['student_info'] + 2,
+                            'student_grades': before['student_grades']}
+
+    db.update_student_data('202400001', 'JOHN SMITH', '09123456789', 'student@eecp.edu.ph',
+                           '1', '1', 'EECP', 'BSIT', '2024-2025', 'Enrolled')
+    assert db.get_student_info('202400001')[1] == 'JOHN SMITH'
+    db.delete_student('202410769')
+    assert db.get_student_info('202410769') is None
+    assert db.fetch_student_grades('202410769') == []
+
+def test_writes_from_other_processes_are_seen(test_db):
+    gate = RefreshGate(('grades',))
+    shown = []
+    deliver = gate.deliver(shown.append)
+    deliver(gate.load(('202410769',), db.fetch_student_grades, '202410769'))
+    assert len(shown[-1]) == 3
+
+    # Another process writes a grade, bypassing this process's invalidation
+    conn = sqlite3.connect(test_db)
+    conn.execute("""INSERT INTO grades (student_id, subject, units, rating_hundredths,
+                    final_hundredths, status_code, year_level, semester)
+                    VALUES ('202410769', 'Physics', 3, 200, 200, 1, 1, 1)""")
+    conn.commit()
+    conn.close()
+
+    deliver(gate.load(('202410769',), db.fetch_student_grades, '202410769'))
+    assert len(shown[-1]) == 4
+    assert gate.check(('202410769',)) is None
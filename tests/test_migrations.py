@@ -0,0 +1,131 @@
+"""
+Tests for the versioned schema migrations.
+"""
+
+import sqlite3
+import pytest
+from src.database import database_operations as db
+from src.database.connection_pool import configure_pool
+from src.database.init_database import init_db
+from src.database.migrations import (
+    LATEST_VERSION, MIGRATIONS, create_base_tables, current_version, migrate
+)
+
+def legacy_database(path):
+    """A database as the original init_db left it: no indexes, no user_version."""
+    conn = sqlite3.connect(path)
+    create_base_tables(conn.cursor())
+    conn.execute("""
+        INSERT INTO students (student_id, name, password, program)
+        VALUES ('202300001', 'LEGACY STUDENT', 'pw', 'BSIT')
+    """)
+    grade = "INSERT INTO grades (student_id, subject, units, rating, final_grade, status, year_level, semester) VALUES (?, 'Physics', 3, ?, ?, 'Passed', '1', '1')"
+    conn.execute(grade, ('202300001', '2.00', 2.0))
+    conn.execute(grade, ('202300001', '1.50', 1.5))  # duplicate; the newest wins
+    conn.commit()
+    conn.close()
+
+def test_legacy_database_is_upgraded_in_place(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    legacy_database(path)
+
+    init_db(path)
+    pool = configure_pool(path)
+    try:
+        conn = sqlite3.connect(path)
+        assert current_version(conn) == LATEST_VERSION
+        assert conn.execute("SELECT COUNT(*) FROM registrars").fetchone()[0] == 0  # not seeded
+        conn.close()
+
+        assert db.fetch_student_grades('202300001') == [('Physics', 3, '1.50', 1.5, 'Passed', 1, 1)]
+        assert [row[0] for row in db.search_students('legacy')] == ['202300001']
+        assert db.get_student_summary('202300001')[0] == 1.5
+    finally:
+        pool.close()
+
+def test_init_db_keeps_data_and_only_applies_missing_steps(test_db):
+    assert db.insert_user_data_st('202499999', 'KEPT STUDENT', '09123456789',
+                                  'kept@eecp.edu.ph', 'pw')
+
+    init_db(test_db)
+    assert db.get_student_info('202499999')[1] == 'KEPT STUDENT'
+    assert len(db.fetch_student_data()) == 3  # the sample data was not seeded twice
+
+    conn = sqlite3.connect(test_db)
+    assert migrate(conn) == []
+    conn.close()
+
+def test_failed_step_rolls_back_and_keeps_version(tmp_path):
+    def broken(cursor):
+        cursor.execute("CREATE TABLE half_done (id INTEGER)")
+        raise sqlite3.OperationalError("boom")
+
+    conn = sqlite3.connect(str(tmp_path / 'broken.db'))
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(conn, MIGRATIONS[:2] + ((3, "Broken step", broken),))
+
+    assert current_version(conn) == 2
+    assert not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'half_done'").fetchone()
+    assert migrate(conn, MIGRATIONS[:3]) == [3]
+    conn.close()
+
+def test_reset_recreates_sample_data(test_db):
+    db.delete_student('202400001')
+    init_db(test_db, reset=True)
+
+    assert len(db.fetch_student_data()) == 2
+
+def test_typed_grades_migration_converts_legacy_values(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'typed.db'))
+    migrate(conn, MIGRATIONS[:5])
+    conn.execute("INSERT INTO students (student_id, name, password) VALUES ('S1', 'S', 'pw')")
+    conn.executemany("""
+        INSERT INTO grades (student_id, subject, units, rating, final_grade, status, year_level, semester)
+        VALUES ('S1', ?, 3, ?, ?, ?, ?, '1')
+    """, [('Physics', '1.75', 1.75, 'Passed', '1'),
+          ('Chemistry', '5.00', 5.0, 'Failed', '02'),
+          ('Biology', 'INC', None, 'Incomplete', '1')])
+    conn.execute("DELETE FROM grades WHERE subject = 'Physics'")
+    conn.execute("INSERT INTO grades (student_id, subject, units, rating, status, year_level, semester) "
+                 "VALUES ('S1', 'Physics', 3, '1.75', 'Passed', '1', '1')")
+    conn.commit()
+    sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'grades'").fetchone()
+
+    assert migrate(conn) == [6]
+    rows = conn.execute("""
+        SELECT subject, rating_hundredths, final_hundredths, status_code, year_level, semester
+        FROM grades ORDER BY subject
+    """).fetchall()
+    assert rows == [('Biology', None, None, None, 1, 1),
+                    ('Chemistry', 500, 500, 1, 2, 1),
+                    ('Physics', 175, None, 0, 1, 1)]
+    assert conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'grades'").fetchone() == sequence
+
+    # The summary triggers were recreated against the new columns
+    conn.execute("UPDATE grades SET rating_hundredths = 125 WHERE subject = 'Physics'")
+    assert conn.execute("SELECT units_total, weighted_hundredths, units_earned, failed_units "
+                        "FROM student_summary").fetchone() == (9, 125 * 3 + 500 * 3, 3, 3)
+    conn.close()
+
+def test_typed_grades_migration_rebuilds_summaries(tmp_path):
+    """Grades merged by term normalization are no longer counted twice."""
+    path = str(tmp_path / 'terms.db')
+    conn = sqlite3.connect(path)
+    migrate(conn, MIGRATIONS[:5])
+    conn.execute("INSERT INTO students (student_id, name, password) VALUES ('S1', 'S', 'pw')")
+    conn.executemany("""
+        INSERT INTO grades (student_id, subject, units, rating, final_grade, status, year_level, semester)
+        VALUES ('S1', 'Math', 3, ?, ?, 'Passed', ?, '1')
+    """, [('1.00', 1.0, '1'), ('3.00', 3.0, '01')])
+    conn.commit()
+    assert migrate(conn) == [6]
+    conn.close()
+
+    pool = configure_pool(path)
+    try:
+        assert db.get_student_summary('S1')[:2] == (3.0, 3)
+        assert [term[:3] for term in db.fetch_term_summaries('S1')] == [('1', '1', 3.0)]
+        assert db.update_grade('S1', 'Math', 3, '1.50', '', '', 1, 1) == db.GRADE_UPDATED
+        assert db.get_student_summary('S1')[0] == 1.5
+    finally:
+        pool.close()
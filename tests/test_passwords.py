@@ -0,0 +1,87 @@
+"""
+Tests for password hashing, upgrade on login and the bulk rehash tool.
+"""
+
+import sqlite3
+from src.database import database_operations as db
+from src.database.migrations import LATEST_VERSION, create_base_tables, current_version
+from src.database.rehash_passwords import main, rehash_plaintext_passwords
+from src.utils import passwords
+
+def stored_password(table, key_column, account_id):
+    conn = db.get_db_connection()
+    try:
+        return conn.execute(f"SELECT password FROM {table} WHERE {key_column} = ?",
+                            (account_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+def set_plaintext(table, key_column, account_id, password):
+    conn = db.get_db_connection()
+    conn.execute(f"UPDATE {table} SET password = ? WHERE {key_column} = ?", (password, account_id))
+    conn.commit()
+    conn.close()
+
+def test_hashes_are_salted_and_verified():
+    for scheme in (passwords.SCRYPT, passwords.PBKDF2):
+        first = passwords.hash_password('student123', scheme)
+        assert first != passwords.hash_password('student123', scheme)
+        assert first.startswith(scheme + '$')
+        assert passwords.verify_password('student123', first)
+        assert not passwords.verify_password('student124', first)
+
+def test_needs_rehash_follows_the_configured_cost():
+    assert passwords.needs_rehash('admin123')
+    assert not passwords.needs_rehash(passwords.hash_password('admin123'))
+    weaker = passwords.hash_password('admin123', passwords.SCRYPT, (512, 8, 1))
+    assert passwords.needs_rehash(weaker)
+    assert passwords.verify_password('admin123', weaker)
+
+def test_seeded_and_new_accounts_are_hashed(test_db):
+    assert passwords.is_hashed(stored_password('registrars', 'registrar_id', 'REG001'))
+    assert db.insert_user_dataR('REG010', 'Registrar', 'secret123')
+    assert passwords.is_hashed(stored_password('registrars', 'registrar_id', 'REG010'))
+    assert db.fetch_user_credentials2('REG010', 'secret123')
+    assert not db.fetch_user_credentials2('REG010', 'secret124')
+    assert not db.fetch_user_credentials2('REG999', 'secret123')
+
+def test_plaintext_password_is_upgraded_on_login(test_db):
+    set_plaintext('students', 'student_id', '202400001', 'student123')
+    assert not db.fetch_user_credentials('202400001', 'wrong')
+    assert stored_password('students', 'student_id', '202400001') == 'student123'
+
+    assert db.fetch_user_credentials('202400001', 'student123')
+    stored = stored_password('students', 'student_id', '202400001')
+    assert passwords.is_hashed(stored) and not passwords.needs_rehash(stored)
+    assert db.fetch_user_credentials('202400001', 'student123')
+
+def test_rehash_tool_hashes_every_plaintext_password(test_db):
+    students = [(f"2025{n:05d}", f"Student {n}", '', '', f"pw{n}", '1', '1', 'EECP', 'BSIT',
+                 '2025-2026', 'Enrolled') for n in range(12)]
+    assert db.bulk_insert_students(students) == (12, [])
+    for student in students:
+        set_plaintext('students', 'student_id', student[0], student[4])
+    set_plaintext('registrars', 'registrar_id', 'REG001', 'admin123')
+
+    counts, _ = rehash_plaintext_passwords(workers=2, chunk_size=5)
+    assert counts == {'students': 12, 'registrars': 1}
+    assert rehash_plaintext_passwords(workers=2)[0] == {'students': 0, 'registrars': 0}
+    assert passwords.is_hashed(stored_password('students', 'student_id', '202500011'))
+    assert db.fetch_user_credentials('202500011', 'pw11')
+    assert db.fetch_user_credentials2('REG001', 'admin123')
+
+def test_rehash_tool_migrates_older_databases(tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(path)
+    create_base_tables(conn.cursor())
+    conn.execute("INSERT INTO students (student_id, name, password) VALUES ('S1', 'S', 'pw')")
+    conn.commit()
+    conn.close()
+
+    assert main(['--workers', '1', '--db', path]) == 0
+    conn = sqlite3.connect(path)
+    try:
+        assert current_version(conn) == LATEST_VERSION
+        assert passwords.is_hashed(conn.execute("SELECT password FROM students").fetchone()[0])
+    finally:
+        conn.close()
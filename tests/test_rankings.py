@@ -0,0 +1,52 @@
+"""
+Tests for class ranking queries.
+"""
+
+from src.database import database_operations as db
+from src.database import rankings
+
+def add_students(ratings, program='BSIT'):
+    """Add one student per rating, each with a single 3-unit grade."""
+    students = [(f"2023{n:05d}", f"STUDENT {n}", '09123456789', f"s{n}@eecp.edu.ph", 'pw',
+                 '1', '1', 'EECP', program, '2024-2025', 'Enrolled')
+                for n in range(len(ratings))]
+    assert db.bulk_insert_students(students)[0] == len(students)
+    grades = [{'student_id': student[0], 'subject': 'Programming', 'units': 3,
+               'rating': rating, 'year_level': 1, 'semester': 1}
+              for student, rating in zip(students, ratings)]
+    assert db.bulk_upsert_grades(grades)[0] == len(grades)
+    return [student[0] for student in students]
+
+def test_top_students_ranks_by_gwa_with_ties(test_db):
+    ids = add_students([2.0, 1.5, 1.5, 3.0], program='BSCS')
+
+    top = rankings.top_students(limit=2, program='BSCS')
+    assert [(row[0], row[1]) for row in top] == [(1, ids[1]), (1, ids[2])]
+    assert [row[0] for row in rankings.top_students(limit=3, program='BSCS')] == [1, 1, 3]
+    # Angelo Manalo (1.25) ranks first across programs
+    assert rankings.top_students(limit=1)[0][1] == '202410769'
+
+def test_student_percentile(test_db):
+    ids = add_students([1.0, 2.0, 3.0, 4.0, 5.0], program='BSCS')
+
+    assert rankings.student_percentile(ids[0], program='BSCS') == (1, 5, 100.0)
+    assert rankings.student_percentile(ids[2], program='BSCS') == (3, 5, 50.0)
+    assert rankings.student_percentile(ids[4], program='BSCS') == (5, 5, 0.0)
+    assert rankings.student_percentile('202400001') is None  # no grades
+
+def test_honors_cutoffs(test_db):
+    add_students([1.0 + n * 0.25 for n in range(17)] * 2 + [1.0] * 6, program='BSCS')
+
+    cutoffs = rankings.honors_cutoffs((1, 10, 25), program='BSCS')
+    assert cutoffs == [(1, 1.0, 8), (10, 1.0, 8), (25, 1.25, 10)]
+    assert rankings.honors_cutoffs((10,), program='NONE') == [(10, None, 0)]
+
+def test_rankings_are_cached_until_grades_change(test_db):
+    ids = add_students([2.0, 1.5])
+    first = rankings.top_students(limit=5, program='BSIT')
+    assert rankings.top_students(limit=5, program='BSIT') is first
+
+    db.update_grade(ids[0], 'Programming', 3, 1.0, 1.0, 'Passed', 1, 1)
+    refreshed = rankings.top_students(limit=5, program='BSIT')
+    assert refreshed is not first
+    assert refreshed[0][1] == ids[0]
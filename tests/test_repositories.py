@@ -0,0 +1,106 @@
+"""
+Contract tests run against every repository backend.
+"""
+
+import pytest
+from src.database.change_tracking import RefreshGate
+from src.database.database_operations import GRADE_INSERTED, GRADE_UPDATED
+from src.repositories.base import Repositories
+from src.repositories.config import create_repositories
+from src.repositories.memory import MemoryRepositories
+from src.repositories.sqlite import (
+    SQLiteGradeRepository, SQLiteRegistrarRepository, SQLiteStudentRepository
+)
+
+@pytest.fixture
+def sqlite_repositories(test_db):
+    """SQLite repositories over the test database, without its sample students."""
+    repositories = Repositories(SQLiteStudentRepository(), SQLiteGradeRepository(),
+                                SQLiteRegistrarRepository())
+    for student in repositories.students.all():
+        repositories.students.delete(student[0])
+    return repositories
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def repositories(request):
+    if request.param == 'sqlite':
+        yield request.getfixturevalue('sqlite_repositories')
+        return
+    repositories = MemoryRepositories()
+    yield repositories
+    repositories.close()
+
+def add_student(repositories, student_id, name, program='BSIT', year_level='1'):
+    return repositories.students.add(student_id, name, '09123456789', f"{student_id}@eecp.edu.ph",
+                                     'secret123', year_level, '1', 'EECP', program,
+                                     '2024-2025', 'Enrolled')
+
+def test_students(repositories):
+    students = repositories.students
+    assert add_student(repositories, '2024002', 'Maria Santos', program='BSCS')
+    assert add_student(repositories, '2024001', 'Juan Dela Cruz')
+    assert not add_student(repositories, '2024001', 'Duplicate')
+
+    assert students.get('2024001') == ('2024001', 'Juan Dela Cruz', '09123456789',
+                                       '2024001@eecp.edu.ph', '1', '1', 'EECP', 'BSIT',
+                                       '2024-2025', 'Enrolled')
+    assert students.get('missing') is None
+    assert [row[0] for row in students.all()] == ['2024002', '2024001']
+    assert [row[0] for row in students.page(page_size=1)] == ['2024001']
+    assert [row[0] for row in students.page(after_id='2024001')] == ['2024002']
+    assert students.count(program='BSCS') == 1
+    assert [row[0] for row in students.search('mar san')] == ['2024002']
+    assert students.verify_password('2024001', 'secret123') is True
+    assert students.verify_password('2024001', 'wrong') is False
+
+    assert students.update('2024001', 'Juan Cruz', '09999999999', 'juan@eecp.edu.ph',
+                           '2', '1', 'EECP', 'BSIT', '2024-2025', 'Enrolled')
+    assert students.get('2024001')[1:5] == ('Juan Cruz', '09999999999', 'juan@eecp.edu.ph', '2')
+    assert students.delete('2024001')
+    assert students.count() == 1
+
+def test_grades_and_summaries(repositories):
+    grades, students = repositories.grades, repositories.students
+    add_student(repositories, '2024001', 'Juan Dela Cruz')
+    gate = RefreshGate(('grades',), repositories.change_tracker)
+    token = gate.check()
+
+    assert grades.upsert('2024001', 'Math', 3, 1.5, 1.5, 'Passed', 1, 1) == GRADE_INSERTED
+    assert grades.upsert('2024001', 'Math', 3, 1.25, '', '', '1', '1') == GRADE_UPDATED
+    assert grades.upsert('2024001', 'Math', 9, 1.25, '', '', 1, 1) is False
+    assert grades.upsert_many([('2024001', 'Art', 2, 5.0, 5.0, 'Failed', 1, 2),
+                               {'student_id': '2024001', 'subject': ''}]) == [GRADE_INSERTED, False]
+    assert gate.check() != token
+
+    assert grades.for_student('2024001') == [('Math', 3, '1.25', 1.25, 'Passed', 1, 1),
+                                             ('Art', 2, '5.00', 5.0, 'Failed', 1, 2)]
+    assert students.summary('2024001')[:4] == (2.75, 5, 3, 2)
+    assert students.term_summaries('2024001') == [('1', '1', 1.25, 3, 3, 0),
+                                                  ('1', '2', 5.0, 2, 0, 2)]
+    assert students.all()[0][-1] == '2.75'
+
+    assert grades.delete('2024001', 'Art', 1, 2)
+    assert students.summary('2024001')[:4] == (1.25, 3, 3, 0)
+    assert grades.delete('2024001', 'Math', '1', '1')
+    assert students.summary('2024001') is None
+
+def test_registrars(repositories):
+    assert repositories.registrars.add('REG100', 'Registrar', 'secret123')
+    assert not repositories.registrars.add('REG100', 'Again', 'secret123')
+    assert repositories.registrars.verify_password('REG100', 'secret123') is True
+    assert repositories.registrars.verify_password('REG100', 'wrong') is False
+
+def test_create_repositories_from_dsn(tmp_path):
+    memory = create_repositories('memory://')
+    try:
+        assert isinstance(memory, MemoryRepositories)
+        assert memory.students.count() == 0
+    finally:
+        memory.close()
+    repositories = create_repositories(f"sqlite:///{tmp_path / 'dsn.db'}")
+    try:
+        assert repositories.registrars.verify_password('REG001', 'admin123') is True
+    finally:
+        repositories.close()
+    with pytest.raises(ValueError):
+        create_repositories('oracle://db')
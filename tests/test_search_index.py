@@ -0,0 +1,54 @@
+"""
+Tests for the in-memory student search index.
+"""
+
+from src.database import database_operations as db
+from src.utils.search_index import IncrementalSearch, StudentSearchIndex, extends, tokenize
+
+def student(student_id, name, program='BSIT', status='Enrolled'):
+    return (student_id, name, '09123456789', f'{student_id}@eecp.edu.ph',
+            '1', '1', 'EECP', program, '2024-2025', status)
+
+ROWS = [
+    student('202400001', 'JOHN DOE'),
+    student('202400002', 'JOHNNY CRUZ', program='BSCS'),
+    student('202400003', 'MARIA JOHNSON', status='LOA'),
+    student('202400004', 'ANNA SANTOS'),
+]
+
+def names(rows):
+    return [row[1] for row in rows]
+
+def test_tokenize_matches_fts_word_boundaries():
+    assert tokenize('202400001@eecp.edu.ph') == ['202400001', 'eecp', 'edu', 'ph']
+    assert tokenize('  De_la Cruz ') == ['de', 'la', 'cruz']
+
+def test_every_word_must_prefix_match_some_column():
+    index = StudentSearchIndex(ROWS)
+
+    assert names(index.search('john')) == ['JOHN DOE', 'JOHNNY CRUZ', 'MARIA JOHNSON']
+    assert names(index.search('john bscs')) == ['JOHNNY CRUZ']
+    assert names(index.search('loa')) == ['MARIA JOHNSON']
+    assert names(index.search('ohn')) == []
+    assert index.search('   ') == []
+
+def test_extends_only_when_every_word_narrows():
+    assert extends(['joh'], ['jo'])
+    assert extends(['john', 'c'], ['john'])
+    assert not extends(['jo'], ['joh'])
+    assert not extends(['maria'], ['john'])
+
+def test_incremental_search_agrees_with_a_fresh_search():
+    index = StudentSearchIndex(ROWS)
+    search = IncrementalSearch(index)
+
+    for query in ('j', 'jo', 'john', 'john c', 'john cr', 'jo', 'a', 'an'):
+        assert search.search(query) == index.search(query), query
+
+def test_index_agrees_with_fts_search(test_db):
+    for row in ROWS:
+        db.insert_user_data_st(row[0], row[1], row[2], row[3], 'secret', *row[4:])
+    index = StudentSearchIndex(db.fetch_student_data())
+
+    for query in ('john', 'jo d', 'eecp', '2024', 'bscs', 'angelo man'):
+        assert index.search(query) == db.search_students(query), query
@@ -0,0 +1,142 @@
+"""
+Tests for the HTTP/JSON grade service and its client.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.database import database_operations as db
+from src.database.change_tracking import get_change_tracker
+from src.service.client import ServiceClient, ServiceError
+from src.service.server import GradeService
+from src.repositories.remote import RemoteRepositories
+from src.repositories.sqlite import SQLiteGradeRepository, SQLiteStudentRepository
+
+@pytest.fixture
+def service(test_db):
+    """A grade service on a free port, run by an event loop in a thread."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    grade_service = GradeService(token='secret', registrar_token='registrar-secret')
+    asyncio.run_coroutine_threadsafe(grade_service.start('127.0.0.1', 0), loop).result()
+    yield grade_service
+    asyncio.run_coroutine_threadsafe(grade_service.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+@pytest.fixture
+def client(service):
+    client = ServiceClient(f"http://127.0.0.1:{service.port}", token='registrar-secret')
+    yield client
+    client.close()
+
+def test_client_matches_database_functions(client):
+    assert client.get_student_info('202410769') == db.get_student_info('202410769')
+    assert client.fetch_student_grades('202410769') == db.fetch_student_grades('202410769')
+    assert client.search_students('angelo') == db.search_students('angelo')
+    assert client.honors_cutoffs(top_percents=[50]) == [(50, 1.25, 1)]
+    assert client.fetch_user_credentials('202410769', 'student123') is True
+    assert client.fetch_user_credentials2('REG001', 'wrong') is False
+    assert client.versions('students', 'grades') == get_change_tracker().versions('students', 'grades')
+
+def test_logins_are_throttled_per_client(service, client):
+    for _ in range(5):
+        assert client.check_student_login('202410769', 'wrong') == db.LOGIN_WRONG_PASSWORD
+    assert client.fetch_user_credentials('202410769', 'student123') is False
+    assert client.check_student_login('202410769', 'student123') == 'throttled'
+    assert client.stats()['logins']['accounts']['throttled'] == 2
+
+def test_concurrent_grade_updates_are_batched(service, client):
+    grades = [('202400001', f"Subject {n}", 3, 1.5, 1.5, 'Passed', 1, 1) for n in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda grade: client.update_grade(*grade), grades))
+    assert results == [db.GRADE_INSERTED] * 8
+    assert client.update_grade('202400001', 'Subject 0', 3, 2.0, 2.0, 'Passed', 1, 1) == db.GRADE_UPDATED
+    assert client.update_grade('202400001', 'Subject 0', 9, 2.0, 2.0, 'Passed', 1, 1) is False
+
+    stats = client.stats()
+    assert stats['grade_batching']['grades'] == 10
+    assert stats['grade_batching']['batches'] < 10
+    assert stats['operations']['update_grade']['count'] == 10
+    assert len(db.fetch_student_grades('202400001')) == 8
+
+def test_errors_are_reported(service, client):
+    with pytest.raises(ServiceError, match="Unknown operation"):
+        client.call('drop_everything')
+    with pytest.raises(ServiceError):
+        client.get_student_info()  # missing argument
+    with pytest.raises(ServiceError, match="token"):
+        ServiceClient(f"http://127.0.0.1:{service.port}").get_student_info('202410769')
+    assert client.stats()['operations']['get_student_info']['errors'] == 1
+
+def test_kiosk_token_cannot_write(service):
+    kiosk = ServiceClient(f"http://127.0.0.1:{service.port}", token='secret')
+    try:
+        assert kiosk.insert_user_data_st('2024999', 'New Student', '09123456789',
+                                         'new@eecp.edu.ph', 'secret123')
+        for name, args in (('update_grade', ('202410769', 'Physics', 3, 1.0, 1.0, 'Passed', 1, 1)),
+                           ('delete_student', ('202410769',)),
+                           ('insert_user_dataR', ('REG999', 'Intruder', 'secret123')),
+                           ('fetch_student_data', ())):
+            with pytest.raises(ServiceError, match="registrar token"):
+                kiosk.call(name, *args)
+        assert db.get_student_info('202410769') is not None
+    finally:
+        kiosk.close()
+
+def test_kiosk_only_reads_the_logged_in_student(service):
+    kiosk = ServiceClient(f"http://127.0.0.1:{service.port}", token='secret')
+    try:
+        with pytest.raises(ServiceError, match="logged in"):
+            kiosk.get_student_info('202410769')
+        assert kiosk.check_student_login('202410769', 'student123') == db.LOGIN_OK
+        assert kiosk.get_student_info('202410769') == db.get_student_info('202410769')
+        assert kiosk.fetch_student_grades('202410769') == db.fetch_student_grades('202410769')
+        with pytest.raises(ServiceError, match="logged in"):
+            kiosk.fetch_student_grades('202400001')
+
+        assert kiosk.check_student_login('202410769', 'wrong') == db.LOGIN_WRONG_PASSWORD
+        with pytest.raises(ServiceError, match="logged in"):
+            kiosk.get_student_info('202410769')
+    finally:
+        kiosk.close()
+
+def test_overlong_and_slow_requests_are_closed(service, monkeypatch):
+    async def exchange(data):
+        reader, writer = await asyncio.open_connection('127.0.0.1', service.port)
+        writer.write(data)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+
+    assert asyncio.run(exchange(b"GET /health HTTP/1.1\r\nX-Long: " + b"a" * 100000
+                                + b"\r\n\r\n")).startswith(b"HTTP/1.1 431 ")
+    monkeypatch.setattr('src.service.server.READ_TIMEOUT', 0.1)
+    assert asyncio.run(exchange(b"GET /health HTTP/1.1\r\n")) == b""
+
+def test_service_without_token_only_listens_on_loopback(test_db):
+    service = GradeService()
+    with pytest.raises(ValueError, match="GESYS_SERVICE_TOKEN"):
+        asyncio.run(service.start('0.0.0.0', 0))
+    asyncio.run(service.close())
+
+def test_remote_repositories_match_sqlite(service):
+    remote = RemoteRepositories(f"http://127.0.0.1:{service.port}", token='registrar-secret')
+    students, grades = SQLiteStudentRepository(), SQLiteGradeRepository()
+    try:
+        assert remote.students.all() == students.all()
+        assert remote.students.page(page_size=1) == students.page(page_size=1)
+        assert remote.students.search('john') == students.search('john')
+        assert remote.students.summary('202410769') == students.summary('202410769')
+        assert remote.students.term_summaries('202410769') == students.term_summaries('202410769')
+        assert remote.grades.for_student('202410769') == grades.for_student('202410769')
+        assert remote.grades.honors_cutoffs() == grades.honors_cutoffs()
+        assert remote.grades.subject_statistics() == grades.subject_statistics()
+        assert remote.registrars.verify_password('REG001', 'admin123') is True
+        assert remote.change_tracker.versions('grades') == get_change_tracker().versions('grades')
+    finally:
+        remote.close()
@@ -0,0 +1,113 @@
+"""
+Tests for the display-independent parts of the UI components.
+"""
+
+from src.ui.ui_components import ListDataSource, PagedDataSource, TreeviewReconciler
+
+ROWS = [(f"{n:04d}", f"Student {n}") for n in range(95)]
+
+def fetch_rows(calls):
+    def fetch_page(offset, limit, previous_row):
+        calls.append((offset, previous_row[0] if previous_row else None))
+        if previous_row is not None:
+            start = ROWS.index(previous_row) + 1
+        else:
+            start = offset
+        return ROWS[start:start + limit]
+    return fetch_page
+
+def test_list_data_source_slices_rows():
+    source = ListDataSource(ROWS)
+    assert len(source) == 95
+    assert source.get_rows(-5, 2) == ROWS[:2]
+    assert source.get_rows(90, 120) == ROWS[90:]
+
+def test_paged_data_source_seeks_from_the_previous_page():
+    calls = []
+    source = PagedDataSource(fetch_rows(calls), len(ROWS), page_size=10, max_pages=3)
+
+    assert source.get_rows(5, 15) == ROWS[5:15]
+    assert source.get_rows(15, 25) == ROWS[15:25]
+    # Pages after a cached page seek by key; a jump falls back to the offset
+    assert calls == [(0, None), (10, '0009'), (20, '0019')]
+    assert source.get_rows(90, 100) == ROWS[90:95]
+    assert calls[-1] == (90, None)
+    # Only max_pages pages are kept
+    assert source.get_rows(0, 1) == ROWS[:1]
+    assert calls[-1] == (0, None)
+
+def test_paged_data_source_loads_in_background():
+    submitted = []
+    loaded = []
+
+    def submit(func, *args, on_success=None, on_error=None):
+        submitted.append((func, args, on_success))
+
+    source = PagedDataSource(fetch_rows([]), len(ROWS), page_size=10, submit=submit)
+    source.on_loaded = lambda: loaded.append(True)
+
+    assert source.get_rows(8, 12) == [None] * 4
+    source.prefetch(0, 30)
+    assert len(submitted) == 3  # pages 0, 1 and 2, each requested once
+
+    for func, args, on_success in submitted:
+        on_success(func(*args))
+    assert loaded == [True, True, True]
+    assert source.get_rows(8, 12) == ROWS[8:12]
+
+class RecordingTreeview:
+    """Minimal Treeview stand-in that records every call made to it."""
+
+    def __init__(self):
+        self.items = []
+        self.values = {}
+        self.calls = []
+
+    def insert(self, parent, index, iid, values):
+        self.calls.append('insert')
+        self.items.insert(index, iid)
+        self.values[iid] = values
+
+    def delete(self, *iids):
+        self.calls.append('delete')
+        for iid in iids:
+            self.items.remove(iid)
+            del self.values[iid]
+
+    def move(self, iid, parent, index):
+        self.calls.append('move')
+        self.items.remove(iid)
+        self.items.insert(index, iid)
+
+    def item(self, iid, values):
+        self.calls.append('item')
+        self.values[iid] = values
+
+def keyed(rows):
+    return [(row[0], row) for row in rows]
+
+def test_reconciler_applies_only_the_delta():
+    tree = RecordingTreeview()
+    reconciler = TreeviewReconciler(tree)
+    rows = [(f"{n:05d}", f"Student {n}", 'Enrolled') for n in range(10000)]
+
+    assert reconciler.apply(keyed(rows)) == 10000
+    rows[4242] = (rows[4242][0], rows[4242][1], 'LOA')
+    tree.calls.clear()
+
+    assert reconciler.apply(keyed(rows)) == 1
+    assert tree.calls == ['item']
+    assert reconciler.apply(keyed(rows)) == 0
+
+def test_reconciler_handles_inserts_deletes_and_moves():
+    tree = RecordingTreeview()
+    reconciler = TreeviewReconciler(tree)
+    reconciler.apply(keyed([('a', 1), ('b', 2), ('c', 3), ('d', 4), ('e', 5)]))
+
+    target = [('e', 5), ('a', 1), ('x', 9), ('c', 30), ('b', 2)]
+    reconciler.apply(keyed(target))
+
+    assert tree.items == ['e', 'a', 'x', 'c', 'b']
+    assert [tree.values[iid] for iid in tree.items] == [tuple(row) for row in target]
+    assert tree.calls.count('delete') == 1  # stale rows go in one call
+    assert tree.calls.count('insert') == 5 + 1